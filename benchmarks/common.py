@@ -0,0 +1,100 @@
+"""Общие утилиты бенчмарков: генерация нагрузки и статистика задержек."""
+
+import asyncio
+import os
+import statistics
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import httpx
+from dotenv import dotenv_values
+
+
+@dataclass
+class LoadResult:
+    latencies_ms: list[float] = field(default_factory=list)
+    errors: int = 0
+    elapsed_s: float = 0.0
+
+    @property
+    def requests(self) -> int:
+        return len(self.latencies_ms) + self.errors
+
+    @property
+    def rps(self) -> float:
+        return self.requests / self.elapsed_s if self.elapsed_s else 0.0
+
+    def summary(self) -> dict:
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "rps": round(self.rps, 1),
+            "p50_ms": round(percentile(self.latencies_ms, 50), 2),
+            "p95_ms": round(percentile(self.latencies_ms, 95), 2),
+            "p99_ms": round(percentile(self.latencies_ms, 99), 2),
+            "mean_ms": round(statistics.fmean(self.latencies_ms), 2) if self.latencies_ms else 0.0,
+        }
+
+
+def load_test_env(env_file: Path) -> None:
+    """Подставляет переменные из env-файла тестовой БД; другие базы бенчмарки не трогают."""
+    values = dotenv_values(env_file)
+    if values.get("MODE") != "TEST":
+        raise SystemExit(f"{env_file}: бенчмарки пересоздают данные и работают только с тестовой БД")
+    for key, value in values.items():
+        os.environ.setdefault(key, value or "")
+    # Тестовый режим отключает пул соединений (NullPool), а замерять нужно как в проде
+    os.environ["MODE"] = "LOCAL"
+
+
+def percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+async def run_load(
+    client: httpx.AsyncClient,
+    make_request,
+    *,
+    concurrency: int,
+    duration_s: float | None = None,
+    total_requests: int | None = None,
+) -> LoadResult:
+    """Гоняет make_request(client) в concurrency корутинах по времени или по числу запросов."""
+    result = LoadResult()
+    remaining = total_requests
+    deadline = time.perf_counter() + duration_s if duration_s else None
+
+    def has_budget() -> bool:
+        nonlocal remaining
+        if deadline is not None and time.perf_counter() >= deadline:
+            return False
+        if remaining is not None:
+            if remaining <= 0:
+                return False
+            remaining -= 1
+        return True
+
+    async def worker():
+        while has_budget():
+            started = time.perf_counter()
+            try:
+                response = await make_request(client)
+                ok = response.status_code < 400
+            except httpx.HTTPError:
+                ok = False
+            if ok:
+                result.latencies_ms.append((time.perf_counter() - started) * 1000)
+            else:
+                result.errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    result.elapsed_s = time.perf_counter() - started
+    return result
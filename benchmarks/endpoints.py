@@ -0,0 +1,387 @@
+"""Нагрузочный бенчмарк эндпоинтов API в процессе (httpx.ASGITransport) на заполненной БД.
+
+Заполняет тестовую базу (параметры из .env-test) пользователями, тренировками и упражнениями
+в заданном масштабе, затем прогоняет сценарии по всем роутерам из src/api с заданной
+конкурентностью и печатает p50/p95/p99 и пропускную способность по каждому эндпоинту в JSON.
+Нужен запущенный PostgreSQL; Redis не нужен — кэш ответов в памяти, Celery не вызывается.
+
+    python benchmarks/endpoints.py --users 200 --workouts-per-user 50 --output results.json
+    python benchmarks/endpoints.py --skip-seed --baseline results.json --max-regression 20
+"""
+
+import argparse
+import asyncio
+import datetime as dt
+import itertools
+import json
+import platform
+import random
+import subprocess
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Awaitable, Callable
+from unittest.mock import patch
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from common import load_test_env, run_load  # noqa: E402
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+SEED_PASSWORD = "benchmark-password"
+INSERT_CHUNK = 5000
+
+
+@dataclass
+class Scenario:
+    name: str
+    make_request: Callable[[httpx.AsyncClient], Awaitable[httpx.Response]]
+    # Во сколько раз меньше запросов, чем у остальных: для заведомо медленных (Argon2) эндпоинтов
+    requests_divisor: int = 1
+
+
+def chunks(rows: list[dict], size: int = INSERT_CHUNK):
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+
+async def seed(users: int, workouts_per_user: int, exercises: int, exercises_per_workout: int,
+               random_seed: int) -> dict:
+    from sqlalchemy import insert
+
+    from src.core.db import Base, get_async_session_maker, get_engine
+    from src.models import ExercisesModel, UsersModel, WorkoutExerciseModel, WorkoutsModel
+    from src.schemas.exercises import Category
+    from src.schemas.users import Roles
+    from src.services.auth import AuthService
+
+    rng = random.Random(random_seed)
+    async with get_engine().begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+
+    # Один хэш на всех: Argon2 на каждого пользователя занял бы минуты
+    hashed_password = AuthService().hash_password(SEED_PASSWORD)
+    categories = list(Category)
+    today = dt.date.today()
+
+    async with get_async_session_maker()() as session:
+        user_rows = [
+            {
+                "email": f"user{i}@bench.local",
+                "hashed_password": hashed_password,
+                "role": Roles.ADMIN if i == 0 else Roles.USER,
+                "is_verified": True,
+            }
+            for i in range(users)
+        ]
+        user_ids = []
+        for chunk in chunks(user_rows):
+            result = await session.execute(insert(UsersModel).returning(UsersModel.id), chunk)
+            user_ids.extend(result.scalars().all())
+
+        exercise_rows = [
+            {
+                "name": f"Упражнение {i}",
+                "description": f"Описание упражнения {i}",
+                "category": categories[i % len(categories)],
+            }
+            for i in range(exercises)
+        ]
+        result = await session.execute(insert(ExercisesModel).returning(ExercisesModel.id), exercise_rows)
+        exercise_ids = result.scalars().all()
+
+        workout_rows = [
+            {
+                "user_id": user_id,
+                "date": today - dt.timedelta(days=rng.randrange(365)),
+                "description": f"Тренировка {n}",
+            }
+            for user_id in user_ids
+            for n in range(workouts_per_user)
+        ]
+        workout_ids = []
+        for chunk in chunks(workout_rows):
+            result = await session.execute(insert(WorkoutsModel).returning(WorkoutsModel.id), chunk)
+            workout_ids.extend(result.scalars().all())
+
+        link_rows = [
+            {
+                "workout_id": workout_id,
+                "exercise_id": exercise_id,
+                "sets": rng.randint(1, 5),
+                "reps": rng.randint(5, 15),
+                "weight": float(rng.randint(10, 120)),
+            }
+            for workout_id in workout_ids
+            for exercise_id in rng.sample(exercise_ids, min(exercises_per_workout, len(exercise_ids)))
+        ]
+        for chunk in chunks(link_rows):
+            await session.execute(insert(WorkoutExerciseModel), chunk)
+        await session.commit()
+
+    return {
+        "users": len(user_ids),
+        "exercises": len(exercise_ids),
+        "workouts": len(workout_ids),
+        "workout_exercises": len(link_rows),
+    }
+
+
+async def load_fixtures(sample_users: int) -> dict:
+    # Какие id реально есть в базе — чтобы бенчмарк работал и с --skip-seed
+    from sqlalchemy import func, select
+
+    from src.core.db import get_async_session_maker
+    from src.models import ExercisesModel, UsersModel, WorkoutsModel
+    from src.services.auth import AuthService
+
+    async with get_async_session_maker()() as session:
+        users = (
+            await session.execute(
+                select(UsersModel.id, UsersModel.email, UsersModel.hashed_password, UsersModel.role)
+                .order_by(UsersModel.id)
+                .limit(sample_users)
+            )
+        ).all()
+        exercise_ids = (await session.execute(select(ExercisesModel.id))).scalars().all()
+        workouts = (
+            await session.execute(
+                select(WorkoutsModel.id, WorkoutsModel.user_id)
+                .where(WorkoutsModel.user_id.in_([user.id for user in users]))
+            )
+        ).all()
+        workouts_total = (await session.execute(select(func.count(WorkoutsModel.id)))).scalar_one()
+
+    if not users or not exercise_ids or not workouts:
+        raise SystemExit("База пуста: запустите бенчмарк без --skip-seed")
+
+    # Токены выпускаются напрямую, без /auth/login, чтобы не тратить время на Argon2
+    auth = AuthService()
+    tokens = {
+        user.id: auth.create_access_token(
+            {
+                "user_id": user.id,
+                "user_email": user.email,
+                "user_hashed_password": user.hashed_password,
+                "user_role": user.role.value,
+            }
+        )
+        for user in users
+    }
+    return {
+        "users": users,
+        "tokens": tokens,
+        "exercise_ids": exercise_ids,
+        "workouts": workouts,
+        "workouts_total": workouts_total,
+    }
+
+
+def build_scenarios(fixtures: dict, random_seed: int) -> list[Scenario]:
+    rng = random.Random(random_seed)
+    tokens = fixtures["tokens"]
+    user_ids = itertools.cycle(tokens)
+    exercise_ids = fixtures["exercise_ids"]
+    workouts = list(fixtures["workouts"])
+    rng.shuffle(workouts)
+    own_workouts = itertools.cycle(workouts)
+    admin_id = fixtures["users"][0].id
+    registrations = itertools.count()
+
+    def auth_headers(user_id: int) -> dict:
+        return {"Cookie": f"access_token={tokens[user_id]}"}
+
+    def exercise_payload() -> list[dict]:
+        return [
+            {"id": exercise_id, "sets": 3, "reps": 10, "weight": 50.0}
+            for exercise_id in rng.sample(exercise_ids, min(3, len(exercise_ids)))
+        ]
+
+    async def get_workout(client):
+        workout = next(own_workouts)
+        return await client.get(f"/workouts/get/{workout.id}", headers=auth_headers(workout.user_id))
+
+    async def edit_workout(client):
+        workout = next(own_workouts)
+        return await client.patch(
+            f"/workouts/edit/{workout.id}",
+            json={"description": "Изменено бенчмарком"},
+            headers=auth_headers(workout.user_id),
+        )
+
+    async def add_exercises_to_workout(client):
+        workout = next(own_workouts)
+        return await client.patch(
+            f"/workouts/{workout.id}", json=exercise_payload(), headers=auth_headers(workout.user_id)
+        )
+
+    async def add_workout(client):
+        return await client.post(
+            "/workouts",
+            json={"description": "Бенчмарк", "exercises": exercise_payload()},
+            headers=auth_headers(next(user_ids)),
+        )
+
+    async def register(client):
+        return await client.post(
+            "/auth/register",
+            json={"email": f"new{next(registrations)}-{time.time_ns()}@bench.local",
+                  "password": SEED_PASSWORD},
+        )
+
+    async def patch_exercise(client):
+        return await client.patch(
+            f"/exercises/{rng.choice(exercise_ids)}",
+            json={"description": "Изменено бенчмарком"},
+            headers=auth_headers(admin_id),
+        )
+
+    # Сначала чтение, затем запись: записи меняют данные и сбрасывают кэш каталога
+    return [
+        Scenario("GET /health/live", lambda c: c.get("/health/live")),
+        Scenario("GET /health/ready", lambda c: c.get("/health/ready")),
+        Scenario("GET /exercises", lambda c: c.get("/exercises")),
+        Scenario("GET /exercises/{id}", lambda c: c.get(f"/exercises/{rng.choice(exercise_ids)}")),
+        Scenario("GET /auth/me", lambda c: c.get("/auth/me", headers=auth_headers(next(user_ids)))),
+        Scenario("GET /workouts", lambda c: c.get("/workouts", headers=auth_headers(next(user_ids)))),
+        Scenario("GET /workouts/get/{id}", get_workout),
+        Scenario("GET /metrics", lambda c: c.get("/metrics")),
+        Scenario("POST /auth/login", lambda c: c.post(
+            "/auth/login", json={"email": fixtures["users"][0].email, "password": SEED_PASSWORD}
+        ), requests_divisor=10),
+        Scenario("POST /auth/register", register, requests_divisor=10),
+        Scenario("POST /workouts", add_workout),
+        Scenario("PATCH /workouts/edit/{id}", edit_workout),
+        Scenario("PATCH /workouts/{id}", add_exercises_to_workout),
+        Scenario("PATCH /exercises/{id}", patch_exercise),
+    ]
+
+
+async def run_scenarios(scenarios: list[Scenario], concurrency: int, requests: int,
+                        warmup: int) -> dict:
+    from fastapi_cache import FastAPICache
+    from fastapi_cache.backends.inmemory import InMemoryBackend
+
+    from src.main import app
+
+    FastAPICache.init(InMemoryBackend(), prefix="bench-cache")
+    app.state.ready = True
+
+    results = {}
+    # Необработанное исключение приложения — ответ 500 и ошибка сценария, а не остановка прогона
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    with patch("src.services.auth.send_confirmation_email.delay"), patch(
+        "src.api.metrics.refresh_queue_lengths"
+    ):
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            for scenario in scenarios:
+                total = max(requests // scenario.requests_divisor, concurrency)
+                await run_load(client, scenario.make_request, concurrency=concurrency,
+                               total_requests=max(warmup // scenario.requests_divisor, 1))
+                result = await run_load(client, scenario.make_request, concurrency=concurrency,
+                                        total_requests=total)
+                results[scenario.name] = result.summary()
+                print(f"{scenario.name:<28} {results[scenario.name]}", file=sys.stderr)
+    return results
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: dict, baseline: dict, max_regression: float) -> list[str]:
+    # Сравниваются p95 и rps: регрессией считается ухудшение больше чем на max_regression процентов
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get("results", {}).get(name)
+        if not previous:
+            continue
+        if previous["p95_ms"] and current["p95_ms"] > previous["p95_ms"] * (1 + max_regression / 100):
+            regressions.append(f"{name}: p95 {previous['p95_ms']} -> {current['p95_ms']} мс")
+        if previous["rps"] and current["rps"] < previous["rps"] * (1 - max_regression / 100):
+            regressions.append(f"{name}: rps {previous['rps']} -> {current['rps']}")
+        if current["errors"] > previous["errors"]:
+            regressions.append(f"{name}: ошибок {previous['errors']} -> {current['errors']}")
+    return regressions
+
+
+async def run(args: argparse.Namespace) -> dict:
+    scale = None
+    if not args.skip_seed:
+        scale = await seed(args.users, args.workouts_per_user, args.exercises,
+                           args.exercises_per_workout, args.seed)
+        print(f"Заполнено: {scale}", file=sys.stderr)
+
+    fixtures = await load_fixtures(args.sample_users)
+    scenarios = build_scenarios(fixtures, args.seed)
+    if args.only:
+        scenarios = [s for s in scenarios if any(part in s.name for part in args.only)]
+    results = await run_scenarios(scenarios, args.concurrency, args.requests, args.warmup)
+
+    return {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": dt.datetime.now(dt.timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "concurrency": args.concurrency,
+            "requests": args.requests,
+            "seed": args.seed,
+            "scale": scale,
+            "workouts_total": fixtures["workouts_total"],
+        },
+        "results": results,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--env-file", type=Path, default=ROOT / ".env-test")
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--workouts-per-user", type=int, default=20)
+    parser.add_argument("--exercises", type=int, default=200)
+    parser.add_argument("--exercises-per-workout", type=int, default=5)
+    parser.add_argument("--skip-seed", action="store_true", help="Использовать уже заполненную БД")
+    parser.add_argument("--sample-users", type=int, default=50,
+                        help="Сколько пользователей участвуют в запросах")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=2000, help="Запросов на сценарий")
+    parser.add_argument("--warmup", type=int, default=100, help="Запросов прогрева на сценарий")
+    parser.add_argument("--seed", type=int, default=42, help="Seed генератора данных и запросов")
+    parser.add_argument("--only", action="append", help="Запустить сценарии, содержащие подстроку")
+    parser.add_argument("--output", type=Path, help="Сохранить результаты в JSON-файл")
+    parser.add_argument("--baseline", type=Path, help="Сравнить с результатами прошлого прогона")
+    parser.add_argument("--max-regression", type=float, default=15,
+                        help="Допустимое ухудшение p95/rps относительно baseline, проценты")
+    args = parser.parse_args()
+
+    load_test_env(args.env_file)
+    report = asyncio.run(run(args))
+
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        args.output.write_text(output)
+    print(output)
+
+    if args.baseline:
+        regressions = compare(report["results"], json.loads(args.baseline.read_text()),
+                              args.max_regression)
+        for line in regressions:
+            print(f"РЕГРЕССИЯ {line}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
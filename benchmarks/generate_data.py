@@ -0,0 +1,342 @@
+"""Генератор синтетических данных для нагрузочных тестов и проверки планов запросов.
+
+Детерминированно (по --seed) строит пользователей с неравномерной активностью, тренировки за
+несколько лет и упражнения в них с ростом рабочих весов, и загружает всё через COPY. Данные
+в users, exercises, workouts и workout_exercises тестовой БД (.env-test) заменяются. После
+загрузки заполняются производные данные, как их поддерживает приложение: лента изменений
+(workout_changes), сводка тренировок (total_volume, exercises_count, main_categories) и агрегаты
+training_rollups — теми же задачами backfill_workout_summaries и rebuild_training_rollups.
+
+Распределения:
+- активность пользователя — логнормальная: немногие тренируются часто, большинство — редко;
+  часть пользователей начинает позже и бросает раньше;
+- интервалы между тренировками — экспоненциальные со средним 7 / (тренировок в неделю) дней;
+- упражнений в тренировке — около --mean-exercises-per-workout, из «любимых» упражнений
+  пользователя, которые выбираются с популярностью по закону Ципфа;
+- рабочий вес — базовый вес категории × сила пользователя, растёт быстро в начале и
+  выходит на плато, с шумом; повторения уменьшаются с ростом веса.
+
+    python benchmarks/generate_data.py --users 1000 --years 2
+    python benchmarks/generate_data.py --users 20000 --years 2 --skip-fk-checks   # ~10 млн строк
+"""
+
+import argparse
+import asyncio
+import datetime as dt
+import math
+import random
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from common import load_test_env  # noqa: E402
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+SEED_PASSWORD = "benchmark-password"
+COPY_BATCH = 100_000
+TABLES = ("workout_exercises", "workouts", "exercises", "users")
+# Очищаются вместе с users через TRUNCATE ... CASCADE и заполняются после загрузки
+DERIVED_TABLES = ("workout_changes", "workout_change_counters", "training_rollups")
+WORKOUT_COLUMNS = ["id", "user_id", "date", "description", "created_at", "updated_at"]
+WORKOUT_EXERCISE_COLUMNS = [
+    "id", "workout_id", "exercise_id", "sets", "reps", "weight", "created_at", "updated_at",
+]
+
+# Базовый рабочий вес по категориям, кг; для кардио и растяжки вес условный
+CATEGORY_BASE_WEIGHT = {
+    "CHEST": 50.0,
+    "BACK": 55.0,
+    "LEGS": 70.0,
+    "SHOULDERS": 25.0,
+    "ARMS": 15.0,
+    "ABS": 10.0,
+    "CARDIO": 1.0,
+    "STRETCHING": 1.0,
+}
+
+
+@dataclass(frozen=True)
+class Params:
+    users: int
+    exercises: int
+    years: float
+    mean_workouts_per_week: float
+    mean_exercises_per_workout: float
+    seed: int
+    end_date: dt.date
+
+
+@dataclass
+class Counters:
+    workouts: int = 0
+    workout_exercises: int = 0
+
+
+def exercise_rows(params: Params) -> list[tuple]:
+    categories = list(CATEGORY_BASE_WEIGHT)
+    created_at = dt.datetime.combine(
+        params.end_date - dt.timedelta(days=int(params.years * 365)), dt.time(), dt.timezone.utc
+    )
+    return [
+        (i, f"Упражнение {i}", f"Описание упражнения {i}", categories[(i - 1) % len(categories)],
+         created_at, created_at)
+        for i in range(1, params.exercises + 1)
+    ]
+
+
+def user_rows(params: Params, hashed_password: str) -> Iterator[tuple]:
+    start = params.end_date - dt.timedelta(days=int(params.years * 365))
+    for user_id in range(1, params.users + 1):
+        rng = random.Random(f"{params.seed}:user:{user_id}")
+        registered_at = dt.datetime.combine(
+            start + dt.timedelta(days=rng.randrange(int(params.years * 365 * 0.7) or 1)),
+            dt.time(hour=rng.randrange(24)),
+            dt.timezone.utc,
+        )
+        role = "ADMIN" if user_id == 1 else "USER"
+        yield (user_id, f"user{user_id}@synthetic.local", hashed_password, role,
+               False, True, registered_at, registered_at)
+
+
+def user_workouts(params: Params, user_id: int, registered_at: dt.date, popularity: list[float],
+                  counters: Counters) -> Iterator[tuple[tuple, list[tuple]]]:
+    # Свой генератор на пользователя: данные пользователя не зависят от остальных и от порядка
+    rng = random.Random(f"{params.seed}:workouts:{user_id}")
+    exercise_ids = range(1, params.exercises + 1)
+    categories = list(CATEGORY_BASE_WEIGHT)
+
+    activity = rng.lognormvariate(0, 0.9)
+    workouts_per_week = max(params.mean_workouts_per_week * activity / math.exp(0.9 ** 2 / 2), 0.1)
+    strength = rng.lognormvariate(0, 0.3)
+    churn_at = params.end_date
+    if rng.random() < 0.3:
+        active_days = (params.end_date - registered_at).days
+        churn_at = registered_at + dt.timedelta(days=rng.randrange(active_days or 1))
+
+    favorites = sorted(set(rng.choices(exercise_ids, weights=popularity, k=rng.randint(6, 20))))
+    start_weight = {
+        exercise_id: CATEGORY_BASE_WEIGHT[categories[(exercise_id - 1) % len(categories)]]
+        * strength * rng.uniform(0.6, 1.0)
+        for exercise_id in favorites
+    }
+
+    day = registered_at
+    while True:
+        day += dt.timedelta(days=max(1, round(rng.expovariate(workouts_per_week / 7))))
+        if day > churn_at:
+            return
+
+        counters.workouts += 1
+        workout_id = counters.workouts
+        created_at = dt.datetime.combine(day, dt.time(hour=rng.randrange(6, 23)), dt.timezone.utc)
+        workout = (workout_id, user_id, day, None, created_at, created_at)
+
+        weeks = (day - registered_at).days / 7
+        # Быстрый рост в первые месяцы и плато: до +60% за ~год регулярных тренировок
+        progress = 1 + 0.6 * (1 - math.exp(-weeks / 40))
+        count = min(len(favorites), max(1, round(rng.gauss(params.mean_exercises_per_workout, 1.5))))
+        links = []
+        for exercise_id in rng.sample(favorites, count):
+            weight = start_weight[exercise_id] * progress * rng.gauss(1, 0.05)
+            weight = max(2.5, round(weight / 2.5) * 2.5)
+            reps = max(3, min(20, round(rng.gauss(10, 2) / progress ** 0.5)))
+            counters.workout_exercises += 1
+            links.append((counters.workout_exercises, workout_id, exercise_id,
+                          rng.randint(3, 5), reps, weight, created_at, created_at))
+        yield workout, links
+
+
+def zipf_popularity(count: int, exponent: float = 1.1) -> list[float]:
+    return [1 / rank ** exponent for rank in range(1, count + 1)]
+
+
+async def copy_batches(conn, table: str, columns: list[str], rows: Iterator[tuple]) -> int:
+    total = 0
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= COPY_BATCH:
+            await conn.copy_records_to_table(table, records=batch, columns=columns)
+            total += len(batch)
+            batch = []
+    if batch:
+        await conn.copy_records_to_table(table, records=batch, columns=columns)
+        total += len(batch)
+    return total
+
+
+async def generate(params: Params, skip_fk_checks: bool) -> dict:
+    import asyncpg
+
+    from src.core.batch_tasks import backfill_workout_summaries, rebuild_training_rollups
+    from src.core.config import get_settings
+    from src.services.auth import AuthService
+
+    settings = get_settings()
+
+    async def connect():
+        return await asyncpg.connect(
+            host=settings.DB_HOST, port=settings.DB_PORT, user=settings.DB_USER,
+            password=settings.DB_PASS, database=settings.DB_NAME,
+        )
+
+    async def analyze(tables: tuple[str, ...]) -> float:
+        started = time.perf_counter()
+        conn = await connect()
+        try:
+            for table in tables:
+                await conn.execute(f"ANALYZE {table}")
+        finally:
+            await conn.close()
+        return round(time.perf_counter() - started, 2)
+
+    conn = await connect()
+    # Один хэш на всех: Argon2 на каждого пользователя занял бы часы
+    hashed_password = AuthService().hash_password(SEED_PASSWORD)
+    counters = Counters()
+    timings = {}
+
+    try:
+        async with conn.transaction():
+            if skip_fk_checks:
+                # Отключает проверки внешних ключей на время загрузки (нужны права суперпользователя)
+                await conn.execute("SET LOCAL session_replication_role = replica")
+            await conn.execute(f"TRUNCATE {', '.join(TABLES)} RESTART IDENTITY CASCADE")
+
+            started = time.perf_counter()
+            await copy_batches(
+                conn, "exercises",
+                ["id", "name", "description", "category", "created_at", "updated_at"],
+                iter(exercise_rows(params)),
+            )
+            users = list(user_rows(params, hashed_password))
+            await copy_batches(
+                conn, "users",
+                ["id", "email", "hashed_password", "role", "is_active", "is_verified",
+                 "created_at", "updated_at"],
+                iter(users),
+            )
+            timings["users_and_exercises_s"] = round(time.perf_counter() - started, 2)
+
+            # Тренировки и упражнения в них генерируются одним проходом и сбрасываются пачками:
+            # сначала тренировки, затем их упражнения, чтобы внешние ключи были уже выполнены
+            started = time.perf_counter()
+            popularity = zipf_popularity(params.exercises)
+            workouts: list[tuple] = []
+            links: list[tuple] = []
+
+            async def flush() -> None:
+                await copy_batches(conn, "workouts", WORKOUT_COLUMNS, iter(workouts))
+                await copy_batches(conn, "workout_exercises", WORKOUT_EXERCISE_COLUMNS, iter(links))
+                workouts.clear()
+                links.clear()
+
+            for user in users:
+                user_id, registered_at = user[0], user[6].date()
+                for workout, workout_links in user_workouts(
+                    params, user_id, registered_at, popularity, counters
+                ):
+                    workouts.append(workout)
+                    links.extend(workout_links)
+                if len(links) >= COPY_BATCH:
+                    await flush()
+            await flush()
+            timings["workouts_s"] = round(time.perf_counter() - started, 2)
+
+            # Явные id при COPY не двигают последовательности — выставляем их вручную
+            for table in TABLES:
+                await conn.execute(
+                    f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+                    f"COALESCE((SELECT max(id) FROM {table}), 0) + 1, false)"
+                )
+
+            # Лента изменений: по записи на тренировку, как после миграции workout_changes
+            started = time.perf_counter()
+            await conn.execute(
+                """
+                INSERT INTO workout_changes (user_id, workout_id, seq, deleted)
+                SELECT user_id, id, row_number() OVER (PARTITION BY user_id ORDER BY id), false
+                FROM workouts
+                """
+            )
+            await conn.execute(
+                """
+                INSERT INTO workout_change_counters (user_id, seq)
+                SELECT user_id, max(seq) FROM workout_changes GROUP BY user_id
+                """
+            )
+            timings["workout_changes_s"] = round(time.perf_counter() - started, 2)
+    finally:
+        await conn.close()
+    timings["analyze_s"] = await analyze(TABLES)
+
+    # Сводка и агрегаты считаются теми же запросами, что и в приложении (синхронные сессии)
+    started = time.perf_counter()
+    await asyncio.to_thread(backfill_workout_summaries)
+    timings["workout_summaries_s"] = round(time.perf_counter() - started, 2)
+    started = time.perf_counter()
+    await asyncio.to_thread(rebuild_training_rollups)
+    timings["training_rollups_s"] = round(time.perf_counter() - started, 2)
+    timings["analyze_derived_s"] = await analyze(("workouts",) + DERIVED_TABLES)
+
+    return {
+        "users": len(users),
+        "exercises": params.exercises,
+        "workouts": counters.workouts,
+        "workout_exercises": counters.workout_exercises,
+        "timings": timings,
+    }
+
+
+def estimate_rows(params: Params) -> int:
+    # Грубая оценка: из-за позднего старта и ухода средний пользователь активен ~40% периода
+    weeks = params.years * 52 * 0.43
+    return round(params.users * weeks * params.mean_workouts_per_week
+                 * params.mean_exercises_per_workout)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--env-file", type=Path, default=ROOT / ".env-test")
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--exercises", type=int, default=150)
+    parser.add_argument("--years", type=float, default=2)
+    parser.add_argument("--mean-workouts-per-week", type=float, default=2.5)
+    parser.add_argument("--mean-exercises-per-workout", type=float, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--end-date", type=dt.date.fromisoformat, default=dt.date(2026, 1, 1),
+                        help="Последний день данных; фиксирован, чтобы датасет не зависел от даты запуска")
+    parser.add_argument("--skip-fk-checks", action="store_true",
+                        help="Не проверять внешние ключи при загрузке (быстрее, нужен суперпользователь)")
+    parser.add_argument("--dry-run", action="store_true", help="Только оценить объём")
+    args = parser.parse_args()
+
+    params = Params(
+        users=args.users,
+        exercises=args.exercises,
+        years=args.years,
+        mean_workouts_per_week=args.mean_workouts_per_week,
+        mean_exercises_per_workout=args.mean_exercises_per_workout,
+        seed=args.seed,
+        end_date=args.end_date,
+    )
+    print(f"Ожидается около {estimate_rows(params):,} строк workout_exercises", file=sys.stderr)
+    if args.dry_run:
+        return 0
+
+    load_test_env(args.env_file)
+    started = time.perf_counter()
+    result = asyncio.run(generate(params, args.skip_fk_checks))
+    result["total_s"] = round(time.perf_counter() - started, 2)
+    print(result)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,150 @@
+"""Бенчмарк времени старта процессов по данным `python -X importtime`.
+
+Для каждого профиля (веб, Celery-воркер, Alembic/модели) в отдельном процессе измеряется
+суммарное время импорта и проверяется, что профиль не тянет лишние тяжёлые зависимости.
+Скрипт завершается с кодом 1, если превышен порог времени или загружен запрещённый модуль.
+
+    python benchmarks/import_time.py --runs 5
+    python benchmarks/import_time.py --json > import_time.json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+@dataclass(frozen=True)
+class Profile:
+    name: str
+    code: str
+    max_ms: float
+    forbidden_modules: tuple[str, ...] = ()
+
+
+PROFILES = (
+    Profile(
+        name="web",
+        code="import src.main",
+        max_ms=2500,
+        forbidden_modules=("psycopg2",),
+    ),
+    Profile(
+        name="worker",
+        code=(
+            "from src.core.celery_config import get_celery_app;"
+            "get_celery_app().loader.import_default_modules()"
+        ),
+        max_ms=1800,
+        forbidden_modules=("fastapi", "asyncpg"),
+    ),
+    Profile(
+        name="migrations",
+        code="import src.core.config, src.core.db, src.models",
+        max_ms=1000,
+        forbidden_modules=("celery", "kombu", "asyncpg", "psycopg2", "fastapi"),
+    ),
+)
+
+
+def load_env_file(path: Path) -> dict[str, str]:
+    env = {}
+    if not path.exists():
+        return env
+    for line in path.read_text(encoding="utf8").splitlines():
+        line = line.strip()
+        if not line or line.startswith("#") or "=" not in line:
+            continue
+        key, value = line.split("=", 1)
+        env[key.strip()] = value.strip()
+    return env
+
+
+def parse_importtime(stderr: str) -> float:
+    # Формат строки: "import time: self [us] | cumulative | imported package".
+    # Суммируем cumulative модулей верхнего уровня (без отступа в имени)
+    total_us = 0
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if not name.startswith("  "):
+            total_us += int(cumulative)
+    return total_us / 1000
+
+
+def run_profile(profile: Profile, env: dict[str, str]) -> tuple[float, list[str]]:
+    code = (
+        f"{profile.code}\n"
+        "import sys\n"
+        f"print(','.join(m for m in {list(profile.forbidden_modules)!r} if m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    loaded = [m for m in result.stdout.strip().split(",") if m]
+    return parse_importtime(result.stderr), loaded
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--env-file", default=".env-test")
+    parser.add_argument("--threshold-factor", type=float, default=1.0,
+                        help="Множитель порогов (например, 1.5 для медленных CI-машин)")
+    parser.add_argument("--json", action="store_true", help="Вывести результаты в JSON")
+    args = parser.parse_args()
+
+    env = {**load_env_file(ROOT / args.env_file), **os.environ}
+    env.pop("PYTHONIMPORTTIME", None)
+
+    results = []
+    failed = False
+    for profile in PROFILES:
+        timings = []
+        loaded: list[str] = []
+        for _ in range(args.runs):
+            elapsed_ms, loaded = run_profile(profile, env)
+            timings.append(elapsed_ms)
+        median_ms = statistics.median(timings)
+        max_ms = profile.max_ms * args.threshold_factor
+        ok = median_ms <= max_ms and not loaded
+        failed = failed or not ok
+        results.append(
+            {
+                "profile": profile.name,
+                "median_ms": round(median_ms, 1),
+                "min_ms": round(min(timings), 1),
+                "max_allowed_ms": max_ms,
+                "forbidden_loaded": loaded,
+                "ok": ok,
+            }
+        )
+
+    if args.json:
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+    else:
+        for r in results:
+            status = "OK  " if r["ok"] else "FAIL"
+            extra = f" запрещённые модули: {', '.join(r['forbidden_loaded'])}" if r["forbidden_loaded"] else ""
+            print(
+                f"{status} {r['profile']:<11} median={r['median_ms']:>8.1f} ms "
+                f"min={r['min_ms']:>8.1f} ms limit={r['max_allowed_ms']:.0f} ms{extra}"
+            )
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,195 @@
+"""Расчёт прогресса по упражнению (GET /analytics/progress/{exercise_id}) на больших историях.
+
+Замеряется только CPU-часть, без БД и сети:
+- python — тот же расчёт циклами по записям и дням (эталон для сверки);
+- numpy — src.services.progress: столбцы из списков (как их отдаёт asyncpg) и векторный расчёт;
+  numpy_compute — только расчёт по готовым массивам.
+
+Перед замером результаты обоих способов сравниваются; при расхождении скрипт завершается
+с кодом 1.
+
+    python benchmarks/progress.py
+    python benchmarks/progress.py --sizes 10000 50000 --formula brzycki --json
+"""
+
+import argparse
+import json
+import math
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import numpy as np  # noqa: E402
+
+from src.services.progress import (  # noqa: E402
+    E1RM_MAX_REPS,
+    PROGRESS_DEFAULT_VOLUME_DAYS,
+    PROGRESS_DEFAULT_WINDOW,
+    ExerciseHistory,
+    compute_progress,
+)
+
+Columns = tuple[list[int], list[int], list[int], list[float]]
+
+
+def make_history(records: int, rng: random.Random) -> Columns:
+    # Тренировка раз в 1–4 дня, 3–6 записей упражнения за тренировку, рабочий вес растёт
+    days, sets, reps, weight = [], [], [], []
+    day = 19000
+    while len(days) < records:
+        day += rng.randint(1, 4)
+        for _ in range(min(rng.randint(3, 6), records - len(days))):
+            days.append(day)
+            sets.append(rng.randint(1, 5))
+            reps.append(rng.choice((1, 3, 5, 8, 10, 12, 15, 20)))
+            weight.append(round(40 + (day - 19000) * 0.05 + rng.uniform(-10, 10), 1))
+    return days, sets, reps, weight
+
+
+def python_progress(columns: Columns, formula: str, window: int, volume_days: int) -> dict:
+    days, sets, reps, weight = columns
+    by_day: dict[int, list[float]] = {}
+    for day, set_count, rep_count, kg in zip(days, sets, reps, weight):
+        best, volume = by_day.setdefault(day, [math.nan, 0.0])
+        e1rm = math.nan
+        if rep_count <= E1RM_MAX_REPS:
+            if rep_count == 1:
+                e1rm = kg
+            elif formula == "epley":
+                e1rm = kg * (1 + rep_count / 30)
+            else:
+                e1rm = kg * 36 / (37 - rep_count)
+        if math.isnan(best) or e1rm > best:
+            best = e1rm
+        by_day[day] = [best, volume + set_count * rep_count * kg]
+
+    day_list = sorted(by_day)
+    best_list = [by_day[day][0] for day in day_list]
+    volume_list = [by_day[day][1] for day in day_list]
+
+    moving = []
+    for i in range(len(day_list)):
+        values = [v for v in best_list[max(0, i - window + 1):i + 1] if not math.isnan(v)]
+        moving.append(sum(values) / len(values) if values else math.nan)
+    rolling = []
+    start = 0
+    window_volume = 0.0
+    for day, volume in zip(day_list, volume_list):
+        window_volume += volume
+        while day_list[start] <= day - volume_days:
+            window_volume -= volume_list[start]
+            start += 1
+        rolling.append(window_volume)
+
+    points = [(d, v) for d, v in zip(day_list, best_list) if not math.isnan(v)]
+    x_mean = sum(d for d, _ in points) / len(points)
+    y_mean = sum(v for _, v in points) / len(points)
+    slope = sum((d - x_mean) * (v - y_mean) for d, v in points) / sum(
+        (d - x_mean) ** 2 for d, _ in points
+    )
+    return {
+        "days": day_list,
+        "best_e1rm": best_list,
+        "e1rm_moving_average": moving,
+        "volume": volume_list,
+        "rolling_volume": rolling,
+        "slope_per_week": slope * 7,
+    }
+
+
+def numpy_progress(columns: Columns, formula: str, window: int, volume_days: int) -> dict:
+    progress = compute_progress(ExerciseHistory.from_columns(*columns), formula, window, volume_days)
+    return {
+        "days": progress.days,
+        "best_e1rm": progress.best_e1rm,
+        "e1rm_moving_average": progress.e1rm_moving_average,
+        "volume": progress.volume,
+        "rolling_volume": progress.rolling_volume,
+        "slope_per_week": progress.trend.slope_per_week,
+    }
+
+
+def same_result(expected: dict, actual: dict) -> bool:
+    return all(
+        np.allclose(np.asarray(expected[key], dtype=float), np.asarray(actual[key], dtype=float),
+                    equal_nan=True)
+        for key in expected
+    )
+
+
+def measure(method: Callable[[], Any], min_time: float) -> float:
+    # Повторяем, пока не наберётся min_time, и берём лучшее время одного вызова
+    best = float("inf")
+    total = 0.0
+    while total < min_time:
+        started = time.perf_counter()
+        method()
+        elapsed = time.perf_counter() - started
+        best = min(best, elapsed)
+        total += elapsed
+    return best
+
+
+def run(sizes: list[int], formula: str, window: int, volume_days: int, min_time: float,
+        seed: int) -> tuple[dict[str, Any], list[str]]:
+    rng = random.Random(seed)
+    report: dict[str, Any] = {}
+    mismatches = []
+    for size in sizes:
+        columns = make_history(size, rng)
+        args = (columns, formula, window, volume_days)
+        expected = python_progress(*args)
+        if not same_result(expected, numpy_progress(*args)):
+            mismatches.append(f"records[{size}]")
+
+        python_ms = measure(lambda: python_progress(*args), min_time) * 1e3
+        numpy_ms = measure(lambda: numpy_progress(*args), min_time) * 1e3
+        history = ExerciseHistory.from_columns(*columns)
+        compute_ms = measure(
+            lambda: compute_progress(history, formula, window, volume_days), min_time
+        ) * 1e3
+        report[f"records[{size}]"] = {
+            "days": len(expected["days"]),
+            "python_ms": round(python_ms, 2),
+            "numpy_ms": round(numpy_ms, 3),
+            "numpy_compute_ms": round(compute_ms, 3),
+            "speedup": round(python_ms / numpy_ms, 1),
+        }
+    return report, mismatches
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--formula", choices=["epley", "brzycki"], default="epley")
+    parser.add_argument("--window", type=int, default=PROGRESS_DEFAULT_WINDOW)
+    parser.add_argument("--volume-days", type=int, default=PROGRESS_DEFAULT_VOLUME_DAYS)
+    parser.add_argument("--min-time", type=float, default=0.5,
+                        help="Минимальное суммарное время замера одного способа, с")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", action="store_true", help="Вывести отчёт в JSON")
+    args = parser.parse_args()
+
+    report, mismatches = run(args.sizes, args.formula, args.window, args.volume_days,
+                             args.min_time, args.seed)
+
+    if args.json:
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+    else:
+        for payload, row in report.items():
+            print(f"{payload:<16} {row['days']:>6} дн.  python={row['python_ms']:.2f}ms  "
+                  f"numpy={row['numpy_ms']:.3f}ms (расчёт {row['numpy_compute_ms']:.3f}ms)  "
+                  f"x{row['speedup']}")
+
+    for mismatch in mismatches:
+        print(f"Результат numpy отличается от python: {mismatch}", file=sys.stderr)
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,231 @@
+"""Воспроизведение записанного трафика (TRAFFIC_CAPTURE_ENABLED) и сравнение задержек.
+
+Читает NDJSON-трассы (включая ротированные файлы всех воркеров), упорядочивает запросы по
+времени и отправляет их с исходными интервалами, ускоренными в --speed раз, — в приложение
+в процессе (httpx.ASGITransport, как benchmarks/endpoints.py) или в запущенный экземпляр
+(--base-url). В отчёте по каждому маршруту — p50/p95/p99 записанных и воспроизведённых
+задержек и их разница.
+
+Пользователи из трассы (хэши) сопоставляются пользователям тестовой БД, id тренировок в пути —
+тренировкам сопоставленного пользователя; скрытые поля (почта, пароль) подставляются от него.
+БД должна быть заполнена benchmarks/endpoints.py или benchmarks/generate_data.py.
+
+    python benchmarks/replay.py traffic/ --speed 2
+    python benchmarks/replay.py traffic/capture-*.ndjson* --base-url http://127.0.0.1:8000
+"""
+
+import argparse
+import asyncio
+import glob
+import itertools
+import json
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+from unittest.mock import patch
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from common import load_test_env, percentile  # noqa: E402
+from endpoints import SEED_PASSWORD, load_fixtures  # noqa: E402
+
+ROOT = Path(__file__).resolve().parent.parent
+REDACTED = "***"
+
+
+def read_traces(paths: list[str]) -> list[dict]:
+    files = []
+    for pattern in paths:
+        path = Path(pattern)
+        if path.is_dir():
+            files.extend(sorted(path.glob("*.ndjson*")))
+        else:
+            files.extend(Path(p) for p in sorted(glob.glob(pattern)))
+
+    traces = []
+    for file in files:
+        with file.open(encoding="utf8") as f:
+            traces.extend(json.loads(line) for line in f if line.strip())
+    traces.sort(key=lambda trace: trace["ts"])
+    return traces
+
+
+class RequestBuilder:
+    def __init__(self, fixtures: dict):
+        self.fixtures = fixtures
+        self.users = {user.id: user for user in fixtures["users"]}
+        self.workouts_by_user = defaultdict(list)
+        for workout in fixtures["workouts"]:
+            self.workouts_by_user[workout.user_id].append(workout.id)
+        self._free_users = itertools.cycle(
+            [user_id for user_id in self.users if self.workouts_by_user[user_id]] or self.users
+        )
+        self._subjects: dict[str, int] = {}
+        self._exercise_ids = itertools.cycle(fixtures["exercise_ids"])
+        self._registrations = itertools.count()
+
+    def user_for(self, subject: str | None) -> int:
+        key = subject or ""
+        if key not in self._subjects:
+            self._subjects[key] = next(self._free_users)
+        return self._subjects[key]
+
+    def fill(self, data, user_id: int):
+        if isinstance(data, dict):
+            result = {}
+            for key, value in data.items():
+                if value != REDACTED:
+                    result[key] = self.fill(value, user_id)
+                elif "password" in key:
+                    result[key] = SEED_PASSWORD
+                elif "email" in key:
+                    result[key] = f"replay{next(self._registrations)}-{time.time_ns()}@bench.local"
+                # Прочие скрытые значения (токены) воспроизвести нельзя — поле опускается
+            return result
+        if isinstance(data, list):
+            return [self.fill(item, user_id) for item in data]
+        return data
+
+    def build(self, trace: dict) -> dict:
+        user_id = self.user_for(trace.get("subject"))
+        params = dict(trace.get("path_params") or {})
+        if "workout_id" in params and self.workouts_by_user[user_id]:
+            workouts = self.workouts_by_user[user_id]
+            params["workout_id"] = workouts[int(params["workout_id"]) % len(workouts)]
+        if "exercise_id" in params:
+            params["exercise_id"] = next(self._exercise_ids)
+
+        body = self.fill(trace.get("body"), user_id)
+        if trace["route"] == "/auth/login" and isinstance(body, dict):
+            # Вход от имени сопоставленного пользователя, а не случайной новой почты
+            body["email"] = self.users[user_id].email
+
+        headers = {}
+        if trace.get("subject"):
+            headers["Cookie"] = f"access_token={self.fixtures['tokens'][user_id]}"
+        return {
+            "method": trace["method"],
+            "url": trace["route"].format(**params),
+            "params": self.fill(trace.get("query") or {}, user_id),
+            "json": body,
+            "headers": headers,
+        }
+
+
+async def replay(traces: list[dict], builder: RequestBuilder, client: httpx.AsyncClient,
+                 speed: float) -> list[tuple[dict, float, int]]:
+    results = []
+    first_ts = traces[0]["ts"]
+    started = time.perf_counter()
+
+    async def send(trace: dict) -> None:
+        request = builder.build(trace)
+        sent = time.perf_counter()
+        try:
+            response = await client.request(**request)
+            status = response.status_code
+        except httpx.HTTPError:
+            status = 0
+        results.append((trace, (time.perf_counter() - sent) * 1000, status))
+
+    tasks = []
+    for trace in traces:
+        if trace["route"] == "unmatched":
+            continue
+        # Открытая модель нагрузки: запрос уходит по расписанию, не дожидаясь предыдущих
+        delay = (trace["ts"] - first_ts) / speed - (time.perf_counter() - started)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(send(trace)))
+    await asyncio.gather(*tasks)
+    return results
+
+
+def summarize(results: list[tuple[dict, float, int]]) -> dict:
+    by_route = defaultdict(lambda: {"captured": [], "replayed": [], "status_mismatch": 0})
+    for trace, latency_ms, status in results:
+        route = by_route[f"{trace['method']} {trace['route']}"]
+        route["captured"].append(trace["duration_ms"])
+        route["replayed"].append(latency_ms)
+        if status != trace["status"]:
+            route["status_mismatch"] += 1
+
+    report = {}
+    for name, data in sorted(by_route.items()):
+        entry = {"requests": len(data["replayed"]), "status_mismatch": data["status_mismatch"]}
+        for pct in (50, 95, 99):
+            captured = percentile(data["captured"], pct)
+            replayed = percentile(data["replayed"], pct)
+            entry[f"p{pct}_captured_ms"] = round(captured, 2)
+            entry[f"p{pct}_replayed_ms"] = round(replayed, 2)
+            entry[f"p{pct}_delta_ms"] = round(replayed - captured, 2)
+        report[name] = entry
+    return report
+
+
+async def run(args: argparse.Namespace, traces: list[dict]) -> dict:
+    fixtures = await load_fixtures(args.sample_users)
+    builder = RequestBuilder(fixtures)
+
+    if args.base_url:
+        async with httpx.AsyncClient(base_url=args.base_url, timeout=60) as client:
+            results = await replay(traces, builder, client, args.speed)
+    else:
+        from fastapi_cache import FastAPICache
+        from fastapi_cache.backends.inmemory import InMemoryBackend
+
+        from src.main import app
+
+        FastAPICache.init(InMemoryBackend(), prefix="replay-cache")
+        app.state.ready = True
+        transport = httpx.ASGITransport(app=app)
+        with patch("src.services.auth.send_confirmation_email.delay"), patch(
+            "src.api.metrics.refresh_queue_lengths"
+        ):
+            async with httpx.AsyncClient(transport=transport, base_url="http://replay") as client:
+                results = await replay(traces, builder, client, args.speed)
+
+    return {
+        "meta": {
+            "target": args.base_url or "in-process",
+            "speed": args.speed,
+            "requests": len(results),
+            "captured_span_s": round(traces[-1]["ts"] - traces[0]["ts"], 3),
+        },
+        "routes": summarize(results),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("traces", nargs="+", help="Файлы трасс, шаблоны или директории")
+    parser.add_argument("--env-file", type=Path, default=ROOT / ".env-test")
+    parser.add_argument("--base-url", help="Адрес запущенного экземпляра вместо приложения в процессе")
+    parser.add_argument("--speed", type=float, default=1.0,
+                        help="Во сколько раз быстрее исходного темпа воспроизводить трафик")
+    parser.add_argument("--limit", type=int, help="Воспроизвести только первые N запросов")
+    parser.add_argument("--sample-users", type=int, default=200,
+                        help="Сколько пользователей БД сопоставлять пользователям трассы")
+    parser.add_argument("--output", type=Path, help="Сохранить отчёт в JSON-файл")
+    args = parser.parse_args()
+
+    traces = read_traces(args.traces)[: args.limit]
+    if not traces:
+        print("Трассы не найдены", file=sys.stderr)
+        return 1
+
+    load_test_env(args.env_file)
+    report = asyncio.run(run(args, traces))
+
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        args.output.write_text(output)
+    print(output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,159 @@
+"""Сравнение способов сериализации списочных ответов (GET /exercises, GET /workouts).
+
+Замеряется только CPU-часть ответа, без БД и сети:
+- default — путь FastAPI до перехода на orjson: jsonable_encoder + json.dumps (JSONResponse);
+- orjson — jsonable_encoder + ORJSONResponse, класс ответа приложения по умолчанию;
+- response_model — проверка и сериализация через поле response_model маршрута + orjson;
+- type_adapter — готовый TypeAdapter(list[...]).dump_json сразу в байты.
+
+Перед замером тела ответов всех способов сравниваются с default; при расхождении скрипт
+завершается с кодом 1.
+
+    python benchmarks/serialization.py
+    python benchmarks/serialization.py --sizes 100 1000 10000 --json
+"""
+
+import argparse
+import datetime as dt
+import json
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from fastapi.utils import create_model_field  # noqa: E402
+from pydantic import TypeAdapter  # noqa: E402
+from starlette.responses import JSONResponse  # noqa: E402
+
+from src.core.responses import (  # noqa: E402
+    DefaultResponse,
+    EXERCISE_LIST_ADAPTER,
+    WORKOUT_LIST_ADAPTER,
+    serialize_list,
+)
+from src.schemas.exercises import Category, Exercise  # noqa: E402
+from src.schemas.workouts import Workout  # noqa: E402
+
+
+def make_exercises(count: int, rng: random.Random) -> list[Exercise]:
+    categories = list(Category)
+    return [
+        Exercise(
+            id=i,
+            name=f"Упражнение {i}",
+            description=None if rng.random() < 0.2 else f"Описание упражнения {i} " * 3,
+            category=rng.choice(categories),
+        )
+        for i in range(1, count + 1)
+    ]
+
+
+def make_workouts(count: int, rng: random.Random) -> list[Workout]:
+    start = dt.date(2024, 1, 1)
+    return [
+        Workout(
+            id=i,
+            user_id=1,
+            date=start + dt.timedelta(days=i),
+            description=None if rng.random() < 0.5 else f"Тренировка {i}",
+        )
+        for i in range(1, count + 1)
+    ]
+
+
+def build_methods(schema: type, adapter: TypeAdapter) -> dict[str, Callable[[list], bytes]]:
+    field = create_model_field(name="Response", type_=list[schema], mode="serialization")
+
+    def response_model(items: list) -> bytes:
+        # То же, что fastapi.routing.serialize_response для асинхронного эндпоинта
+        value, _ = field.validate(items, {}, loc=("response",))
+        return DefaultResponse(field.serialize(value)).body
+
+    return {
+        "default": lambda items: JSONResponse(jsonable_encoder(items)).body,
+        "orjson": lambda items: DefaultResponse(jsonable_encoder(items)).body,
+        "response_model": response_model,
+        "type_adapter": lambda items: serialize_list(adapter, items).body,
+    }
+
+
+def measure(method: Callable[[list], bytes], items: list, min_time: float) -> float:
+    # Повторяем, пока не наберётся min_time, и берём лучшее время одного вызова
+    best = float("inf")
+    total = 0.0
+    while total < min_time:
+        started = time.perf_counter()
+        method(items)
+        elapsed = time.perf_counter() - started
+        best = min(best, elapsed)
+        total += elapsed
+    return best
+
+
+def run(sizes: list[int], min_time: float, seed: int) -> tuple[dict[str, Any], list[str]]:
+    rng = random.Random(seed)
+    payloads = {
+        "exercises": (make_exercises, Exercise, EXERCISE_LIST_ADAPTER),
+        "workouts": (make_workouts, Workout, WORKOUT_LIST_ADAPTER),
+    }
+    report: dict[str, Any] = {}
+    mismatches = []
+
+    for name, (factory, schema, adapter) in payloads.items():
+        methods = build_methods(schema, adapter)
+        for size in sizes:
+            items = factory(size, rng)
+            expected = methods["default"](items)
+            for method_name, method in methods.items():
+                if method(items) != expected:
+                    mismatches.append(f"{name}[{size}]: {method_name}")
+
+            timings = {
+                method_name: measure(method, items, min_time) * 1e6
+                for method_name, method in methods.items()
+            }
+            report[f"{name}[{size}]"] = {
+                "bytes": len(expected),
+                **{f"{method}_us": round(us, 1) for method, us in timings.items()},
+                **{
+                    f"{method}_speedup": round(timings["default"] / us, 2)
+                    for method, us in timings.items()
+                    if method != "default"
+                },
+            }
+    return report, mismatches
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 150, 1000, 10000])
+    parser.add_argument("--min-time", type=float, default=0.5,
+                        help="Минимальное суммарное время замера одного способа, с")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", action="store_true", help="Вывести отчёт в JSON")
+    args = parser.parse_args()
+
+    report, mismatches = run(args.sizes, args.min_time, args.seed)
+
+    if args.json:
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+    else:
+        for payload, row in report.items():
+            timings = "  ".join(
+                f"{key[:-3]}={value:.1f}us" for key, value in row.items() if key.endswith("_us")
+            )
+            print(f"{payload:<18} {row['bytes']:>9} B  {timings}  "
+                  f"x{row['type_adapter_speedup']} type_adapter")
+
+    for mismatch in mismatches:
+        print(f"Тело ответа отличается от default: {mismatch}", file=sys.stderr)
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
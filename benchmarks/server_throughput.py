@@ -0,0 +1,101 @@
+"""Сравнение пропускной способности GET /exercises для разных конфигураций сервера.
+
+Каждая конфигурация запускается через `python -m src.server` на отдельном порту, после
+готовности (/health/ready) на неё подаётся нагрузка. Нужны запущенные PostgreSQL и Redis
+и заполненный каталог упражнений.
+
+    python benchmarks/server_throughput.py --duration 10 --concurrency 64
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import signal
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from common import run_load  # noqa: E402
+
+ROOT = Path(__file__).resolve().parent.parent
+
+CONFIGURATIONS = {
+    "1w-asyncio-h11": ["--workers", "1", "--loop", "asyncio", "--http", "h11"],
+    "1w-uvloop-httptools": ["--workers", "1", "--loop", "uvloop", "--http", "httptools"],
+    "Nw-asyncio-h11": ["--loop", "asyncio", "--http", "h11"],
+    "Nw-uvloop-httptools": ["--loop", "uvloop", "--http", "httptools"],
+}
+
+
+def wait_ready(base_url: str, timeout: float = 60) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"{base_url}/health/ready", timeout=1).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise TimeoutError(f"Сервер {base_url} не стал готов за {timeout} с")
+
+
+async def bench(base_url: str, path: str, concurrency: int, duration: float) -> dict:
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+        # Короткий прогон без замеров, чтобы открылись соединения
+        await run_load(client, lambda c: c.get(path), concurrency=concurrency, duration_s=1)
+        result = await run_load(
+            client, lambda c: c.get(path), concurrency=concurrency, duration_s=duration
+        )
+    return result.summary()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--path", default="/exercises")
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--port", type=int, default=18000)
+    parser.add_argument("--config", action="append", choices=list(CONFIGURATIONS),
+                        help="Запустить только указанные конфигурации")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    results = {}
+    for index, name in enumerate(args.config or CONFIGURATIONS):
+        port = args.port + index
+        base_url = f"http://127.0.0.1:{port}"
+        server = subprocess.Popen(
+            [sys.executable, "-m", "src.server", "--host", "127.0.0.1", "--port", str(port),
+             *CONFIGURATIONS[name]],
+            cwd=ROOT,
+            env={**os.environ, "WARMUP_ENABLED": "true"},
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        try:
+            wait_ready(base_url)
+            results[name] = asyncio.run(bench(base_url, args.path, args.concurrency, args.duration))
+        finally:
+            server.send_signal(signal.SIGTERM)
+            server.wait(timeout=60)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for name, summary in results.items():
+            print(
+                f"{name:<22} rps={summary['rps']:>9.1f} p50={summary['p50_ms']:>7.2f} ms "
+                f"p99={summary['p99_ms']:>7.2f} ms errors={summary['errors']}"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
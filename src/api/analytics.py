@@ -0,0 +1,92 @@
+import datetime
+
+from fastapi import APIRouter, HTTPException, Query
+
+from src.api.dependency import UserDep, DBDep
+from src.core.responses import serialize_columns
+from src.exceptions import ObjectNotFoundException, ValidationServiceError
+from src.schemas.analytics import (
+    E1RMFormula,
+    ExerciseProgress,
+    PROGRESS_MAX_VOLUME_DAYS,
+    PROGRESS_MAX_WINDOW,
+    RollupPeriod,
+    TrainingRollup,
+    TrainingTotals,
+)
+from src.schemas.exercises import Category
+from src.services.analytics import AnalyticsService
+from src.services.progress import PROGRESS_DEFAULT_VOLUME_DAYS, PROGRESS_DEFAULT_WINDOW
+
+router = APIRouter(prefix="/analytics", tags=["Аналитика тренировок"])
+
+RANGE_DESCRIPTION = "По умолчанию — последние 30 дней для day и 12 недель для week"
+
+
+@router.get(
+    "/volume",
+    summary="Объём по категориям за периоды",
+    description=f"Объём, подходы и повторения по дням или неделям и категориям. {RANGE_DESCRIPTION}",
+    response_model=list[TrainingRollup],
+)
+async def get_volume(
+    db: DBDep,
+    user: UserDep,
+    period: RollupPeriod = Query("week"),
+    date_from: datetime.date | None = Query(None),
+    date_to: datetime.date | None = Query(None),
+    category: Category | None = Query(None),
+):
+    user_id = user["user_id"]
+    try:
+        return await AnalyticsService(db).get_volume(user_id, period, date_from, date_to, category)
+    except ValidationServiceError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+
+@router.get(
+    "/totals",
+    summary="Итоги за периоды",
+    description=f"Объём, подходы и повторения по дням или неделям. {RANGE_DESCRIPTION}",
+    response_model=list[TrainingTotals],
+)
+async def get_totals(
+    db: DBDep,
+    user: UserDep,
+    period: RollupPeriod = Query("week"),
+    date_from: datetime.date | None = Query(None),
+    date_to: datetime.date | None = Query(None),
+):
+    user_id = user["user_id"]
+    try:
+        return await AnalyticsService(db).get_totals(user_id, period, date_from, date_to)
+    except ValidationServiceError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+
+@router.get(
+    "/progress/{exercise_id}",
+    summary="Прогресс по упражнению",
+    description=(
+        "По дням тренировок с упражнением: лучшая оценка 1ПМ (формула Эпли или Бжицки, подходы "
+        "до 12 повторений), её скользящее среднее за window дней тренировок, объём и объём за "
+        "volume_days календарных дней. trend — наклон оценки 1ПМ за неделю по всей истории"
+    ),
+    response_model=ExerciseProgress,
+)
+async def get_exercise_progress(
+    exercise_id: int,
+    db: DBDep,
+    user: UserDep,
+    formula: E1RMFormula = Query("epley"),
+    window: int = Query(PROGRESS_DEFAULT_WINDOW, ge=1, le=PROGRESS_MAX_WINDOW),
+    volume_days: int = Query(PROGRESS_DEFAULT_VOLUME_DAYS, ge=1, le=PROGRESS_MAX_VOLUME_DAYS),
+):
+    user_id = user["user_id"]
+    try:
+        progress = await AnalyticsService(db).get_exercise_progress(
+            user_id, exercise_id, formula, window, volume_days
+        )
+    except ObjectNotFoundException:
+        raise HTTPException(status_code=404, detail=f"Упражнение с ID {exercise_id} не найдено")
+    return serialize_columns(progress)
@@ -8,6 +8,7 @@ from starlette.requests import Request
 from starlette.responses import Response, HTMLResponse
 
 from src.api.dependency import DBDep, UserDep, get_current_user
+from src.core.media import media_url
 from src.exceptions import (
     EmailIsAlreadyRegisteredException,
     RegisterErrorException,
@@ -71,25 +72,27 @@ async def confirm_registration(db: DBDep, token: str) -> HTMLResponse:
     try:
         await AuthService(db).confirm_user(token=token)
 
-        html_content = """
+        # Адрес с отпечатком кэшируется браузером навсегда: видео не скачивается повторно
+        video_url = media_url("NGGYU/secret.mp4")
+        html_content = f"""
         <!DOCTYPE html>
         <html>
         <head>
             <title>Email подтвержден!</title>
             <style>
-                body {
+                body {{
                     font-family: Arial, sans-serif;
                     text-align: center;
                     padding: 50px;
                     background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
                     color: white;
-                }
-                .container {
+                }}
+                .container {{
                     background: rgba(255,255,255,0.1);
                     padding: 30px;
                     border-radius: 15px;
                     backdrop-filter: blur(10px);
-                }
+                }}
             </style>
         </head>
         <body>
@@ -98,7 +101,7 @@ async def confirm_registration(db: DBDep, token: str) -> HTMLResponse:
                 <p>Добро пожаловать! Наслаждайтесь:</p>
 
                 <video width="640" height="360" controls autoplay loop muted>
-                    <source src="/static/NGGYU/secret.mp4" type="video/mp4">
+                    <source src="{video_url}" type="video/mp4">
                     Ваш браузер не поддерживает видео.
                 </video>
 
@@ -1,16 +1,19 @@
 from typing import Annotated
 
-from fastapi import Depends, HTTPException
+from fastapi import Depends, HTTPException, Query
+from pydantic import BaseModel
 from starlette.requests import Request
 
-from src.core.db import async_session_maker
+from src.core.db import get_async_session_maker
 from src.core.db_manager import DBManager
+from src.schemas.exercises import Exercise
 from src.schemas.users import Roles
+from src.schemas.workouts import Workout
 from src.services.auth import AuthService
 
 
 async def get_db():
-    async with DBManager(session_factory=async_session_maker) as db:
+    async with DBManager(session_factory=get_async_session_maker()) as db:
         yield db
 
 
@@ -45,3 +48,33 @@ def check_is_admin(user: UserDep):
         return True
     else:
         raise HTTPException(status_code=403, detail="Вы не админ")
+
+
+def fields_dependency(schema: type[BaseModel]):
+    # fields=id,name: только эти поля схемы выбираются из БД и попадают в ответ.
+    # Порядок полей в ответе — как в схеме, независимо от порядка в запросе
+    allowed = tuple(schema.model_fields)
+
+    def get_fields(
+        fields: str | None = Query(
+            None, description=f"Поля через запятую, доступны: {', '.join(allowed)}"
+        ),
+    ) -> list[str] | None:
+        if fields is None:
+            return None
+        requested = {field.strip() for field in fields.split(",") if field.strip()}
+        unknown = sorted(requested - set(allowed))
+        if not requested:
+            raise HTTPException(status_code=422, detail="Список полей не может быть пустым")
+        if unknown:
+            raise HTTPException(
+                status_code=422,
+                detail=f"Недопустимые поля: {', '.join(unknown)}. Доступные поля: {', '.join(allowed)}",
+            )
+        return [field for field in allowed if field in requested]
+
+    return get_fields
+
+
+ExerciseFieldsDep = Annotated[list[str] | None, Depends(fields_dependency(Exercise))]
+WorkoutFieldsDep = Annotated[list[str] | None, Depends(fields_dependency(Workout))]
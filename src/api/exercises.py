@@ -1,13 +1,35 @@
-from fastapi import APIRouter, HTTPException, Query
+import datetime
+
+from fastapi import APIRouter, HTTPException, Query, Request, Response
 from fastapi_cache.decorator import cache
 
-from src.api.dependency import DBDep, UserDep, check_is_admin
+from src.api.dependency import DBDep, ExerciseFieldsDep, UserDep, check_is_admin
+from src.core.cache import (
+    EXERCISES_CACHE_EXPIRE,
+    EXERCISES_CACHE_NAMESPACE,
+    CatalogBody,
+    get_catalog_index,
+    get_or_build_catalog,
+    request_key_builder,
+    invalidate_exercises_cache,
+)
+from src.core.config import settings
+from src.core.responses import (
+    EXERCISE_LIST_ADAPTER,
+    accepts_encoding,
+    catalog_response,
+    serialize_list,
+    serialize_rows,
+)
 from src.exceptions import (
     ObjectNotFoundException,
     ObjectAlreadyExistsException,
     DataIsEmptyException,
 )
 from src.schemas.exercises import (
+    EXERCISES_IDS_MAX_COUNT,
+    Exercise,
+    ExerciseChanges,
     ExerciseUpdatePut,
     ExerciseUpdatePatch,
     Category,
@@ -18,13 +40,107 @@ from src.services.exercises import ExercisesService
 router = APIRouter(prefix="/exercises", tags=["Упражнения"])
 
 
-@router.get("", summary="Доступные упражнения")
-@cache(expire=3600)
-async def get_exercises(db: DBDep):
+@cache(
+    expire=EXERCISES_CACHE_EXPIRE,
+    namespace=EXERCISES_CACHE_NAMESPACE,
+    key_builder=request_key_builder,
+)
+async def get_cached_exercises(request: Request, response: Response, db):
     exercises = await ExercisesService(db).get_exercises()
     return exercises
 
 
+async def load_exercises_catalog(db, encoding: str = "identity") -> CatalogBody:
+    async def build() -> bytes:
+        exercises = await ExercisesService(db).get_exercises()
+        return EXERCISE_LIST_ADAPTER.dump_json(exercises)
+
+    return await get_or_build_catalog(encoding, build, with_gzip=settings.EXERCISES_CACHE_GZIP)
+
+
+def index_exercises(body: bytes) -> dict[int, Exercise]:
+    return {exercise.id: exercise for exercise in EXERCISE_LIST_ADAPTER.validate_json(body)}
+
+
+async def get_exercises_by_ids(db, ids: list[int]) -> list[Exercise]:
+    # Прогретый каталог разбирается один раз на версию, и запрос обходится без БД;
+    # иначе — один запрос к БД, каталог при этом не строится
+    index = await get_catalog_index(index_exercises) if settings.EXERCISES_CACHE_SERIALIZED else None
+    if index is None:
+        return await ExercisesService(db).get_exercises_by_ids(ids)
+    return [index[exercise_id] for exercise_id in dict.fromkeys(ids) if exercise_id in index]
+
+
+def project_exercises(exercises, fields: list[str]) -> list[dict]:
+    include = set(fields)
+    return [exercise.model_dump(include=include) for exercise in exercises]
+
+
+async def get_exercises_fields(db, fields: list[str]) -> list[dict]:
+    # Прогретый каталог проецируется в памяти, иначе из БД выбираются только нужные столбцы
+    index = await get_catalog_index(index_exercises) if settings.EXERCISES_CACHE_SERIALIZED else None
+    if index is None:
+        return await ExercisesService(db).get_exercises(fields)
+    return project_exercises(index.values(), fields)
+
+
+async def warm_up_exercises_cache(db) -> None:
+    if settings.EXERCISES_CACHE_SERIALIZED:
+        await load_exercises_catalog(db)
+    else:
+        await get_cached_exercises(request=None, response=None, db=db)
+
+
+@router.get("", summary="Доступные упражнения", response_model=list[Exercise])
+async def get_exercises(
+    request: Request,
+    response: Response,
+    db: DBDep,
+    fields: ExerciseFieldsDep,
+    ids: list[int] | None = Query(
+        None,
+        max_length=EXERCISES_IDS_MAX_COUNT,
+        description=(
+            "Вернуть только упражнения с этими ID (?ids=1&ids=2), "
+            f"не больше {EXERCISES_IDS_MAX_COUNT}; несуществующие ID пропускаются"
+        ),
+    ),
+):
+    if ids is not None:
+        exercises = await get_exercises_by_ids(db, ids)
+        if fields:
+            return serialize_rows(project_exercises(exercises, fields))
+        return serialize_list(EXERCISE_LIST_ADAPTER, exercises)
+
+    if fields:
+        return serialize_rows(await get_exercises_fields(db, fields))
+
+    if not settings.EXERCISES_CACHE_SERIALIZED:
+        return await get_cached_exercises(request=request, response=response, db=db)
+
+    # Попадание в кэш отдаёт сохранённые байты как есть: без моделей, декодирования и JSON
+    accept_encoding = request.headers.get("accept-encoding", "")
+    encoding = "gzip" if accepts_encoding(accept_encoding, "gzip") else "identity"
+    catalog = await load_exercises_catalog(db, encoding)
+    return catalog_response(request, catalog)
+
+
+@router.get(
+    "/changes",
+    summary="Изменения каталога упражнений",
+    description=(
+        "Упражнения, добавленные или изменённые после since, и ID удалённых. В следующий запрос "
+        "передаётся cursor из ответа; без since возвращается весь каталог"
+    ),
+    response_model=ExerciseChanges,
+)
+async def get_exercise_changes(
+    db: DBDep,
+    since: datetime.datetime | None = Query(None, description="cursor из предыдущего ответа"),
+):
+    return await ExercisesService(db).get_exercise_changes(since)
+
+
 @router.get(
     "/{exercise_id}",
     summary="1 упражнение",
@@ -52,6 +168,7 @@ async def add_exercise(
 
     try:
         created = await ExercisesService(db).add_exercise(exercise_data_dict)
+        await invalidate_exercises_cache()
         return created
     except ObjectAlreadyExistsException:
         raise HTTPException(
@@ -65,6 +182,7 @@ async def delete_exercise(exercise_id: int, db: DBDep, user: UserDep):
 
     try:
         await ExercisesService(db).delete_exercise(exercise_id)
+        await invalidate_exercises_cache()
         return {"message": f"Упражнение с ID={exercise_id} успешно удален"}
     except ObjectNotFoundException:
         raise HTTPException(status_code=404, detail=f"Упражнение с ID={exercise_id} не найден")
@@ -86,6 +204,7 @@ async def update_exercise(
         result = await ExercisesService(db).update_exercise(
             exercise_id, exercise_data_dict, category
         )
+        await invalidate_exercises_cache()
         return result
     except DataIsEmptyException as e:
         raise HTTPException(status_code=403, detail=str(e))
@@ -109,6 +228,7 @@ async def partially_update_exercise(
         result = await ExercisesService(db).partially_update_exercise(
             exercise_id, exercise_data_dict, category
         )
+        await invalidate_exercises_cache()
         return result
     except ObjectNotFoundException:
         raise HTTPException(status_code=404, detail="Объект не найден")
@@ -0,0 +1,24 @@
+from fastapi import APIRouter
+from starlette import status
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+
+router = APIRouter(prefix="/health", tags=["Служебное"])
+
+
+@router.get("/live", summary="Процесс жив", include_in_schema=False)
+async def live():
+    return {"status": "ok"}
+
+
+@router.get("/ready", summary="Готовность принимать трафик", include_in_schema=False)
+async def ready(request: Request):
+    state = request.app.state
+    if not getattr(state, "ready", False):
+        error = getattr(state, "warmup_error", None)
+        content = {"status": "warming_up"}
+        if error is not None:
+            # Прогрев завершился ошибкой и повторяется в фоне
+            content = {"status": "warmup_failed", "error": error}
+        return JSONResponse(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, content=content)
+    return {"status": "ok"}
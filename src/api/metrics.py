@@ -0,0 +1,17 @@
+from fastapi import APIRouter
+from starlette.responses import Response
+
+from src.core.celery_config import get_celery_app
+from src.core.celery_metrics import refresh_queue_lengths
+from src.core.metrics import render_metrics
+
+router = APIRouter(tags=["Служебное"])
+
+
+# Синхронный обработчик: чтение файлов метрик воркеров и опрос брокера выполняются в пуле
+# потоков, а не в event loop
+@router.get("/metrics", summary="Метрики в формате Prometheus", include_in_schema=False)
+def metrics():
+    refresh_queue_lengths(get_celery_app())
+    content, content_type = render_metrics()
+    return Response(content=content, media_type=content_type)
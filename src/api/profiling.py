@@ -0,0 +1,75 @@
+import jwt
+from fastapi import HTTPException
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.api.dependency import check_is_admin, get_current_user, get_token
+from src.core.profiling import RequestProfile, profile_call
+
+# Запрос с заголовком «X-Profile: speedscope» (или «collapsed») от администратора выполняется под
+# профилировщиком, а вместо ответа эндпоинта возвращается профиль и время SQL-запросов:
+# curl ... -H "X-Profile: speedscope" | jq .profile > profile.json  — файл открывается в speedscope.app
+PROFILE_HEADER = b"x-profile"
+PROFILE_FORMATS = ("speedscope", "collapsed")
+
+
+def get_profile_format(scope: Scope) -> str | None:
+    for name, value in scope["headers"]:
+        if name == PROFILE_HEADER:
+            value = value.decode().lower()
+            return value if value in PROFILE_FORMATS else "speedscope"
+    return None
+
+
+class ProfilingMiddleware:
+    def __init__(self, app: ASGIApp, interval: float = 0.001):
+        self.app = app
+        self.interval = interval
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        profile_format = get_profile_format(scope) if scope["type"] == "http" else None
+        if profile_format is None:
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            check_is_admin(get_current_user(get_token(Request(scope))))
+        except HTTPException as e:
+            await JSONResponse({"detail": e.detail}, status_code=e.status_code)(scope, receive, send)
+            return
+        except jwt.PyJWTError:
+            await JSONResponse({"detail": "Ошибка: Неверный токен"}, status_code=401)(
+                scope, receive, send
+            )
+            return
+
+        status_code = 500
+
+        # Ответ эндпоинта не отправляется клиенту: нужен только его статус
+        async def capture_send(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+
+        profile = RequestProfile(name=f"{scope['method']} {scope['path']}", interval=self.interval)
+        await profile_call(profile, scope, lambda: self.app(scope, receive, capture_send))
+
+        if profile_format == "collapsed":
+            profile_data = profile.to_collapsed()
+        else:
+            profile_data = profile.to_speedscope()
+
+        response = JSONResponse(
+            {
+                "request": {
+                    "method": scope["method"],
+                    "path": scope["path"],
+                    "status_code": status_code,
+                    "duration_ms": round(profile.duration * 1000, 3),
+                },
+                "sql": profile.sql_report(),
+                "profile": profile_data,
+            }
+        )
+        await response(scope, receive, send)
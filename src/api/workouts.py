@@ -1,18 +1,50 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
 
-from src.api.dependency import UserDep, DBDep
+from src.api.dependency import UserDep, DBDep, WorkoutFieldsDep
+from src.core.responses import WORKOUT_LIST_ADAPTER, serialize_list, serialize_rows
 from src.exceptions import ObjectNotFoundException, DataIsEmptyException, AccessDeniedException
-from src.schemas.workouts import WorkoutRequest, WorkoutUpdatePatch, ExerciseToAdd
+from src.schemas.workouts import (
+    Workout,
+    WorkoutRequest,
+    WorkoutUpdatePatch,
+    ExerciseToAdd,
+    WorkoutBatchRequest,
+    WorkoutBatchItemResult,
+    WorkoutChangesPage,
+    WORKOUT_CHANGES_PAGE_MAX_SIZE,
+)
 from src.services.workouts import WorkoutsService
 
 router = APIRouter(prefix="/workouts", tags=["Мои тренировки"])
 
 
-@router.get("", summary="Мои тренировки")
-async def get_all_my_workouts(db: DBDep, user: UserDep):
+@router.get("", summary="Мои тренировки", response_model=list[Workout])
+async def get_all_my_workouts(db: DBDep, user: UserDep, fields: WorkoutFieldsDep):
     user_id = user["user_id"]
-    workouts = await WorkoutsService(db).get_workouts(user_id)
-    return workouts
+    workouts = await WorkoutsService(db).get_workouts(user_id, fields)
+    if fields:
+        return serialize_rows(workouts)
+    return serialize_list(WORKOUT_LIST_ADAPTER, workouts)
+
+
+@router.get(
+    "/changes",
+    summary="Лента изменений моих тренировок",
+    description=(
+        "Тренировки, изменённые после номера since, по возрастанию номера. Удалённые приходят "
+        "с deleted=true. В следующий запрос передаётся next_since; пока has_more=true, "
+        "есть ещё страницы"
+    ),
+    response_model=WorkoutChangesPage,
+)
+async def get_workout_changes(
+    db: DBDep,
+    user: UserDep,
+    since: int = Query(0, ge=0, description="next_since из предыдущего ответа"),
+    limit: int = Query(100, ge=1, le=WORKOUT_CHANGES_PAGE_MAX_SIZE),
+):
+    user_id = user["user_id"]
+    return await WorkoutsService(db).get_workout_changes(user_id, since, limit)
 
 
 @router.get("/get/{workout_id}", summary="Тренировка {workout_id}")
@@ -37,6 +69,16 @@ async def add_workout(workout: WorkoutRequest, db: DBDep, user: UserDep):
         raise HTTPException(status_code=404, detail=str(e))
 
 
+@router.post(
+    "/batch",
+    summary="Добавить несколько тренировок",
+    response_model=list[WorkoutBatchItemResult],
+)
+async def add_workouts_batch(batch: WorkoutBatchRequest, db: DBDep, user: UserDep):
+    user_id = user["user_id"]
+    return await WorkoutsService(db).add_workouts_batch(user_id, batch.workouts)
+
+
 @router.delete("/delete/{workout_id}")
 async def delete_workout(workout_id: int, db: DBDep, user: UserDep):
     user_id = user["user_id"]
@@ -62,6 +104,8 @@ async def partially_update_workout(
         raise HTTPException(status_code=403, detail="Данные не могут быть пусты")
     except ObjectNotFoundException:
         raise HTTPException(status_code=404, detail="Объект не найден")
+    except AccessDeniedException as e:
+        raise HTTPException(status_code=403, detail=str(e))
 
 
 @router.patch("/{workout_id}")
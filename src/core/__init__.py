@@ -1,3 +1,10 @@
-from .celery_config import celery_app
+def __getattr__(name: str):
+    # Celery импортируется только процессами, которые действительно с ним работают
+    if name == "celery_app":
+        from src.core.celery_config import get_celery_app
+
+        return get_celery_app()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = ["celery_app"]
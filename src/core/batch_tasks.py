@@ -0,0 +1,152 @@
+import logging
+from datetime import datetime, timedelta, timezone
+
+from celery import shared_task
+from sqlalchemy import select, delete, exists
+
+from src.core.config import get_settings
+from src.core.db import get_sync_session_maker
+from src.models import TrainingRollupsModel, UsersModel, WorkoutsModel, WorkoutChangeCountersModel
+from src.repositories.queries import (
+    ROLLUP_PERIODS,
+    build_rollups_insert,
+    build_summaries_update,
+    ids_param,
+)
+
+logger = logging.getLogger(__name__)
+
+# Тяжёлые и пакетные задачи. Все задачи этого модуля маршрутизируются в очередь batch
+# (см. task_routes в celery_config.py) и обрабатываются отдельным воркером.
+
+CLEANUP_BATCH_SIZE = 500
+SUMMARIES_BATCH_SIZE = 1000
+ROLLUPS_BATCH_SIZE = 200
+
+
+def _stale_unverified_users_filter(cutoff: datetime) -> tuple:
+    return (
+        # Та же форма условия, что и в частичном индексе ix_users_unverified_id
+        ~UsersModel.is_verified,
+        UsersModel.updated_at < cutoff,
+        # Не трогаем пользователей, которые успели создать тренировки
+        ~exists().where(WorkoutsModel.user_id == UsersModel.id),
+    )
+
+
+@shared_task
+def cleanup_unverified_users(batch_size: int = CLEANUP_BATCH_SIZE) -> int:
+    settings = get_settings()
+    cutoff = datetime.now(timezone.utc) - timedelta(
+        seconds=settings.CONFIRMATION_TOKEN_MAX_AGE + settings.UNVERIFIED_USERS_GRACE_PERIOD
+    )
+    stale_filter = _stale_unverified_users_filter(cutoff)
+
+    session_maker = get_sync_session_maker()
+    last_id = 0
+    deleted_total = 0
+    while True:
+        # Каждая пачка — отдельная короткая транзакция, блокировки держатся недолго
+        with session_maker() as session, session.begin():
+            ids = session.scalars(
+                select(UsersModel.id)
+                .where(UsersModel.id > last_id, *stale_filter)
+                .order_by(UsersModel.id)
+                .limit(batch_size)
+            ).all()
+            if not ids:
+                break
+
+            # Условия проверяем повторно: пользователь мог подтвердить почту между запросами
+            result = session.execute(
+                delete(UsersModel).where(UsersModel.id.in_(ids), *stale_filter)
+            )
+            deleted_total += result.rowcount
+
+        last_id = ids[-1]
+        if len(ids) < batch_size:
+            break
+
+    logger.info("Удалено неподтверждённых аккаунтов: %s", deleted_total)
+    return deleted_total
+
+
+@shared_task
+def backfill_workout_summaries(batch_size: int = SUMMARIES_BATCH_SIZE) -> int:
+    # Заполняет сводку (total_volume, exercises_count, main_categories) у существующих
+    # тренировок. Новые изменения (и смена категории упражнения) сводку обновляют сами,
+    # поэтому задача запускается вручную после миграции
+    session_maker = get_sync_session_maker()
+    last_id = 0
+    updated_total = 0
+    while True:
+        with session_maker() as session, session.begin():
+            ids = session.scalars(
+                select(WorkoutsModel.id)
+                .where(WorkoutsModel.id > last_id)
+                .order_by(WorkoutsModel.id)
+                .limit(batch_size)
+            ).all()
+            if not ids:
+                break
+            result = session.execute(
+                build_summaries_update(ids), execution_options={"synchronize_session": False}
+            )
+            updated_total += result.rowcount
+
+        last_id = ids[-1]
+        if len(ids) < batch_size:
+            break
+
+    logger.info("Пересчитана сводка тренировок: %s", updated_total)
+    return updated_total
+
+
+@shared_task
+def rebuild_training_rollups(batch_size: int = ROLLUPS_BATCH_SIZE) -> int:
+    # Перестраивает training_rollups целиком по пачкам пользователей. Изменения тренировок
+    # и смена категории упражнения обновляют агрегаты сами, задача нужна после миграции
+    # или изменения формулы агрегатов
+    session_maker = get_sync_session_maker()
+    last_user_id = 0
+    users_total = 0
+    while True:
+        with session_maker() as session, session.begin():
+            user_ids = session.scalars(
+                select(WorkoutsModel.user_id)
+                .where(WorkoutsModel.user_id > last_user_id)
+                .group_by(WorkoutsModel.user_id)
+                .order_by(WorkoutsModel.user_id)
+                .limit(batch_size)
+            ).all()
+            if not user_ids:
+                # Тренировок после last_user_id нет ни у кого — их агрегатов тоже быть не должно
+                session.execute(
+                    delete(TrainingRollupsModel).where(TrainingRollupsModel.user_id > last_user_id)
+                )
+                break
+            # Блокировка счётчиков ленты изменений: правки тренировок этих пользователей
+            # (WorkoutChangesRepository.record) ждут окончания пачки и не теряются
+            session.execute(
+                select(WorkoutChangeCountersModel.user_id)
+                .where(WorkoutChangeCountersModel.user_id == ids_param(user_ids))
+                .order_by(WorkoutChangeCountersModel.user_id)
+                .with_for_update()
+            )
+            # Удаляются агрегаты всего диапазона ID с прошлой пачки, в том числе у пользователей,
+            # у которых тренировок больше нет; для последней пачки — до конца таблицы
+            rollups_filter = [TrainingRollupsModel.user_id > last_user_id]
+            if len(user_ids) == batch_size:
+                rollups_filter.append(TrainingRollupsModel.user_id <= user_ids[-1])
+            session.execute(delete(TrainingRollupsModel).where(*rollups_filter))
+            batch_filter = WorkoutsModel.user_id == ids_param(user_ids)
+            for period in ROLLUP_PERIODS:
+                session.execute(build_rollups_insert(period, batch_filter))
+            users_total += len(user_ids)
+
+        last_user_id = user_ids[-1]
+        if len(user_ids) < batch_size:
+            break
+
+    logger.info("Перестроены агрегаты тренировок пользователей: %s", users_total)
+    return users_total
@@ -0,0 +1,138 @@
+import gzip
+import hashlib
+import logging
+import uuid
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable
+
+from fastapi_cache import FastAPICache
+from starlette.requests import Request
+from starlette.responses import Response
+
+EXERCISES_CACHE_NAMESPACE = "exercises"
+EXERCISES_CACHE_EXPIRE = 3600
+
+# Аргументы, которые не влияют на ответ и создаются заново на каждый запрос
+_IGNORED_KWARGS = {"db"}
+
+logger = logging.getLogger(__name__)
+
+
+def request_key_builder(
+    func: Callable[..., Any],
+    namespace: str = "",
+    *,
+    request: Request | None = None,
+    response: Response | None = None,
+    args: tuple[Any, ...],
+    kwargs: dict[str, Any],
+) -> str:
+    # Стандартный key_builder fastapi-cache включает в ключ repr всех аргументов, в том числе
+    # DBManager, поэтому ключ уникален для каждого запроса и кэш никогда не срабатывает
+    params = sorted((k, v) for k, v in kwargs.items() if k not in _IGNORED_KWARGS)
+    cache_key = hashlib.md5(  # noqa: S324
+        f"{func.__module__}:{func.__name__}:{args}:{params}".encode()
+    ).hexdigest()
+    return f"{namespace}:{cache_key}"
+
+
+async def invalidate_exercises_cache() -> None:
+    await FastAPICache.clear(namespace=EXERCISES_CACHE_NAMESPACE)
+    await bump_catalog_version()
+
+
+# Каталог упражнений хранится готовыми телами ответа: отдельно исходный JSON и его gzip.
+# Ключ включает версию каталога, которая меняется при каждом изменении упражнений. Запрос,
+# прочитавший каталог до изменения, положит его под старой версией, и его никто не прочитает
+
+
+@dataclass(frozen=True)
+class CatalogBody:
+    body: bytes
+    encoding: str
+    version: str
+    ttl: int
+    hit: bool
+
+
+def _catalog_key(suffix: str) -> str:
+    return f"{FastAPICache.get_prefix()}:{EXERCISES_CACHE_NAMESPACE}:catalog:{suffix}"
+
+
+async def bump_catalog_version() -> str:
+    version = uuid.uuid4().hex[:16]
+    await FastAPICache.get_backend().set(
+        _catalog_key("version"), version.encode(), EXERCISES_CACHE_EXPIRE
+    )
+    return version
+
+
+async def get_catalog_version() -> str:
+    version = await FastAPICache.get_backend().get(_catalog_key("version"))
+    if version is None:
+        return await bump_catalog_version()
+    return version.decode()
+
+
+def encode_catalog(body: bytes, with_gzip: bool) -> dict[str, bytes]:
+    bodies = {"identity": body}
+    if with_gzip:
+        # Сжатие выполняется один раз на версию каталога, поэтому уровень максимальный;
+        # mtime=0 — одинаковые байты для одинакового каталога
+        bodies["gzip"] = gzip.compress(body, compresslevel=9, mtime=0)
+    return bodies
+
+
+async def get_or_build_catalog(
+    encoding: str, build: Callable[[], Awaitable[bytes]], with_gzip: bool
+) -> CatalogBody:
+    if not with_gzip:
+        encoding = "identity"
+    backend = FastAPICache.get_backend()
+    try:
+        version = await get_catalog_version()
+        ttl, body = await backend.get_with_ttl(_catalog_key(f"{version}:{encoding}"))
+    except Exception:
+        # Недоступный кэш не должен ломать эндпоинт: отдаём каталог из БД
+        logger.warning("Не удалось прочитать каталог упражнений из кэша", exc_info=True)
+        version, body = "", None
+    if body is not None:
+        return CatalogBody(body, encoding, version, ttl, hit=True)
+
+    bodies = encode_catalog(await build(), with_gzip)
+    if version:
+        try:
+            for body_encoding, encoded in bodies.items():
+                await backend.set(
+                    _catalog_key(f"{version}:{body_encoding}"), encoded, EXERCISES_CACHE_EXPIRE
+                )
+        except Exception:
+            logger.warning("Не удалось сохранить каталог упражнений в кэш", exc_info=True)
+    return CatalogBody(bodies[encoding], encoding, version, EXERCISES_CACHE_EXPIRE, hit=False)
+
+
+# Разобранный каталог (например, словарь id -> упражнение) хранится в памяти процесса и
+# пересобирается, только когда меняется версия каталога в кэше
+_catalog_index: tuple[str, Any] | None = None
+
+
+async def get_catalog_index(parse: Callable[[bytes], Any]) -> Any | None:
+    # None — каталога в кэше нет или кэш недоступен; БД здесь не читается
+    global _catalog_index
+    backend = FastAPICache.get_backend()
+    try:
+        version = await backend.get(_catalog_key("version"))
+        if version is None:
+            return None
+        version = version.decode()
+        if _catalog_index is not None and _catalog_index[0] == version:
+            return _catalog_index[1]
+        body = await backend.get(_catalog_key(f"{version}:identity"))
+    except Exception:
+        logger.warning("Не удалось прочитать каталог упражнений из кэша", exc_info=True)
+        return None
+    if body is None:
+        return None
+    index = parse(body)
+    _catalog_index = (version, index)
+    return index
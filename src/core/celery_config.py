@@ -1,11 +1,68 @@
+from functools import lru_cache
+
 from celery import Celery
+from celery.schedules import crontab
+from kombu import Queue
+
+from src.core.config import get_settings
+
+# Очереди: email — короткие I/O-задачи (SMTP), batch — тяжёлая аналитика и пакетная обработка.
+# Каждую очередь обслуживает свой воркер (см. docker-compose.yml), поэтому они масштабируются
+# независимо и долгие batch-задачи не задерживают письма с подтверждением.
+DEFAULT_QUEUE = "default"
+EMAIL_QUEUE = "email"
+BATCH_QUEUE = "batch"
+
+# Рекомендуемые параметры воркеров для каждой очереди:
+# celery worker -Q <queue> -c <concurrency> --prefetch-multiplier <prefetch_multiplier>
+WORKER_QUEUE_SETTINGS = {
+    DEFAULT_QUEUE: {"concurrency": 2, "prefetch_multiplier": 4},
+    EMAIL_QUEUE: {"concurrency": 8, "prefetch_multiplier": 4},
+    BATCH_QUEUE: {"concurrency": 2, "prefetch_multiplier": 1},
+}
+
+@lru_cache
+def get_celery_app() -> Celery:
+    redis_url = get_settings().redis_settings.redis_url
+    celery_app = Celery(main="lkeep", broker=redis_url, backend=redis_url)
+
+    celery_app.conf.update(
+        task_queues=[Queue(name) for name in WORKER_QUEUE_SETTINGS],
+        task_default_queue=DEFAULT_QUEUE,
+        task_routes={
+            "src.core.tasks.send_confirmation_email": {"queue": EMAIL_QUEUE, "priority": 0},
+            "src.core.batch_tasks.*": {"queue": BATCH_QUEUE},
+        },
+        # Приоритеты в Redis эмулируются отдельными списками, 0 — самый высокий
+        broker_transport_options={
+            "queue_order_strategy": "priority",
+            "priority_steps": list(range(10)),
+        },
+        task_default_priority=5,
+        # Результаты никто не читает — не засоряем Redis. Задачи, которым результат нужен,
+        # включают его явно через ignore_result=False
+        task_ignore_result=True,
+        result_expires=3600,
+        worker_prefetch_multiplier=WORKER_QUEUE_SETTINGS[DEFAULT_QUEUE]["prefetch_multiplier"],
+        beat_schedule={
+            "cleanup-unverified-users": {
+                "task": "src.core.batch_tasks.cleanup_unverified_users",
+                "schedule": crontab(minute=15),
+            },
+        },
+    )
+
+    celery_app.autodiscover_tasks(packages=["src.core"])
+    celery_app.autodiscover_tasks(packages=["src.core"], related_name="batch_tasks")
+
+    # Подключаем сигналы инструментирования задач (время в очереди, длительность, ошибки)
+    import src.core.celery_metrics  # noqa: F401
 
-from src.core.config import settings
+    return celery_app
 
-celery_app = Celery(
-    main="lkeep",
-    broker=settings.redis_settings.redis_url,
-    backend=settings.redis_settings.redis_url,
-)
 
-celery_app.autodiscover_tasks(packages=["src.core"])
+def __getattr__(name: str):
+    # Точка входа для CLI: celery --app=src.core.celery_config:celery_app
+    if name == "celery_app":
+        return get_celery_app()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
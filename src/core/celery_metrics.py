@@ -0,0 +1,121 @@
+import logging
+import os
+import time
+
+from celery import Celery
+from celery.signals import (
+    before_task_publish,
+    task_prerun,
+    task_postrun,
+    task_failure,
+    task_retry,
+    worker_process_shutdown,
+)
+from kombu.exceptions import ChannelError
+from prometheus_client import multiprocess
+
+from src.core.metrics import (
+    CELERY_TASK_QUEUE_WAIT,
+    CELERY_TASK_DURATION,
+    CELERY_TASK_RETRIES,
+    CELERY_TASK_FAILURES,
+    CELERY_QUEUE_LENGTH,
+    process_identifier,
+)
+
+ENQUEUED_AT_HEADER = "enqueued_at"
+QUEUE_LENGTH_REFRESH_INTERVAL = 15
+
+# task_id -> время начала выполнения (монотонные часы процесса воркера)
+_started_at: dict[str, float] = {}
+_queue_lengths_refreshed_at = 0.0
+
+
+@before_task_publish.connect
+def _mark_enqueued_at(headers=None, **kwargs):
+    # Отрабатывает в процессе, который ставит задачу (веб-приложение), поэтому используем
+    # настенные часы: монотонные часы разных процессов несравнимы
+    if headers is not None:
+        headers.setdefault(ENQUEUED_AT_HEADER, time.time())
+
+
+def _get_enqueued_at(task) -> float | None:
+    enqueued_at = task.request.get(ENQUEUED_AT_HEADER)
+    if enqueued_at is None:
+        # В eager-режиме заголовки не раскладываются по атрибутам запроса
+        enqueued_at = (task.request.headers or {}).get(ENQUEUED_AT_HEADER)
+    return enqueued_at
+
+
+@task_prerun.connect
+def _on_task_prerun(task_id=None, task=None, **kwargs):
+    _started_at[task_id] = time.perf_counter()
+
+    enqueued_at = _get_enqueued_at(task)
+    if enqueued_at is not None:
+        CELERY_TASK_QUEUE_WAIT.labels(task=task.name).observe(max(time.time() - enqueued_at, 0))
+
+    refresh_queue_lengths(task.app)
+
+
+@task_postrun.connect
+def _on_task_postrun(task_id=None, task=None, state=None, **kwargs):
+    started_at = _started_at.pop(task_id, None)
+    if started_at is None:
+        return
+    CELERY_TASK_DURATION.labels(task=task.name, state=state or "UNKNOWN").observe(
+        time.perf_counter() - started_at
+    )
+
+
+@task_failure.connect
+def _on_task_failure(sender=None, exception=None, **kwargs):
+    CELERY_TASK_FAILURES.labels(task=sender.name, exception=type(exception).__name__).inc()
+
+
+@task_retry.connect
+def _on_task_retry(sender=None, **kwargs):
+    CELERY_TASK_RETRIES.labels(task=sender.name).inc()
+
+
+@worker_process_shutdown.connect
+def _on_worker_process_shutdown(pid=None, **kwargs):
+    # Как mark_worker_dead в src/server.py: live-гейджи завершённого процесса пула
+    # больше не попадают в общую выдачу
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        multiprocess.mark_process_dead(process_identifier(pid))
+
+
+def get_queue_lengths(app: Celery) -> dict[str, int]:
+    lengths = {}
+    with app.connection_for_read() as conn:
+        channel = conn.default_channel
+        for queue in app.conf.task_queues:
+            try:
+                _, message_count, _ = channel.queue_declare(queue=queue.name, passive=True)
+            except ChannelError:
+                # Пустая очередь в Redis не существует как ключ
+                message_count = 0
+            lengths[queue.name] = message_count
+    return lengths
+
+
+def refresh_queue_lengths(app: Celery, force: bool = False) -> None:
+    global _queue_lengths_refreshed_at
+
+    now = time.monotonic()
+    if not force and now - _queue_lengths_refreshed_at < QUEUE_LENGTH_REFRESH_INTERVAL:
+        return
+    _queue_lengths_refreshed_at = now
+
+    if app.conf.task_always_eager:
+        return
+
+    try:
+        lengths = get_queue_lengths(app)
+    except Exception:
+        logging.warning("Не удалось получить длины очередей Celery", exc_info=True)
+        return
+
+    for queue_name, length in lengths.items():
+        CELERY_QUEUE_LENGTH.labels(queue=queue_name).set(length)
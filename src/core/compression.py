@@ -0,0 +1,310 @@
+import argparse
+import mimetypes
+import os
+import stat
+import sys
+import zlib
+from pathlib import Path
+
+import anyio
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Сжатие ответов по Accept-Encoding. gzip доступен всегда, br и zstd — если установлены
+# пакеты brotli и zstandard. При равном q клиента выбирается первая кодировка из списка
+ENCODINGS = tuple(
+    encoding
+    for encoding, available in (("zstd", zstandard), ("br", brotli), ("gzip", zlib))
+    if available is not None
+)
+
+# Уровни по типу содержимого. Динамические ответы сжимаются на каждый запрос, поэтому уровни
+# умеренные: дальше размер почти не уменьшается, а время растёт в разы. Типы, которых нет в
+# таблице (изображения, видео, архивы), уже сжаты и передаются как есть
+COMPRESSION_LEVELS: dict[str, dict[str, int]] = {
+    "application/json": {"zstd": 3, "br": 4, "gzip": 5},
+    "text/html": {"zstd": 3, "br": 5, "gzip": 6},
+    "text/plain": {"zstd": 3, "br": 5, "gzip": 6},
+    "text/css": {"zstd": 3, "br": 5, "gzip": 6},
+    "text/javascript": {"zstd": 3, "br": 5, "gzip": 6},
+    "application/javascript": {"zstd": 3, "br": 5, "gzip": 6},
+    "image/svg+xml": {"zstd": 3, "br": 5, "gzip": 6},
+}
+# Статика сжимается один раз заранее, поэтому уровни максимальные
+STATIC_LEVELS = {"zstd": 19, "br": 11, "gzip": 9}
+STATIC_SUFFIXES = {"zstd": ".zst", "br": ".br", "gzip": ".gz"}
+
+# Меньше ~1 КБ сжатие почти ничего не даёт: ответ и так помещается в один TCP-сегмент
+MINIMUM_SIZE = 1024
+
+
+def parse_accept_encoding(accept_encoding: str) -> dict[str, float]:
+    qualities = {}
+    for item in accept_encoding.lower().split(","):
+        name, _, params = item.strip().partition(";")
+        if not name.strip():
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[name.strip()] = quality
+    return qualities
+
+
+def accepted_encodings(accept_encoding: str, encodings: tuple[str, ...] = ENCODINGS) -> list[str]:
+    # Кодировки, которые принимает клиент, от предпочтительной; запрещённые через q=0 исключаются
+    qualities = parse_accept_encoding(accept_encoding)
+    ranked = [(qualities.get(encoding, qualities.get("*", 0.0)), encoding) for encoding in encodings]
+    return [encoding for quality, encoding in sorted(ranked, key=lambda item: -item[0]) if quality > 0]
+
+
+def negotiate_encoding(accept_encoding: str, encodings: tuple[str, ...] = ENCODINGS) -> str | None:
+    accepted = accepted_encodings(accept_encoding, encodings)
+    return accepted[0] if accepted else None
+
+
+def get_levels(content_type: str | None) -> dict[str, int] | None:
+    if not content_type:
+        return None
+    return COMPRESSION_LEVELS.get(content_type.split(";")[0].strip().lower())
+
+
+class GzipCompressor:
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush()
+
+
+class BrotliCompressor:
+    def __init__(self, level: int):
+        self._compressor = brotli.Compressor(quality=level)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.finish()
+
+
+class ZstdCompressor:
+    def __init__(self, level: int):
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush()
+
+
+COMPRESSORS = {"gzip": GzipCompressor, "br": BrotliCompressor, "zstd": ZstdCompressor}
+
+
+def compress(data: bytes, encoding: str, level: int) -> bytes:
+    compressor = COMPRESSORS[encoding](level)
+    return compressor.compress(data) + compressor.flush()
+
+
+class CompressionMiddleware:
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = MINIMUM_SIZE,
+        exclude_prefixes: tuple[str, ...] = (),
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.exclude_prefixes = exclude_prefixes
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"].startswith(self.exclude_prefixes):
+            await self.app(scope, receive, send)
+            return
+        request_headers = Headers(scope=scope)
+        encoding = negotiate_encoding(request_headers.get("accept-encoding", ""))
+        # Сжатое тело не совпадает по байтам с исходным, поэтому диапазоны отдаются без сжатия
+        if encoding is None or "range" in request_headers:
+            await self.app(scope, receive, send)
+            return
+
+        start_message: Message | None = None
+        compressor = None
+
+        async def compress_send(message: Message) -> None:
+            nonlocal start_message, compressor
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+            if start_message is None:
+                # Решение о сжатии уже принято, заголовки отправлены
+                if compressor is not None:
+                    data = compressor.compress(message.get("body", b""))
+                    if not message.get("more_body", False):
+                        data += compressor.flush()
+                    message = {**message, "body": data}
+                await send(message)
+                return
+
+            start, start_message = start_message, None
+            compressor = self.start_compression(start, message, encoding)
+            if compressor is None:
+                await send(start)
+                await send(message)
+                return
+
+            body = compressor.compress(message.get("body", b""))
+            headers = MutableHeaders(scope=start)
+            if message.get("more_body", False):
+                del headers["Content-Length"]
+            else:
+                body += compressor.flush()
+                headers["Content-Length"] = str(len(body))
+            await send(start)
+            await send({**message, "body": body})
+
+        await self.app(scope, receive, compress_send)
+
+    def start_compression(self, start: Message, first_body: Message, encoding: str):
+        headers = MutableHeaders(scope=start)
+        levels = get_levels(headers.get("content-type"))
+        if levels is None or "content-encoding" in headers:
+            return None
+        headers.add_vary_header("Accept-Encoding")
+        if start["status"] < 200 or start["status"] in (204, 206, 304):
+            return None
+
+        if first_body.get("more_body", False):
+            size = int(headers.get("content-length", self.minimum_size))
+        else:
+            size = len(first_body.get("body", b""))
+        if size < self.minimum_size:
+            return None
+
+        headers["Content-Encoding"] = encoding
+        etag = headers.get("etag")
+        if etag and not etag.startswith("W/"):
+            # Сильный ETag относится к исходным байтам, у сжатого представления он слабый
+            headers["ETag"] = f"W/{etag}"
+        return COMPRESSORS[encoding](levels[encoding])
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    # Отдаёт заранее сжатые варианты файлов (файл.gz, .br, .zst рядом с исходным), созданные
+    # командой `python -m src.core.compression <директория>`; на запрос ничего не сжимается
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        media_type = mimetypes.guess_type(path)[0]
+        if (
+            get_levels(media_type) is None
+            or scope["method"] not in ("GET", "HEAD")
+            or "range" in Headers(scope=scope)
+        ):
+            return await super().get_response(path, scope)
+
+        response = await self.get_variant_response(path, media_type, scope)
+        if response is None:
+            response = await super().get_response(path, scope)
+        response.headers.add_vary_header("Accept-Encoding")
+        return response
+
+    async def get_variant_response(self, path: str, media_type: str, scope: Scope) -> Response | None:
+        accept_encoding = Headers(scope=scope).get("accept-encoding", "")
+        for encoding in accepted_encodings(accept_encoding):
+            full_path, stat_result = await anyio.to_thread.run_sync(
+                self.lookup_path, path + STATIC_SUFFIXES[encoding]
+            )
+            if stat_result is None or not stat.S_ISREG(stat_result.st_mode):
+                continue
+            return self.file_response(
+                full_path,
+                stat_result,
+                scope,
+                media_type=media_type,
+                headers={"Content-Encoding": encoding},
+            )
+        return None
+
+    def file_response(
+        self,
+        full_path: str | os.PathLike,
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+        media_type: str | None = None,
+        headers: dict[str, str] | None = None,
+    ) -> Response:
+        response = FileResponse(
+            full_path,
+            status_code=status_code,
+            stat_result=stat_result,
+            media_type=media_type,
+            headers=headers,
+        )
+        if self.is_not_modified(response.headers, Headers(scope=scope)):
+            return NotModifiedResponse(response.headers)
+        return response
+
+
+def precompress_directory(directory: Path, encodings: tuple[str, ...] = ENCODINGS) -> list[Path]:
+    created = []
+    variant_suffixes = set(STATIC_SUFFIXES.values())
+    for path in sorted(directory.rglob("*")):
+        if not path.is_file() or path.suffix in variant_suffixes:
+            continue
+        if get_levels(mimetypes.guess_type(path.name)[0]) is None:
+            continue
+        data = None
+        for encoding in encodings:
+            variant = path.with_name(path.name + STATIC_SUFFIXES[encoding])
+            if variant.exists() and variant.stat().st_mtime >= path.stat().st_mtime:
+                continue
+            data = path.read_bytes() if data is None else data
+            compressed = compress(data, encoding, STATIC_LEVELS[encoding])
+            if len(compressed) >= len(data):
+                # Несжимаемый файл: вариант только потратил бы место и проверку на запрос
+                variant.unlink(missing_ok=True)
+                continue
+            variant.write_bytes(compressed)
+            os.utime(variant, (path.stat().st_atime, path.stat().st_mtime))
+            created.append(variant)
+    return created
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Создать сжатые варианты статических файлов")
+    parser.add_argument("directories", nargs="+", type=Path)
+    args = parser.parse_args()
+
+    for directory in args.directories:
+        for variant in precompress_directory(directory):
+            print(variant)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,3 +1,4 @@
+from functools import cached_property, lru_cache
 from typing import Literal
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -33,6 +34,10 @@ class Settings(BaseSettings):
     DB_PASS: str
     DB_NAME: str
 
+    # Пул соединений асинхронного движка на один процесс
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+
     REDIS_HOST: str
     REDIS_PORT: int
 
@@ -40,8 +45,6 @@ class Settings(BaseSettings):
     def redis_url(self) -> str:
         return f"redis://{self.REDIS_HOST}:{self.REDIS_PORT}"
 
-    email_settings: EmailSettings = EmailSettings()
-    redis_settings: RedisSettings = RedisSettings()
     secret_key: SecretStr
     templates_dir: str = "templates"
     frontend_url: str
@@ -50,11 +53,80 @@ class Settings(BaseSettings):
     JWT_ALGORITHM: str
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60
 
+    # Срок жизни токена подтверждения email, секунды
+    CONFIRMATION_TOKEN_MAX_AGE: int = 3600
+    # Сколько ещё ждать после истечения токена, прежде чем удалить неподтверждённый аккаунт
+    UNVERIFIED_USERS_GRACE_PERIOD: int = 86400
+
+    # Прогрев при старте: соединения пула, кэш скомпилированных запросов, кэш каталога
+    WARMUP_ENABLED: bool = True
+    WARMUP_POOL_CONNECTIONS: int = 5
+    WARMUP_TIMEOUT: float = 30
+    # Пауза между повторами неудачного прогрева, секунды
+    WARMUP_RETRY_INTERVAL: float = 10
+
+    # GET /exercises: хранить в кэше готовое тело ответа по версии каталога, а не список моделей;
+    # EXERCISES_CACHE_GZIP — хранить рядом сжатую версию для клиентов с Accept-Encoding: gzip
+    EXERCISES_CACHE_SERIALIZED: bool = True
+    EXERCISES_CACHE_GZIP: bool = True
+
+    # Сжатие ответов по Accept-Encoding (gzip, а также br и zstd, если установлены brotli и
+    # zstandard); ответы меньше COMPRESSION_MINIMUM_SIZE байт отдаются без сжатия
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MINIMUM_SIZE: int = 1024
+
+    # Медиа и статика: директория файлов и префикс адресов
+    MEDIA_DIR: str = "assets"
+    MEDIA_URL: str = "/static"
+
+    # Логи: JSON в stdout через очередь; LOG_SAMPLING — доля сохраняемых записей ниже WARNING
+    # для шумных логгеров, например {"src.repositories": 0.01}
+    LOG_LEVEL: str = "INFO"
+    LOG_JSON: bool = True
+    LOG_SAMPLING: dict[str, float] = {}
+    # Логировать каждый SQL-запрос (логгер sqlalchemy.engine)
+    DB_ECHO: bool = False
+
+    # Профилирование запроса администратором по заголовку X-Profile; интервал сэмплирования, секунды
+    PROFILING_ENABLED: bool = True
+    PROFILING_INTERVAL: float = 0.001
+
+    # Запись трафика для воспроизведения (benchmarks/replay.py): NDJSON с ротацией по размеру
+    TRAFFIC_CAPTURE_ENABLED: bool = False
+    TRAFFIC_CAPTURE_PATH: str = "traffic/capture.ndjson"
+    TRAFFIC_CAPTURE_MAX_BYTES: int = 50 * 1024 * 1024
+    TRAFFIC_CAPTURE_BACKUP_COUNT: int = 5
+    TRAFFIC_CAPTURE_SAMPLE_RATE: float = 1.0
+
+    # Монитор event loop: лаг цикла и стеки колбэков, блокирующих его дольше порога (секунды)
+    LOOP_MONITOR_ENABLED: bool = False
+    LOOP_MONITOR_INTERVAL: float = 0.05
+    LOOP_BLOCK_THRESHOLD: float = 0.1
+
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf8", extra="ignore")
 
     @property
     def db_url(self) -> str:
         return f"postgresql+asyncpg://{self.DB_USER}:{self.DB_PASS}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
 
+    # Вложенные настройки нужны только Celery (брокер и SMTP), поэтому читаются при первом
+    # обращении, а не вместе с основными настройками
+    @cached_property
+    def email_settings(self) -> EmailSettings:
+        return EmailSettings()
+
+    @cached_property
+    def redis_settings(self) -> RedisSettings:
+        return RedisSettings()
+
+
+@lru_cache
+def get_settings() -> Settings:
+    return Settings()
+
 
-settings = Settings()
+def __getattr__(name: str):
+    # settings создаётся при первом обращении, а не при импорте модуля
+    if name == "settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
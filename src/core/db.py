@@ -1,23 +1,68 @@
+from functools import lru_cache
+
 from sqlalchemy import NullPool
-from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
-from src.core.config import settings
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+from src.core.config import get_settings
 from sqlalchemy.orm import DeclarativeBase
 
-from sqlalchemy import create_engine
+from sqlalchemy import Engine, create_engine
 from sqlalchemy.orm import sessionmaker
 
-# Создаем синхронный движок для Celery
-sync_engine = create_engine(settings.db_url.replace("asyncpg", "psycopg2"))
-SyncSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=sync_engine)
+# Движки и фабрики сессий создаются при первом обращении: веб-процессу не нужен синхронный
+# движок, Celery-воркеру — асинхронный, а Alembic и импорт моделей не требуют ни одного.
+
+
+@lru_cache
+def get_engine() -> AsyncEngine:
+    # SQL пишется в лог через логгер sqlalchemy.engine (см. DB_ECHO), а не через echo=True,
+    # который вешает на него собственный синхронный хендлер
+    settings = get_settings()
+    if settings.MODE == "TEST":
+        return create_async_engine(settings.db_url, poolclass=NullPool)
+
+    # Импорт здесь: Alembic не должен тянуть prometheus_client вместе с db.py
+    from src.core.db_metrics import InstrumentedAsyncAdaptedQueuePool, instrument_pool
+
+    engine = create_async_engine(
+        settings.db_url,
+        poolclass=InstrumentedAsyncAdaptedQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+    )
+    instrument_pool(engine.sync_engine.pool, settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW)
+    return engine
+
+
+@lru_cache
+def get_async_session_maker() -> async_sessionmaker:
+    return async_sessionmaker(bind=get_engine(), expire_on_commit=False)
+
+
+# Синхронный движок для Celery
+@lru_cache
+def get_sync_engine() -> Engine:
+    return create_engine(get_settings().db_url.replace("asyncpg", "psycopg2"))
+
+
+@lru_cache
+def get_sync_session_maker() -> sessionmaker:
+    return sessionmaker(autocommit=False, autoflush=False, bind=get_sync_engine())
+
 
-db_params = {}
-if settings.MODE == "TEST":
-    db_params = {"poolclass": NullPool}
+_LAZY_ATTRIBUTES = {
+    "engine": get_engine,
+    "async_session_maker": get_async_session_maker,
+    "async_session_maker_null_pool": get_async_session_maker,
+    "sync_engine": get_sync_engine,
+    "SyncSessionLocal": get_sync_session_maker,
+}
 
-engine = create_async_engine(settings.db_url, echo=True, **db_params)
 
-async_session_maker = async_sessionmaker(bind=engine, expire_on_commit=False)
-async_session_maker_null_pool = async_sessionmaker(bind=engine, expire_on_commit=False)
+def __getattr__(name: str):
+    # Совместимость со старыми импортами вида `from src.core.db import engine`
+    if name in _LAZY_ATTRIBUTES:
+        return _LAZY_ATTRIBUTES[name]()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 class Base(DeclarativeBase):
@@ -1,6 +1,11 @@
-from src.repositories.exercises import ExercisesRepository
+from src.repositories.analytics import TrainingRollupsRepository
+from src.repositories.exercises import ExercisesRepository, ExerciseTombstonesRepository
 from src.repositories.users import UsersRepository
-from src.repositories.workouts import WorkoutsRepository, WorkoutExerciseRepository
+from src.repositories.workouts import (
+    WorkoutsRepository,
+    WorkoutExerciseRepository,
+    WorkoutChangesRepository,
+)
 
 
 class DBManager:
@@ -14,7 +19,10 @@ class DBManager:
         self.users = UsersRepository(self.session)
         self.workouts = WorkoutsRepository(self.session)
         self.workout_exercises = WorkoutExerciseRepository(self.session)
+        self.workout_changes = WorkoutChangesRepository(self.session)
         self.exercises = ExercisesRepository(self.session)
+        self.exercise_tombstones = ExerciseTombstonesRepository(self.session)
+        self.training_rollups = TrainingRollupsRepository(self.session)
 
         return self
 
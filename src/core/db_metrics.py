@@ -0,0 +1,31 @@
+import time
+
+from sqlalchemy import event
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool
+
+from src.core.metrics import DB_POOL_CAPACITY, DB_POOL_CHECKED_OUT, DB_POOL_CHECKOUT_DURATION
+
+
+class InstrumentedAsyncAdaptedQueuePool(AsyncAdaptedQueuePool):
+    # Событий «перед выдачей соединения» у пула нет, поэтому время получения соединения
+    # (ожидание свободного + открытие нового) меряется вокруг connect()
+    def connect(self):
+        started_at = time.perf_counter()
+        try:
+            return super().connect()
+        finally:
+            DB_POOL_CHECKOUT_DURATION.observe(time.perf_counter() - started_at)
+
+
+def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+    DB_POOL_CHECKED_OUT.inc()
+
+
+def _on_checkin(dbapi_connection, connection_record):
+    DB_POOL_CHECKED_OUT.dec()
+
+
+def instrument_pool(pool: Pool, capacity: int) -> None:
+    DB_POOL_CAPACITY.inc(capacity)
+    event.listen(pool, "checkout", _on_checkout)
+    event.listen(pool, "checkin", _on_checkin)
@@ -0,0 +1,63 @@
+import time
+
+from starlette.routing import Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.core.metrics import (
+    CACHE_REQUESTS,
+    HTTP_REQUEST_DURATION,
+    HTTP_REQUESTS,
+    HTTP_REQUESTS_IN_PROGRESS,
+)
+
+# Заголовок, которым fastapi-cache помечает ответы кэшируемых эндпоинтов (HIT/MISS)
+CACHE_STATUS_HEADER = b"x-fastapi-cache"
+# Запросы мимо всех маршрутов собираются в одну метку, иначе сканеры раздуют число рядов
+UNMATCHED_ROUTE = "unmatched"
+
+
+def resolve_route(scope: Scope) -> str:
+    # Шаблон пути, а не сам путь: /workouts/{workout_id}, а не /workouts/42
+    app = scope.get("app")
+    router = getattr(app, "router", None)
+    for route in getattr(router, "routes", ()):
+        match, _ = route.matches(scope)
+        if match != Match.NONE:
+            return route.path
+    return UNMATCHED_ROUTE
+
+
+class HTTPMetricsMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        route = resolve_route(scope)
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                for name, value in message.get("headers", ()):
+                    if name.lower() == CACHE_STATUS_HEADER:
+                        CACHE_REQUESTS.labels(route=route, result=value.decode().lower()).inc()
+                        break
+            await send(message)
+
+        in_progress = HTTP_REQUESTS_IN_PROGRESS.labels(method=method, route=route)
+        in_progress.inc()
+        started_at = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_REQUEST_DURATION.labels(method=method, route=route).observe(
+                time.perf_counter() - started_at
+            )
+            HTTP_REQUESTS.labels(method=method, route=route, status=str(status_code)).inc()
+            in_progress.dec()
@@ -0,0 +1,127 @@
+import atexit
+import json
+import logging
+import queue
+import random
+import sys
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+
+# Логи пишутся не в обработчике запроса, а в отдельном потоке: корневой логгер кладёт запись в
+# очередь (QueueHandler), а QueueListener форматирует её в JSON и выводит в stdout. Сообщение
+# собирается из шаблона и аргументов только в потоке слушателя, поэтому в горячих местах
+# используется ленивое форматирование: logger.info("... %s", value), а не f-строки.
+
+# Стандартные атрибуты LogRecord — всё остальное попало в запись через extra и выводится как есть
+_RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "taskName"}
+
+_listener: QueueListener | None = None
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES:
+                payload[key] = value
+        if record.exc_info:
+            payload["exc_info"] = self.formatException(record.exc_info)
+        if record.stack_info:
+            payload["stack_info"] = self.formatStack(record.stack_info)
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """Пропускает только долю записей ниже WARNING для логгеров из rates.
+
+    Доля берётся по самому длинному совпадающему префиксу имени логгера:
+    {"src.repositories": 0.01} действует и на "src.repositories.users".
+    """
+
+    def __init__(self, rates: dict[str, float]):
+        super().__init__()
+        self.rates = rates
+        self._resolved: dict[str, float | None] = {}
+
+    def get_rate(self, name: str) -> float | None:
+        if name not in self._resolved:
+            prefix = name
+            while prefix and prefix not in self.rates:
+                prefix = prefix.rpartition(".")[0]
+            self._resolved[name] = self.rates.get(prefix)
+        return self._resolved[name]
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = self.get_rate(record.name)
+        return rate is None or random.random() < rate
+
+
+class LazyQueueHandler(QueueHandler):
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Стандартный prepare форматирует сообщение в вызывающем потоке. Очередь у нас внутри
+        # процесса, поэтому запись передаётся как есть и форматируется уже слушателем
+        return record
+
+
+def setup_logging(
+    level: str = "INFO",
+    json_format: bool = True,
+    sampling: dict[str, float] | None = None,
+    sql_echo: bool = False,
+) -> QueueListener:
+    global _listener
+    stop_logging()
+
+    stream_handler = logging.StreamHandler(sys.stdout)
+    if json_format:
+        stream_handler.setFormatter(JsonFormatter())
+    else:
+        stream_handler.setFormatter(
+            logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s")
+        )
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = LazyQueueHandler(log_queue)
+    if sampling:
+        queue_handler.addFilter(SamplingFilter(sampling))
+
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+        handler.close()
+    root.addHandler(queue_handler)
+    root.setLevel(level)
+
+    # Вместо echo=True движка: SQL идёт через ту же очередь, а не через свой блокирующий хендлер
+    logging.getLogger("sqlalchemy.engine").setLevel(logging.INFO if sql_echo else logging.WARNING)
+
+    _listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+    return _listener
+
+
+def stop_logging() -> None:
+    # Дописывает оставшиеся в очереди записи и останавливает поток слушателя. Поздние записи
+    # (например, о завершении сервера) дальше пишутся синхронно теми же хендлерами
+    global _listener
+    if _listener is None:
+        return
+
+    _listener.stop()
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        if isinstance(handler, LazyQueueHandler):
+            root.removeHandler(handler)
+    for handler in _listener.handlers:
+        root.addHandler(handler)
+    _listener = None
+
+
+atexit.register(stop_logging)
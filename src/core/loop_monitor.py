@@ -0,0 +1,147 @@
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Callable
+
+from src.core.http_metrics import UNMATCHED_ROUTE
+from src.core.metrics import EVENT_LOOP_BLOCKS, EVENT_LOOP_LAG
+
+# Монитор event loop: корутина раз в interval засыпает и меряет, насколько позже положенного
+# она проснулась (лаг). Параллельно сторожевой поток следит за её «сердцебиением»: если цикл
+# не отвечает дольше порога, поток снимает стек потока цикла — это и есть блокирующий колбэк.
+# Маршрут определяется по ASGI scope в кадрах этого стека, так что middleware не нужен.
+
+
+@dataclass
+class BlockedCall:
+    duration: float
+    route: str | None
+    stack: list[str] = field(default_factory=list)
+    heartbeat: float = 0.0
+    # Фактический путь запроса — только для лога, в метку метрики идёт route
+    path: str | None = None
+
+    def format(self) -> str:
+        route = self.route or "вне запроса"
+        if self.path is not None:
+            route = f"{route} ({self.path})"
+        return (
+            f"Event loop заблокирован на {self.duration * 1000:.0f} мс, "
+            f"маршрут: {route}\n" + "".join(self.stack)
+        )
+
+
+def find_request_scope(frame) -> dict | None:
+    while frame is not None:
+        scope = frame.f_locals.get("scope")
+        if isinstance(scope, dict) and scope.get("type") in ("http", "websocket"):
+            return scope
+        frame = frame.f_back
+    return None
+
+
+def route_label(scope: dict | None) -> str | None:
+    # Как в HTTPMetricsMiddleware: шаблон маршрута, а запросы мимо маршрутов — одной меткой.
+    # Сырой путь (/workouts/42) сделал бы число рядов метрики неограниченным
+    if scope is None:
+        return None
+    return getattr(scope.get("route"), "path", None) or UNMATCHED_ROUTE
+
+
+def find_route(frame) -> str | None:
+    return route_label(find_request_scope(frame))
+
+
+class LoopMonitor:
+    def __init__(
+        self,
+        threshold: float,
+        interval: float = 0.05,
+        on_block: Callable[[BlockedCall], None] | None = None,
+    ):
+        self.threshold = threshold
+        self.interval = interval
+        self.on_block = on_block
+        # Последние блокировки — для тестов и отладки, в проде список не должен расти бесконечно
+        self.blocks: deque[BlockedCall] = deque(maxlen=100)
+
+        self._heartbeat = 0.0
+        self._pending: BlockedCall | None = None
+        self._loop_thread_id: int | None = None
+        self._task: asyncio.Task | None = None
+        self._watchdog: threading.Thread | None = None
+        self._stopped = threading.Event()
+
+    def start(self) -> None:
+        # Вызывается из потока цикла: стек именно этого потока снимает сторож
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.perf_counter()
+        self._stopped.clear()
+        self._task = asyncio.get_running_loop().create_task(self._measure_lag())
+        self._watchdog = threading.Thread(
+            target=self._watch, name="loop-monitor-watchdog", daemon=True
+        )
+        self._watchdog.start()
+
+    async def stop(self) -> None:
+        self._stopped.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._watchdog is not None:
+            self._watchdog.join()
+            self._watchdog = None
+
+    async def _measure_lag(self) -> None:
+        # Отсчёт ведётся от предыдущего сердцебиения, а не от момента засыпания: так учитывается
+        # и блокировка, случившаяся между start() и первым запуском этой корутины
+        while True:
+            await asyncio.sleep(self.interval)
+            now = time.perf_counter()
+            previous_heartbeat = self._heartbeat
+            lag = max(now - previous_heartbeat - self.interval, 0)
+            EVENT_LOOP_LAG.observe(lag)
+
+            self._heartbeat = now
+            blocked, self._pending = self._pending, None
+            # Стек снят сторожем, а полную длительность блокировки знает только проснувшийся цикл
+            if blocked is not None and blocked.heartbeat == previous_heartbeat:
+                blocked.duration = lag
+                self._report(blocked)
+
+    def _watch(self) -> None:
+        while not self._stopped.wait(self.interval):
+            heartbeat = self._heartbeat
+            stalled = time.perf_counter() - heartbeat - self.interval
+            if stalled < self.threshold:
+                continue
+            if self._pending is not None and self._pending.heartbeat == heartbeat:
+                continue  # эта блокировка уже зафиксирована
+
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+            scope = find_request_scope(frame)
+            self._pending = BlockedCall(
+                duration=stalled,
+                route=route_label(scope),
+                stack=traceback.format_stack(frame),
+                heartbeat=heartbeat,
+                path=scope.get("path") if scope is not None else None,
+            )
+
+    def _report(self, blocked: BlockedCall) -> None:
+        self.blocks.append(blocked)
+        EVENT_LOOP_BLOCKS.labels(route=blocked.route or "none").inc()
+        logging.warning(blocked.format())
+        if self.on_block is not None:
+            self.on_block(blocked)
@@ -0,0 +1,152 @@
+import hashlib
+import os
+import re
+from dataclasses import dataclass
+from pathlib import Path
+
+from starlette.exceptions import HTTPException
+from starlette.responses import FileResponse, Response
+from starlette.types import Scope
+
+from src.core.compression import PrecompressedStaticFiles
+from src.core.config import settings
+
+# Раздача медиа и статики из отдельной директории (assets/). Для каждого файла при старте
+# считается SHA-256 содержимого: из него строятся сильный ETag и адрес с отпечатком
+# (secret.mp4 -> secret.<12 hex>.mp4), который media_url() подставляет в страницы. Адрес с
+# отпечатком меняется вместе с содержимым, поэтому кэшируется браузером навсегда (immutable);
+# обычный адрес кэшируется с обязательной перепроверкой по ETag.
+#
+# Запросы диапазонов (перемотка видео), If-Range и отдачу через sendfile выполняет
+# FileResponse: если сервер поддерживает ASGI-расширение http.response.pathsend, файл целиком
+# отправляет сам сервер, иначе файл читается блоками MEDIA_CHUNK_SIZE.
+
+FINGERPRINT_LENGTH = 12
+FINGERPRINT_RE = re.compile(
+    rf"^(?P<stem>.+)\.(?P<fingerprint>[0-9a-f]{{{FINGERPRINT_LENGTH}}})(?P<suffix>\.[^./]+)$"
+)
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "public, no-cache"
+# Крупнее блока FileResponse по умолчанию (64 КБ): меньше переходов в пул потоков на видео
+MEDIA_CHUNK_SIZE = 1024 * 1024
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+@dataclass(frozen=True)
+class MediaEntry:
+    digest: str
+    size: int
+    mtime: float
+
+    @property
+    def etag(self) -> str:
+        return f'"{self.digest[:32]}"'
+
+
+def hash_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as f:
+        while chunk := f.read(HASH_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def fingerprint_name(name: str, digest: str) -> str:
+    stem, suffix = os.path.splitext(name)
+    return f"{stem}.{digest[:FINGERPRINT_LENGTH]}{suffix}"
+
+
+class MediaFiles(PrecompressedStaticFiles):
+    def __init__(self, *, directory: str | os.PathLike, url_prefix: str, **kwargs):
+        super().__init__(directory=directory, **kwargs)
+        self.url_prefix = url_prefix.rstrip("/")
+        self._manifest: dict[str, MediaEntry] | None = None
+
+    @property
+    def manifest(self) -> dict[str, MediaEntry]:
+        if self._manifest is None:
+            self.build_manifest()
+        return self._manifest
+
+    def build_manifest(self) -> dict[str, MediaEntry]:
+        # Вызывается при старте приложения в пуле потоков: чтение файлов блокирующее
+        root = Path(self.directory)
+        manifest = {}
+        for path in sorted(root.rglob("*")):
+            if path.is_file():
+                stat_result = path.stat()
+                manifest[path.relative_to(root).as_posix()] = MediaEntry(
+                    hash_file(path), stat_result.st_size, stat_result.st_mtime
+                )
+        self._manifest = manifest
+        return manifest
+
+    def url(self, name: str) -> str:
+        entry = self.manifest.get(name)
+        if entry is None:
+            return f"{self.url_prefix}/{name}"
+        return f"{self.url_prefix}/{fingerprint_name(name, entry.digest)}"
+
+    def resolve(self, path: str) -> tuple[str, bool]:
+        # Адрес с отпечатком указывает на исходный файл, если отпечаток совпадает с текущим
+        # содержимым. Устаревший отпечаток — 404: отдать под ним новое содержимое нельзя,
+        # браузер закэширует его навсегда
+        match = FINGERPRINT_RE.match(path)
+        if match is None:
+            return path, False
+        name = f"{match['stem']}{match['suffix']}"
+        entry = self.manifest.get(Path(name).as_posix())
+        if entry is None:
+            return path, False
+        if not entry.digest.startswith(match["fingerprint"]):
+            raise HTTPException(status_code=404)
+        return name, True
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        name, _ = self.resolve(path)
+        return await super().get_response(name, scope)
+
+    def file_response(
+        self,
+        full_path: str | os.PathLike,
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+        media_type: str | None = None,
+        headers: dict[str, str] | None = None,
+    ) -> Response:
+        headers = dict(headers or {})
+        _, immutable = self.resolve(self.get_path(scope))
+        relative = Path(os.path.relpath(full_path, os.path.realpath(self.directory))).as_posix()
+        entry = self.manifest.get(relative)
+        if (
+            entry is not None
+            and entry.size == stat_result.st_size
+            and entry.mtime == stat_result.st_mtime
+        ):
+            headers["ETag"] = entry.etag
+        else:
+            # Файл изменился после старта: хэш в манифесте уже не описывает его содержимое
+            immutable = False
+        headers["Cache-Control"] = (
+            IMMUTABLE_CACHE_CONTROL if immutable else REVALIDATE_CACHE_CONTROL
+        )
+
+        response = super().file_response(
+            full_path,
+            stat_result,
+            scope,
+            status_code=status_code,
+            media_type=media_type,
+            headers=headers,
+        )
+        if isinstance(response, FileResponse):
+            response.chunk_size = MEDIA_CHUNK_SIZE
+        return response
+
+
+media_files = MediaFiles(directory=settings.MEDIA_DIR, url_prefix=settings.MEDIA_URL)
+
+
+def media_url(name: str) -> str:
+    return media_files.url(name)
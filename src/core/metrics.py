@@ -0,0 +1,131 @@
+import os
+import socket
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
+from prometheus_client import multiprocess, values
+
+# Единая точка публикации метрик для веб-приложения и Celery-воркеров.
+# Если задана переменная PROMETHEUS_MULTIPROC_DIR, каждый процесс пишет свои значения в общую
+# директорию, а при отдаче метрик они агрегируются по всем процессам.
+
+# Директорию делят контейнеры (см. docker-compose.yml) со своими пространствами PID, где номера
+# процессов совпадают, поэтому файлы метрик именуются по хосту и PID. "_" в имени файла —
+# разделитель полей для MultiProcessCollector
+_HOSTNAME = socket.gethostname().replace("_", "-")
+
+
+def process_identifier(pid: int | None = None) -> str:
+    return f"{_HOSTNAME}-{os.getpid() if pid is None else pid}"
+
+
+if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+    # Класс значений выбирается до создания первой метрики
+    values.ValueClass = values.MultiProcessValue(process_identifier)
+
+CELERY_TASK_QUEUE_WAIT = Histogram(
+    "celery_task_queue_wait_seconds",
+    "Время от постановки задачи в очередь до начала выполнения",
+    ["task"],
+    buckets=(0.01, 0.05, 0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 300),
+)
+CELERY_TASK_DURATION = Histogram(
+    "celery_task_duration_seconds",
+    "Время выполнения задачи",
+    ["task", "state"],
+    buckets=(0.01, 0.05, 0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 300),
+)
+CELERY_TASK_RETRIES = Counter(
+    "celery_task_retries_total",
+    "Количество повторных попыток выполнения задачи",
+    ["task"],
+)
+CELERY_TASK_FAILURES = Counter(
+    "celery_task_failures_total",
+    "Количество задач, завершившихся ошибкой",
+    ["task", "exception"],
+)
+CELERY_QUEUE_LENGTH = Gauge(
+    "celery_queue_length",
+    "Количество сообщений, ожидающих в очереди брокера",
+    ["queue"],
+    multiprocess_mode="mostrecent",
+)
+
+EVENT_LOOP_LAG = Histogram(
+    "event_loop_lag_seconds",
+    "Задержка пробуждения event loop относительно запланированного времени",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5),
+)
+EVENT_LOOP_BLOCKS = Counter(
+    "event_loop_blocks_total",
+    "Количество блокировок event loop дольше порога",
+    ["route"],
+)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+HTTP_REQUESTS = Counter(
+    "http_requests_total",
+    "Количество обработанных HTTP-запросов",
+    ["method", "route", "status"],
+)
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Время обработки HTTP-запроса",
+    ["method", "route"],
+    buckets=LATENCY_BUCKETS,
+)
+HTTP_REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "Количество HTTP-запросов, обрабатываемых в данный момент",
+    ["method", "route"],
+    multiprocess_mode="livesum",
+)
+CACHE_REQUESTS = Counter(
+    "cache_requests_total",
+    "Обращения к кэшу ответов по результату (hit/miss)",
+    ["route", "result"],
+)
+
+DB_POOL_CHECKOUT_DURATION = Histogram(
+    "db_pool_checkout_seconds",
+    "Время получения соединения из пула, включая ожидание свободного соединения",
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 5, 30),
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out_connections",
+    "Соединения, выданные из пула и ещё не возвращённые",
+    multiprocess_mode="livesum",
+)
+DB_POOL_CAPACITY = Gauge(
+    "db_pool_capacity_connections",
+    "Максимум соединений пула (pool_size + max_overflow); насыщение = checked_out / capacity",
+    multiprocess_mode="livesum",
+)
+
+REDIS_COMMAND_DURATION = Histogram(
+    "redis_command_duration_seconds",
+    "Время выполнения команды Redis",
+    ["command"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1),
+)
+
+
+def get_registry() -> CollectorRegistry:
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return registry
+    return REGISTRY
+
+
+def render_metrics() -> tuple[bytes, str]:
+    return generate_latest(get_registry()), CONTENT_TYPE_LATEST
@@ -0,0 +1,210 @@
+import asyncio
+import sys
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from sqlalchemy import event
+
+from src.core.db import get_engine
+
+# Профилирование одного запроса по требованию. Пока оно не запущено, не работает ничего: нет ни
+# потока-сэмплера, ни слушателей событий SQLAlchemy.
+#
+# Сэмплер — отдельный поток, который раз в interval смотрит, чем занят запрос:
+# - если поток event loop сейчас выполняет код запроса, берётся его стек (время на CPU);
+# - иначе запрос ждёт (БД, Redis, пул потоков), и стек восстанавливается по цепочке await
+#   корутины задачи, а листом становится «[await]».
+# Так профиль показывает полное время запроса, а не только время на CPU.
+
+AWAIT_FRAME = ("[await]", "", 0)
+
+_current_profile: ContextVar["RequestProfile | None"] = ContextVar("current_profile", default=None)
+_sql_listeners_lock = threading.Lock()
+_active_profiles = 0
+
+Frame = tuple[str, str, int]
+
+
+@dataclass
+class SQLTiming:
+    statement: str
+    duration: float
+    started_at: float
+
+
+@dataclass
+class RequestProfile:
+    name: str
+    interval: float
+    started_at: float = 0.0
+    duration: float = 0.0
+    samples: list[tuple[Frame, ...]] = field(default_factory=list)
+    sql: list[SQLTiming] = field(default_factory=list)
+
+    def to_speedscope(self) -> dict:
+        frames: list[dict] = []
+        frame_index: dict[Frame, int] = {}
+        samples = []
+        for stack in self.samples:
+            indexes = []
+            for frame in stack:
+                if frame not in frame_index:
+                    frame_index[frame] = len(frames)
+                    name, file, line = frame
+                    frames.append({"name": name, "file": file, "line": line})
+                indexes.append(frame_index[frame])
+            samples.append(indexes)
+
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": self.name,
+            "exporter": "train-tracker",
+            "activeProfileIndex": 0,
+            "shared": {"frames": frames},
+            "profiles": [
+                {
+                    "type": "sampled",
+                    "name": self.name,
+                    "unit": "seconds",
+                    "startValue": 0,
+                    "endValue": self.duration,
+                    "samples": samples,
+                    "weights": [self.interval] * len(samples),
+                }
+            ],
+        }
+
+    def to_collapsed(self) -> str:
+        # Формат collapsed stacks (flamegraph.pl, speedscope): «кадр;кадр;кадр число_сэмплов»
+        counts = Counter(
+            ";".join(f"{name} ({file}:{line})" if file else name for name, file, line in stack)
+            for stack in self.samples
+        )
+        return "\n".join(f"{stack} {count}" for stack, count in counts.most_common())
+
+    def sql_report(self) -> list[dict]:
+        return [
+            {
+                "statement": timing.statement,
+                "offset_ms": round((timing.started_at - self.started_at) * 1000, 3),
+                "duration_ms": round(timing.duration * 1000, 3),
+            }
+            for timing in self.sql
+        ]
+
+
+def _describe(frame) -> Frame:
+    code = frame.f_code
+    return code.co_qualname, code.co_filename, frame.f_lineno
+
+
+def _thread_frames(frame) -> list:
+    frames = []
+    while frame is not None:
+        frames.append(frame)
+        frame = frame.f_back
+    frames.reverse()
+    return frames
+
+
+def _coroutine_frames(coro) -> list:
+    # Цепочка await приостановленной корутины: от корня задачи до места ожидания
+    frames = []
+    while coro is not None:
+        frame = getattr(coro, "cr_frame", None) or getattr(coro, "gi_frame", None)
+        if frame is None:
+            break
+        frames.append(frame)
+        coro = getattr(coro, "cr_await", None) or getattr(coro, "gi_yieldfrom", None)
+    return frames
+
+
+def _request_stack(frames: list, scope: dict) -> list[Frame] | None:
+    # Стек начинается с самого внешнего кадра, получившего scope запроса, чтобы сэмплы на CPU и
+    # в ожидании имели общий корень. None — в этих кадрах запрос не выполняется
+    for index, frame in enumerate(frames):
+        if frame.f_locals.get("scope") is scope:
+            return [_describe(f) for f in frames[index:]]
+    return None
+
+
+class Sampler:
+    def __init__(self, profile: RequestProfile, scope: dict, task: asyncio.Task):
+        self.profile = profile
+        self.scope = scope
+        self.task = task
+        self.loop_thread_id = threading.get_ident()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.profile.interval):
+            frame = sys._current_frames().get(self.loop_thread_id)
+            stack = _request_stack(_thread_frames(frame), self.scope)
+            if stack is None:
+                stack = _request_stack(_coroutine_frames(self.task.get_coro()), self.scope)
+                if stack is None:
+                    continue
+                stack.append(AWAIT_FRAME)
+            self.profile.samples.append(tuple(stack))
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_profile.get() is not None:
+        conn.info.setdefault("profile_query_started_at", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    profile = _current_profile.get()
+    if profile is None:
+        return
+    started_at = conn.info["profile_query_started_at"].pop()
+    profile.sql.append(
+        SQLTiming(statement=statement, duration=time.perf_counter() - started_at, started_at=started_at)
+    )
+
+
+def _attach_sql_listeners() -> None:
+    global _active_profiles
+    with _sql_listeners_lock:
+        if _active_profiles == 0:
+            engine = get_engine().sync_engine
+            event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+            event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+        _active_profiles += 1
+
+
+def _detach_sql_listeners() -> None:
+    global _active_profiles
+    with _sql_listeners_lock:
+        _active_profiles -= 1
+        if _active_profiles == 0:
+            engine = get_engine().sync_engine
+            event.remove(engine, "before_cursor_execute", _before_cursor_execute)
+            event.remove(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+async def profile_call(profile: RequestProfile, scope: dict, call) -> None:
+    """Выполняет call() под сэмплирующим профилировщиком, собирая SQL-запросы в profile."""
+    _attach_sql_listeners()
+    token = _current_profile.set(profile)
+    sampler = Sampler(profile, scope, asyncio.current_task())
+    profile.started_at = time.perf_counter()
+    sampler.start()
+    try:
+        await call()
+    finally:
+        profile.duration = time.perf_counter() - profile.started_at
+        sampler.stop()
+        _current_profile.reset(token)
+        _detach_sql_listeners()
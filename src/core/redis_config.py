@@ -1,7 +1,22 @@
 import json
+import time
+
 import redis.asyncio as redis
 import logging
 
+from src.core.metrics import REDIS_COMMAND_DURATION
+
+
+class InstrumentedRedis(redis.Redis):
+    async def execute_command(self, *args, **options):
+        started_at = time.perf_counter()
+        try:
+            return await super().execute_command(*args, **options)
+        finally:
+            REDIS_COMMAND_DURATION.labels(command=str(args[0]).upper()).observe(
+                time.perf_counter() - started_at
+            )
+
 
 class RedisManager:
     def __init__(self, host: str, port: int):
@@ -11,7 +26,7 @@ class RedisManager:
 
     async def connect(self):
         logging.info(f"Начинаю подключение к Redis host={self.host}, port={self.port}")
-        self.redis = await redis.Redis(host=self.host, port=self.port)
+        self.redis = await InstrumentedRedis(host=self.host, port=self.port)
         logging.info(f"Успешное подключение к Redis host={self.host}, port={self.port}")
 
     async def set(self, key: str, value: str, expire: int = 3600):
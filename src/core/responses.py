@@ -0,0 +1,72 @@
+from typing import Any
+
+import orjson
+from fastapi.responses import ORJSONResponse
+from fastapi_cache import FastAPICache
+from pydantic import TypeAdapter
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+
+from src.core.cache import CatalogBody
+from src.core.compression import accepted_encodings
+from src.schemas.exercises import Exercise
+from src.schemas.workouts import Workout
+
+# Класс ответа по умолчанию для всего приложения: orjson кодирует результат jsonable_encoder
+# в несколько раз быстрее json.dumps, вывод тот же компактный UTF-8 без экранирования
+DefaultResponse = ORJSONResponse
+
+# Списки моделей сериализуются pydantic-core напрямую в байты, минуя jsonable_encoder.
+# Адаптеры строятся один раз при импорте: создание TypeAdapter дороже самой сериализации
+EXERCISE_LIST_ADAPTER = TypeAdapter(list[Exercise])
+WORKOUT_LIST_ADAPTER = TypeAdapter(list[Workout])
+
+
+class SerializedJSONResponse(JSONResponse):
+    # Тело уже сериализовано. Наследование от JSONResponse нужно fastapi-cache:
+    # JsonCoder кладёт в кэш body такого ответа как есть
+    def render(self, content: bytes) -> bytes:
+        return content
+
+
+def accepts_encoding(accept_encoding: str, encoding: str) -> bool:
+    return encoding in accepted_encodings(accept_encoding, (encoding,))
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    # Слабое сравнение (RFC 9110, 13.1.2): CompressionMiddleware превращает ETag в W/"...",
+    # и клиент присылает его обратно в таком виде, возможно списком через запятую
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in tags or etag.removeprefix("W/") in {tag.removeprefix("W/") for tag in tags}
+
+
+def serialize_list(adapter: TypeAdapter, items: list[Any]) -> SerializedJSONResponse:
+    return SerializedJSONResponse(adapter.dump_json(items))
+
+
+def serialize_rows(rows: list[dict[str, Any]]) -> SerializedJSONResponse:
+    # Частичные строки (fields=...): orjson кодирует Enum и даты так же, как pydantic
+    return SerializedJSONResponse(orjson.dumps(rows))
+
+
+def serialize_columns(payload: dict[str, Any]) -> SerializedJSONResponse:
+    # Столбцы-массивы NumPy кодируются orjson без преобразования в списки Python; NaN — null
+    return SerializedJSONResponse(orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY))
+
+
+def catalog_response(request: Request, catalog: CatalogBody) -> Response:
+    headers = {
+        "Cache-Control": f"max-age={catalog.ttl}",
+        "Vary": "Accept-Encoding",
+        FastAPICache.get_cache_status_header(): "HIT" if catalog.hit else "MISS",
+    }
+    if catalog.encoding != "identity":
+        headers["Content-Encoding"] = catalog.encoding
+    if catalog.version:
+        # У каждой кодировки своё тело, поэтому и свой ETag
+        headers["ETag"] = f'"{catalog.version}-{catalog.encoding}"'
+        if etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+            return Response(status_code=304, headers=headers)
+    return Response(catalog.body, media_type="application/json", headers=headers)
@@ -1,18 +1,28 @@
+import logging
 import smtplib
 from email.message import EmailMessage
+from functools import lru_cache
+
 from celery import shared_task
 from starlette.templating import Jinja2Templates
-from src.core.config import settings
+from src.core.celery_config import get_celery_app
+from src.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
 
-templates = Jinja2Templates(directory=settings.templates_dir)
+@lru_cache
+def get_templates() -> Jinja2Templates:
+    return Jinja2Templates(directory=get_settings().templates_dir)
 
 
-@shared_task
+@shared_task(ignore_result=True)
 def send_confirmation_email(to_email: str, token: str) -> None:
+    settings = get_settings()
     try:
         confirmation_url = f"{settings.frontend_url}/auth/register_confirm?token={token}"
 
-        template = templates.get_template("confirmation_email.html")
+        template = get_templates().get_template("confirmation_email.html")
         html_content = template.render(
             confirmation_url=confirmation_url, frontend_url=settings.frontend_url
         )
@@ -34,8 +44,15 @@ def send_confirmation_email(to_email: str, token: str) -> None:
             )
             smtp.send_message(message)
 
-        print(f"Confirmation email sent to {to_email}")
+        logger.info("Confirmation email sent to %s", to_email)
 
     except Exception as e:
-        print(f"Failed to send confirmation email to {to_email}: {e}")
+        logger.error("Failed to send confirmation email to %s: %s", to_email, e)
         raise
+
+
+def enqueue_confirmation_email(to_email: str, token: str) -> None:
+    # shared_task отправляется через текущее приложение Celery: сконфигурированное приложение
+    # создаётся здесь, при первой отправке из веб-процесса, а не при импорте модуля
+    get_celery_app()
+    send_confirmation_email.delay(to_email=to_email, token=token)
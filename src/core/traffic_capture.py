@@ -0,0 +1,171 @@
+import hashlib
+import hmac
+import json
+import logging
+import os
+import queue
+import random
+import time
+from logging.handlers import QueueListener, RotatingFileHandler
+from pathlib import Path
+from urllib.parse import parse_qsl
+
+import jwt
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.core.config import settings
+from src.core.http_metrics import resolve_route
+from src.core.logging_config import LazyQueueHandler
+
+# Запись реального трафика для последующего воспроизведения (benchmarks/replay.py).
+# В трассу попадают метод, шаблон маршрута, параметры пути и запроса, JSON-тело, статус,
+# длительность и хэш пользователя; значения чувствительных полей заменяются на REDACTED.
+# Запись идёт через очередь в поток-писатель, файл ротируется по размеру. У каждого воркера
+# свой файл (с pid в имени), чтобы процессы не ротировали один файл одновременно.
+
+REDACTED = "***"
+SENSITIVE_FIELDS = {"password", "old_password", "new_password", "email", "new_email", "token"}
+MAX_CAPTURED_BODY = 64 * 1024
+
+capture_logger = logging.getLogger("traffic_capture")
+capture_logger.propagate = False
+
+_listener: QueueListener | None = None
+
+
+class TraceFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        return json.dumps(record.msg, ensure_ascii=False, default=str)
+
+
+def start_traffic_capture(path: str, max_bytes: int, backup_count: int) -> Path:
+    global _listener
+    stop_traffic_capture()
+
+    base = Path(path)
+    base.parent.mkdir(parents=True, exist_ok=True)
+    worker_path = base.with_name(f"{base.stem}-{os.getpid()}{base.suffix}")
+
+    file_handler = RotatingFileHandler(
+        worker_path, maxBytes=max_bytes, backupCount=backup_count, encoding="utf8"
+    )
+    file_handler.setFormatter(TraceFormatter())
+
+    log_queue = queue.SimpleQueue()
+    capture_logger.handlers[:] = [LazyQueueHandler(log_queue)]
+    capture_logger.setLevel(logging.INFO)
+    _listener = QueueListener(log_queue, file_handler)
+    _listener.start()
+    return worker_path
+
+
+def stop_traffic_capture() -> None:
+    global _listener
+    if _listener is None:
+        return
+    _listener.stop()
+    for handler in _listener.handlers:
+        handler.close()
+    capture_logger.handlers.clear()
+    _listener = None
+
+
+def redact(data):
+    if isinstance(data, dict):
+        return {
+            key: REDACTED if key in SENSITIVE_FIELDS else redact(value) for key, value in data.items()
+        }
+    if isinstance(data, list):
+        return [redact(item) for item in data]
+    return data
+
+
+def hash_subject(user_id) -> str:
+    # Ключевой хэш: по трассе можно отличить пользователей, но нельзя перебором восстановить id
+    return hmac.new(
+        settings.secret_key.get_secret_value().encode(), str(user_id).encode(), hashlib.sha256
+    ).hexdigest()[:16]
+
+
+def get_subject(scope: Scope) -> str | None:
+    for name, value in scope["headers"]:
+        if name != b"cookie":
+            continue
+        for part in value.decode("latin-1").split(";"):
+            key, _, token = part.strip().partition("=")
+            if key != "access_token":
+                continue
+            try:
+                payload = jwt.decode(
+                    token,
+                    settings.JWT_SECRET_KEY.get_secret_value(),
+                    algorithms=[settings.JWT_ALGORITHM],
+                )
+            except jwt.PyJWTError:
+                return None
+            return hash_subject(payload.get("user_id"))
+    return None
+
+
+def parse_body(chunks: list[bytes], truncated: bool):
+    if truncated or not chunks:
+        return None
+    try:
+        return redact(json.loads(b"".join(chunks)))
+    except ValueError:
+        return None
+
+
+class TrafficCaptureMiddleware:
+    def __init__(self, app: ASGIApp, sample_rate: float = 1.0):
+        self.app = app
+        self.sample_rate = sample_rate
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or _listener is None or random.random() >= self.sample_rate:
+            await self.app(scope, receive, send)
+            return
+
+        is_json = any(
+            name == b"content-type" and value.startswith(b"application/json")
+            for name, value in scope["headers"]
+        )
+        body_chunks: list[bytes] = []
+        body_size = 0
+        status_code = 500
+
+        async def capture_receive() -> Message:
+            nonlocal body_size
+            message = await receive()
+            if is_json and message["type"] == "http.request":
+                body_size += len(message.get("body", b""))
+                if body_size <= MAX_CAPTURED_BODY:
+                    body_chunks.append(message.get("body", b""))
+            return message
+
+        async def capture_send(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        started_at = time.time()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, capture_receive, capture_send)
+        finally:
+            duration = time.perf_counter() - started
+            # Шаблон маршрута и параметры пути известны только после маршрутизации
+            capture_logger.info(
+                {
+                    "ts": round(started_at, 6),
+                    "method": scope["method"],
+                    "route": resolve_route(scope),
+                    "path_params": scope.get("path_params", {}),
+                    "query": redact(dict(parse_qsl(scope["query_string"].decode("latin-1")))),
+                    "body": parse_body(body_chunks, body_size > MAX_CAPTURED_BODY),
+                    "subject": get_subject(scope),
+                    "status": status_code,
+                    "duration_ms": round(duration * 1000, 3),
+                }
+            )
@@ -1,3 +1,4 @@
+import asyncio
 import logging
 import sys
 from contextlib import asynccontextmanager
@@ -7,32 +8,99 @@ import uvicorn
 from fastapi import FastAPI
 from fastapi_cache import FastAPICache
 from fastapi_cache.backends.redis import RedisBackend
-from starlette.staticfiles import StaticFiles
+from starlette.concurrency import run_in_threadpool
 
 sys.path.append(str(Path(__file__).parent.parent))
 
+from src.core.compression import CompressionMiddleware
+from src.core.config import settings
+from src.core.http_metrics import HTTPMetricsMiddleware
+from src.core.logging_config import setup_logging, stop_logging
+from src.core.loop_monitor import LoopMonitor
+from src.core.media import media_files
 from src.core.redis_manager import redis_manager
+from src.core.responses import DefaultResponse
+from src.core.traffic_capture import (
+    TrafficCaptureMiddleware,
+    start_traffic_capture,
+    stop_traffic_capture,
+)
 from src.api.auth import router as router_auth
+from src.api.health import router as router_health
+from src.api.metrics import router as router_metrics
+from src.api.profiling import ProfilingMiddleware
 from src.api.exercises import router as router_exercises
 from src.api.workouts import router as router_workouts
+from src.api.analytics import router as router_analytics
+from src.warmup import run_warm_up, retry_warm_up
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    # Настраивается в каждом воркере: поток слушателя логов не переживает fork
+    setup_logging(
+        level=settings.LOG_LEVEL,
+        json_format=settings.LOG_JSON,
+        sampling=settings.LOG_SAMPLING,
+        sql_echo=settings.DB_ECHO,
+    )
+
+    if settings.TRAFFIC_CAPTURE_ENABLED:
+        capture_path = start_traffic_capture(
+            settings.TRAFFIC_CAPTURE_PATH,
+            max_bytes=settings.TRAFFIC_CAPTURE_MAX_BYTES,
+            backup_count=settings.TRAFFIC_CAPTURE_BACKUP_COUNT,
+        )
+        logging.info("Запись трафика в %s", capture_path)
+
+    loop_monitor = None
+    if settings.LOOP_MONITOR_ENABLED:
+        loop_monitor = LoopMonitor(
+            threshold=settings.LOOP_BLOCK_THRESHOLD, interval=settings.LOOP_MONITOR_INTERVAL
+        )
+        loop_monitor.start()
+        app.state.loop_monitor = loop_monitor
+
+    # Хэши медиафайлов для ETag и адресов с отпечатком считаются до первого запроса
+    await run_in_threadpool(media_files.build_manifest)
+
     await redis_manager.connect()
     FastAPICache.init(RedisBackend(redis_manager.redis), prefix="fastapi-cache")
     logging.info("FastAPI Cache connection initialized")
+    await run_warm_up(app)
+    warm_up_retry = None if app.state.ready else asyncio.create_task(retry_warm_up(app))
     yield
+    if warm_up_retry is not None:
+        warm_up_retry.cancel()
     await redis_manager.close()
+    if loop_monitor is not None:
+        await loop_monitor.stop()
+    stop_traffic_capture()
+    stop_logging()
 
 
-app = FastAPI(lifespan=lifespan)
+app = FastAPI(lifespan=lifespan, default_response_class=DefaultResponse)
+if settings.TRAFFIC_CAPTURE_ENABLED:
+    app.add_middleware(TrafficCaptureMiddleware, sample_rate=settings.TRAFFIC_CAPTURE_SAMPLE_RATE)
+if settings.PROFILING_ENABLED:
+    app.add_middleware(ProfilingMiddleware, interval=settings.PROFILING_INTERVAL)
+app.add_middleware(HTTPMetricsMiddleware)
+if settings.COMPRESSION_ENABLED:
+    # Статика не сжимается на запрос: media_files отдаёт готовые сжатые варианты
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+        exclude_prefixes=(settings.MEDIA_URL,),
+    )
 
-app.mount("/static", StaticFiles(directory="src"), name="static")
+app.mount(settings.MEDIA_URL, media_files, name="static")
 
+app.include_router(router_health)
+app.include_router(router_metrics)
 app.include_router(router_auth)
 app.include_router(router_exercises)
 app.include_router(router_workouts)
+app.include_router(router_analytics)
 
 
 if __name__ == "__main__":
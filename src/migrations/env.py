@@ -10,9 +10,13 @@ from src.core.db import Base
 
 from src.models import (
     ExercisesModel,  # noqa: F401
+    ExerciseTombstonesModel,  # noqa: F401
     WorkoutsModel,  # noqa: F401
     WorkoutExerciseModel,  # noqa: F401
+    WorkoutChangesModel,  # noqa: F401
+    WorkoutChangeCountersModel,  # noqa: F401
     UsersModel,  # noqa: F401
+    TrainingRollupsModel,  # noqa: F401
 )
 
 
@@ -0,0 +1,41 @@
+"""users cleanup indexes
+
+Revision ID: 3b7d2c9a41f0
+Revises: e06a4b46f07a
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3b7d2c9a41f0"
+down_revision: Union[str, Sequence[str], None] = "e06a4b46f07a"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_users_unverified_id",
+        "users",
+        ["id"],
+        unique=False,
+        postgresql_where=sa.text("NOT is_verified"),
+    )
+    op.create_index(op.f("ix_workouts_user_id"), "workouts", ["user_id"], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f("ix_workouts_user_id"), table_name="workouts")
+    op.drop_index(
+        "ix_users_unverified_id",
+        table_name="users",
+        postgresql_where=sa.text("NOT is_verified"),
+    )
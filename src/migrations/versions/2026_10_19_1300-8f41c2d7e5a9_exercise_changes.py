@@ -0,0 +1,48 @@
+"""exercise changes: updated_at index and tombstones
+
+Revision ID: 8f41c2d7e5a9
+Revises: 3b7d2c9a41f0
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "8f41c2d7e5a9"
+down_revision: Union[str, Sequence[str], None] = "3b7d2c9a41f0"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "exercise_tombstones",
+        sa.Column("exercise_id", sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column(
+            "deleted_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("exercise_id"),
+    )
+    op.create_index(
+        op.f("ix_exercise_tombstones_deleted_at"),
+        "exercise_tombstones",
+        ["deleted_at"],
+        unique=False,
+    )
+    op.create_index("ix_exercises_updated_at", "exercises", ["updated_at"], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_exercises_updated_at", table_name="exercises")
+    op.drop_index(op.f("ix_exercise_tombstones_deleted_at"), table_name="exercise_tombstones")
+    op.drop_table("exercise_tombstones")
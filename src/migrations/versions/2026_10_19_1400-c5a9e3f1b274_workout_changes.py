@@ -0,0 +1,71 @@
+"""workout change feed
+
+Revision ID: c5a9e3f1b274
+Revises: 8f41c2d7e5a9
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c5a9e3f1b274"
+down_revision: Union[str, Sequence[str], None] = "8f41c2d7e5a9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "workout_changes",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("workout_id", sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column("seq", sa.BigInteger(), nullable=False),
+        sa.Column("deleted", sa.Boolean(), nullable=False),
+        sa.Column(
+            "changed_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("user_id", "workout_id"),
+    )
+    op.create_index(
+        "ix_workout_changes_user_id_seq", "workout_changes", ["user_id", "seq"], unique=False
+    )
+    op.create_table(
+        "workout_change_counters",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("seq", sa.BigInteger(), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("user_id"),
+    )
+
+    # Уже существующие тренировки попадают в ленту, чтобы первая синхронизация с since=0
+    # вернула их все
+    op.execute(
+        """
+        INSERT INTO workout_changes (user_id, workout_id, seq, deleted)
+        SELECT user_id, id, row_number() OVER (PARTITION BY user_id ORDER BY id), false
+        FROM workouts
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO workout_change_counters (user_id, seq)
+        SELECT user_id, max(seq) FROM workout_changes GROUP BY user_id
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("workout_change_counters")
+    op.drop_index("ix_workout_changes_user_id_seq", table_name="workout_changes")
+    op.drop_table("workout_changes")
@@ -0,0 +1,48 @@
+"""workout summary columns
+
+Revision ID: d2b7f8a3c615
+Revises: c5a9e3f1b274
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d2b7f8a3c615"
+down_revision: Union[str, Sequence[str], None] = "c5a9e3f1b274"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Столбцы добавляются с константными значениями по умолчанию (без перезаписи таблицы);
+    # сводку существующих тренировок заполняет задача src.core.batch_tasks.backfill_workout_summaries
+    op.add_column(
+        "workouts", sa.Column("total_volume", sa.Float(), server_default="0", nullable=False)
+    )
+    op.add_column(
+        "workouts", sa.Column("exercises_count", sa.Integer(), server_default="0", nullable=False)
+    )
+    op.add_column(
+        "workouts",
+        sa.Column(
+            "main_categories",
+            postgresql.ARRAY(sa.String(length=20)),
+            server_default=sa.text("'{}'"),
+            nullable=False,
+        ),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("workouts", "main_categories")
+    op.drop_column("workouts", "exercises_count")
+    op.drop_column("workouts", "total_volume")
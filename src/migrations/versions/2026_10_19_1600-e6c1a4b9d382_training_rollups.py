@@ -0,0 +1,43 @@
+"""training rollups by day and week
+
+Revision ID: e6c1a4b9d382
+Revises: d2b7f8a3c615
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e6c1a4b9d382"
+down_revision: Union[str, Sequence[str], None] = "d2b7f8a3c615"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Агрегаты существующих тренировок заполняет задача
+    # src.core.batch_tasks.rebuild_training_rollups
+    op.create_table(
+        "training_rollups",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("period", sa.String(length=10), nullable=False),
+        sa.Column("period_start", sa.Date(), nullable=False),
+        sa.Column("category", sa.String(length=20), nullable=False),
+        sa.Column("volume", sa.Float(), nullable=False),
+        sa.Column("sets", sa.Integer(), nullable=False),
+        sa.Column("reps", sa.Integer(), nullable=False),
+        sa.Column("workouts_count", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("user_id", "period", "period_start", "category"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("training_rollups")
@@ -0,0 +1,33 @@
+"""workout_exercises (workout_id, exercise_id) index
+
+Revision ID: f3d8b2c7a140
+Revises: e6c1a4b9d382
+Create Date: 2026-10-19 17:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "f3d8b2c7a140"
+down_revision: Union[str, Sequence[str], None] = "e6c1a4b9d382"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_workout_exercises_workout_id_exercise_id",
+        "workout_exercises",
+        ["workout_id", "exercise_id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_workout_exercises_workout_id_exercise_id", table_name="workout_exercises")
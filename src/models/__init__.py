@@ -1,6 +1,21 @@
-from src.models.exercises import ExercisesModel
-from src.models.workouts import WorkoutsModel, WorkoutExerciseModel
+from src.models.exercises import ExercisesModel, ExerciseTombstonesModel
+from src.models.workouts import (
+    WorkoutsModel,
+    WorkoutExerciseModel,
+    WorkoutChangesModel,
+    WorkoutChangeCountersModel,
+)
 from src.models.users import UsersModel
+from src.models.analytics import TrainingRollupsModel
 
 
-__all__ = ["ExercisesModel", "WorkoutsModel", "WorkoutExerciseModel", "UsersModel"]
+__all__ = [
+    "ExercisesModel",
+    "ExerciseTombstonesModel",
+    "WorkoutsModel",
+    "WorkoutExerciseModel",
+    "WorkoutChangesModel",
+    "WorkoutChangeCountersModel",
+    "UsersModel",
+    "TrainingRollupsModel",
+]
@@ -0,0 +1,26 @@
+from datetime import date
+
+from sqlalchemy import Float, ForeignKey, Integer, String
+from sqlalchemy.orm import mapped_column, Mapped
+
+from src.core.db import Base
+
+
+class TrainingRollupsModel(Base):
+    # Агрегаты тренировок пользователя по периодам (день, неделя) и категориям упражнений.
+    # Пересчитываются в транзакции каждого изменения тренировки только для затронутых
+    # периодов (TrainingRollupsRepository.refresh), целиком — задачей rebuild_training_rollups.
+    # Эндпоинты /analytics читают только эту таблицу
+    __tablename__ = "training_rollups"
+
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    period: Mapped[str] = mapped_column(String(10), primary_key=True)
+    # Для недели — понедельник
+    period_start: Mapped[date] = mapped_column(primary_key=True)
+    category: Mapped[str] = mapped_column(String(20), primary_key=True)
+    volume: Mapped[float] = mapped_column(Float, default=0)
+    sets: Mapped[int] = mapped_column(Integer, default=0)
+    reps: Mapped[int] = mapped_column(Integer, default=0)
+    workouts_count: Mapped[int] = mapped_column(Integer, default=0)
@@ -1,6 +1,7 @@
+import datetime
 import typing
 
-from sqlalchemy import String, Enum
+from sqlalchemy import DateTime, Enum, Index, String, func
 from sqlalchemy.orm import mapped_column, Mapped, relationship
 
 from src.core.db import Base
@@ -14,6 +15,10 @@ if typing.TYPE_CHECKING:
 
 class ExercisesModel(IDMixin, TimestampsMixin, Base):
     __tablename__ = "exercises"
+    __table_args__ = (
+        # Инкрементальная синхронизация каталога: GET /exercises/changes?since=...
+        Index("ix_exercises_updated_at", "updated_at"),
+    )
 
     name: Mapped[str] = mapped_column(String(100))
     description: Mapped[str | None] = mapped_column(String(500))
@@ -23,3 +28,14 @@ class ExercisesModel(IDMixin, TimestampsMixin, Base):
         back_populates="exercises",
         secondary="workout_exercises",
     )
+
+
+class ExerciseTombstonesModel(Base):
+    # Упражнения удаляются из каталога физически; для синхронизации клиентов остаётся запись
+    # об удалении, GET /exercises/changes отдаёт её в deleted
+    __tablename__ = "exercise_tombstones"
+
+    exercise_id: Mapped[int] = mapped_column(primary_key=True, autoincrement=False)
+    deleted_at: Mapped[datetime.datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), index=True
+    )
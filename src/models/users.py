@@ -1,4 +1,4 @@
-from sqlalchemy import String, Enum, Boolean
+from sqlalchemy import String, Enum, Boolean, Index, text
 from sqlalchemy.orm import Mapped, mapped_column
 
 from src.core.db import Base
@@ -9,6 +9,10 @@ from src.schemas.users import Roles
 
 class UsersModel(IDMixin, TimestampsMixin, Base):
     __tablename__ = "users"
+    __table_args__ = (
+        # Частичный индекс для периодической очистки неподтверждённых аккаунтов
+        Index("ix_users_unverified_id", "id", postgresql_where=text("NOT is_verified")),
+    )
 
     email: Mapped[str] = mapped_column(String, unique=True)
     hashed_password: Mapped[str] = mapped_column(String, nullable=False)
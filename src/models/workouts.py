@@ -1,7 +1,8 @@
 import typing
-from datetime import date
+from datetime import date, datetime
 
-from sqlalchemy import Integer, String, ForeignKey
+from sqlalchemy import BigInteger, Boolean, DateTime, Float, Index, Integer, String, ForeignKey, func, text
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.orm import mapped_column, Mapped, relationship
 
 from src.core.db import Base
@@ -15,9 +16,17 @@ if typing.TYPE_CHECKING:
 class WorkoutsModel(IDMixin, TimestampsMixin, Base):
     __tablename__ = "workouts"
 
-    user_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id"))
+    user_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id"), index=True)
     date: Mapped[date]
     description: Mapped[str | None] = mapped_column(String(500))
+    # Сводка по упражнениям тренировки для списков. Пересчитывается в транзакции каждого
+    # изменения (WorkoutsRepository.refresh_summaries), для старых строк — задачей
+    # backfill_workout_summaries
+    total_volume: Mapped[float] = mapped_column(Float, default=0, server_default="0")
+    exercises_count: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    main_categories: Mapped[list[str]] = mapped_column(
+        ARRAY(String(20)), default=list, server_default=text("'{}'")
+    )
     exercises: Mapped[list["ExercisesModel"]] = relationship(
         back_populates="workouts",
         secondary="workout_exercises",
@@ -27,6 +36,10 @@ class WorkoutsModel(IDMixin, TimestampsMixin, Base):
 
 class WorkoutExerciseModel(IDMixin, TimestampsMixin, Base):
     __tablename__ = "workout_exercises"
+    __table_args__ = (
+        # Упражнения тренировок пользователя и история упражнения (GET /analytics/progress/...)
+        Index("ix_workout_exercises_workout_id_exercise_id", "workout_id", "exercise_id"),
+    )
 
     workout_id: Mapped[int] = mapped_column(
         ForeignKey("workouts.id", ondelete="CASCADE")  # ← каскадное удаление
@@ -35,3 +48,30 @@ class WorkoutExerciseModel(IDMixin, TimestampsMixin, Base):
     sets: Mapped[int]
     reps: Mapped[int]
     weight: Mapped[float]
+
+
+class WorkoutChangesModel(Base):
+    # Лента изменений тренировок пользователя для синхронизации клиентов. На каждую тренировку
+    # одна строка с номером последнего изменения: размер ленты не растёт с числом правок, а
+    # удалённая тренировка остаётся записью с deleted=True
+    __tablename__ = "workout_changes"
+    __table_args__ = (Index("ix_workout_changes_user_id_seq", "user_id", "seq"),)
+
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    workout_id: Mapped[int] = mapped_column(primary_key=True, autoincrement=False)
+    seq: Mapped[int] = mapped_column(BigInteger)
+    deleted: Mapped[bool] = mapped_column(Boolean, default=False)
+    changed_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+
+
+class WorkoutChangeCountersModel(Base):
+    # Последний номер изменения пользователя. Строка блокируется до конца транзакции, поэтому
+    # номера одного пользователя становятся видны строго по возрастанию
+    __tablename__ = "workout_change_counters"
+
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    seq: Mapped[int] = mapped_column(BigInteger, default=0)
@@ -0,0 +1,114 @@
+import datetime
+
+from sqlalchemy import ARRAY, Date, any_, bindparam, delete, func, select, tuple_
+from sqlalchemy.orm import aliased
+
+from src.models.analytics import TrainingRollupsModel
+from src.models.workouts import WorkoutsModel
+from src.repositories.base import BaseRepository
+from src.repositories.mappers.mappers import TrainingRollupDataMapper
+from src.repositories.queries import (
+    ROLLUP_PERIODS,
+    ROLLUP_PERIOD_DAYS,
+    build_rollups_insert,
+    period_start,
+    period_starts,
+    workouts_with_exercise,
+)
+
+
+class TrainingRollupsRepository(BaseRepository):
+    model = TrainingRollupsModel
+    mapper = TrainingRollupDataMapper
+
+    async def refresh(self, user_id: int, dates: list[datetime.date]):
+        # Пересчитывает дни и недели, в которые попадают даты изменённых тренировок (для
+        # переноса — и старая, и новая дата). Стоимость зависит от числа тренировок в этих
+        # периодах, а не от всей истории пользователя. Вызывается после
+        # WorkoutChangesRepository.record: строка счётчика пользователя уже заблокирована,
+        # и параллельные пересчёты одного пользователя не пересекаются
+        for period in ROLLUP_PERIODS:
+            starts = period_starts(period, dates)
+            starts_param = any_(bindparam("starts", starts, type_=ARRAY(Date)))
+            await self.session.execute(
+                delete(self.model).where(
+                    self.model.user_id == user_id,
+                    self.model.period == period,
+                    self.model.period_start == starts_param,
+                )
+            )
+            await self.session.execute(
+                build_rollups_insert(
+                    period,
+                    WorkoutsModel.user_id == user_id,
+                    # Диапазон дат ограничивает выборку, точное совпадение периода — второе условие
+                    WorkoutsModel.date >= starts[0],
+                    WorkoutsModel.date
+                    < starts[-1] + datetime.timedelta(days=ROLLUP_PERIOD_DAYS[period]),
+                    period_start(period, WorkoutsModel.date) == starts_param,
+                )
+            )
+
+    async def refresh_with_exercise(self, exercise_id: int):
+        # После смены категории упражнения пересчитываются дни и недели всех пользователей,
+        # в которые попадают тренировки с этим упражнением. Вызывается после
+        # WorkoutChangesRepository.record_with_exercise: строки счётчиков этих пользователей
+        # уже заблокированы
+        workouts = aliased(WorkoutsModel)
+        affected = workouts.id.in_(workouts_with_exercise(exercise_id))
+        for period in ROLLUP_PERIODS:
+            buckets = (
+                select(workouts.user_id, period_start(period, workouts.date))
+                .where(affected)
+                .distinct()
+                .correlate(None)
+            )
+            await self.session.execute(
+                delete(self.model).where(
+                    self.model.period == period,
+                    tuple_(self.model.user_id, self.model.period_start).in_(buckets),
+                )
+            )
+            await self.session.execute(
+                build_rollups_insert(
+                    period,
+                    tuple_(WorkoutsModel.user_id, period_start(period, WorkoutsModel.date)).in_(
+                        buckets
+                    ),
+                )
+            )
+
+    def _range_filter(self, user_id, period, date_from, date_to, category):
+        filters = [
+            self.model.user_id == user_id,
+            self.model.period == period,
+            self.model.period_start >= date_from,
+            self.model.period_start <= date_to,
+        ]
+        if category is not None:
+            filters.append(self.model.category == category.value)
+        return filters
+
+    async def get_range(self, user_id, period, date_from, date_to, category=None):
+        query = (
+            select(self.model)
+            .where(*self._range_filter(user_id, period, date_from, date_to, category))
+            .order_by(self.model.period_start, self.model.category)
+        )
+        result = await self.session.execute(query)
+        return [self.mapper.map_to_domain_entity(model) for model in result.scalars().all()]
+
+    async def get_totals(self, user_id, period, date_from, date_to) -> list[dict]:
+        query = (
+            select(
+                self.model.period_start,
+                func.sum(self.model.volume).label("volume"),
+                func.sum(self.model.sets).label("sets"),
+                func.sum(self.model.reps).label("reps"),
+            )
+            .where(*self._range_filter(user_id, period, date_from, date_to, None))
+            .group_by(self.model.period_start)
+            .order_by(self.model.period_start)
+        )
+        result = await self.session.execute(query)
+        return [dict(row) for row in result.mappings().all()]
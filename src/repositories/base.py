@@ -8,6 +8,8 @@ from sqlalchemy.exc import NoResultFound, IntegrityError
 from src.exceptions import ObjectAlreadyExistsException, ValidationServiceError, ObjectNotFoundException
 from src.repositories.mappers.base import DataMapper
 
+logger = logging.getLogger(__name__)
+
 
 class BaseRepository:
     model = None
@@ -22,6 +24,17 @@ class BaseRepository:
         data = result.scalars().all()
         return [self.mapper.map_to_domain_entity(model) for model in data]
 
+    async def get_filtered_fields(self, fields: list[str], *filter, **filters) -> list[dict]:
+        # Выбираются только запрошенные столбцы, строки возвращаются словарями без ORM-объектов
+        # и pydantic-схем; имена полей должны быть проверены вызывающим (fields_dependency)
+        query = (
+            select(*(getattr(self.model, field) for field in fields))
+            .filter(*filter)
+            .filter_by(**filters)
+        )
+        result = await self.session.execute(query)
+        return [dict(row) for row in result.mappings().all()]
+
     async def get_all(self):
         return await self.get_filtered()
 
@@ -52,11 +65,11 @@ class BaseRepository:
             result = await self.session.execute(add_stmt)
             created_data = result.scalar_one_or_none()
         except IntegrityError as e:
-            logging.exception(f"Ошибка добавления данных в БД, входные данные={data}")
+            logger.exception("Ошибка добавления данных в БД, входные данные=%s", data)
             if isinstance(e.orig.__cause__, UniqueViolationError):
                 raise ObjectAlreadyExistsException
             else:
-                logging.exception(f"Незнакомая ошибка, входные данные={data}")
+                logger.exception("Незнакомая ошибка, входные данные=%s", data)
                 raise e
         created = self.mapper.map_to_domain_entity(created_data)
 
@@ -68,6 +81,17 @@ class BaseRepository:
         )
         await self.session.execute(add_data_stmt)
 
+    async def add_bulk_returning(self, data: list[BaseModel]):
+        # Многострочный INSERT ... RETURNING: строки возвращаются в порядке входных данных.
+        # render_nulls — не разбивать пакет на отдельные запросы по строкам с None
+        add_stmt = insert(self.model).returning(self.model, sort_by_parameter_order=True)
+        result = await self.session.execute(
+            add_stmt,
+            [item.model_dump(exclude_unset=True) for item in data],
+            execution_options={"render_nulls": True},
+        )
+        return [self.mapper.map_to_domain_entity(model) for model in result.scalars().all()]
+
     async def update(self, data, **filter):
         if isinstance(data, BaseModel):
             update_data = data.model_dump(exclude_unset=True)
@@ -1,8 +1,48 @@
-from src.models.exercises import ExercisesModel
+import datetime
+
+from sqlalchemy import ARRAY, Integer, any_, bindparam, select
+
+from src.models.exercises import ExercisesModel, ExerciseTombstonesModel
 from src.repositories.base import BaseRepository
-from src.repositories.mappers.mappers import ExerciseDataMapper
+from src.repositories.mappers.mappers import ExerciseDataMapper, ExerciseTombstoneDataMapper
 
 
 class ExercisesRepository(BaseRepository):
     model = ExercisesModel
     mapper = ExerciseDataMapper
+
+    async def get_existing_ids(self, ids) -> set[int]:
+        query = select(self.model.id).where(self.model.id.in_(ids))
+        result = await self.session.execute(query)
+        return set(result.scalars().all())
+
+    async def get_by_ids(self, ids: list[int]):
+        # = ANY(:ids) с одним параметром-массивом: текст запроса не зависит от числа ID,
+        # и asyncpg переиспользует подготовленный запрос, в отличие от IN (...)
+        query = select(self.model).where(
+            self.model.id == any_(bindparam("ids", ids, type_=ARRAY(Integer)))
+        )
+        result = await self.session.execute(query)
+        return [self.mapper.map_to_domain_entity(model) for model in result.scalars().all()]
+
+    async def get_updated_since(self, since: datetime.datetime | None):
+        # Возвращает упражнения, изменённые после since, и время последнего изменения среди них
+        query = select(self.model).order_by(self.model.updated_at)
+        if since is not None:
+            query = query.where(self.model.updated_at > since)
+        result = await self.session.execute(query)
+        models = result.scalars().all()
+        last_updated_at = models[-1].updated_at if models else None
+        return [self.mapper.map_to_domain_entity(model) for model in models], last_updated_at
+
+
+class ExerciseTombstonesRepository(BaseRepository):
+    model = ExerciseTombstonesModel
+    mapper = ExerciseTombstoneDataMapper
+
+    async def get_deleted_since(self, since: datetime.datetime | None):
+        query = select(self.model).order_by(self.model.deleted_at)
+        if since is not None:
+            query = query.where(self.model.deleted_at > since)
+        result = await self.session.execute(query)
+        return [self.mapper.map_to_domain_entity(model) for model in result.scalars().all()]
@@ -1,10 +1,12 @@
-from src.models.exercises import ExercisesModel
+from src.models.analytics import TrainingRollupsModel
+from src.models.exercises import ExercisesModel, ExerciseTombstonesModel
 from src.models.users import UsersModel
-from src.models.workouts import WorkoutsModel, WorkoutExerciseModel
+from src.models.workouts import WorkoutsModel, WorkoutExerciseModel, WorkoutChangesModel
 from src.repositories.mappers.base import DataMapper
-from src.schemas.exercises import Exercise
+from src.schemas.analytics import TrainingRollup
+from src.schemas.exercises import Exercise, ExerciseTombstone
 from src.schemas.users import User
-from src.schemas.workouts import Workout, WorkoutExercise
+from src.schemas.workouts import Workout, WorkoutExercise, WorkoutChangeRecord
 
 
 class UserDataMapper(DataMapper):
@@ -17,6 +19,11 @@ class ExerciseDataMapper(DataMapper):
     schema = Exercise
 
 
+class ExerciseTombstoneDataMapper(DataMapper):
+    db_model = ExerciseTombstonesModel
+    schema = ExerciseTombstone
+
+
 class WorkoutDataMapper(DataMapper):
     db_model = WorkoutsModel
     schema = Workout
@@ -25,3 +32,13 @@ class WorkoutDataMapper(DataMapper):
 class WorkoutExerciseDataMapper(DataMapper):
     db_model = WorkoutExerciseModel
     schema = WorkoutExercise
+
+
+class WorkoutChangeDataMapper(DataMapper):
+    db_model = WorkoutChangesModel
+    schema = WorkoutChangeRecord
+
+
+class TrainingRollupDataMapper(DataMapper):
+    db_model = TrainingRollupsModel
+    schema = TrainingRollup
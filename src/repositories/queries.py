@@ -0,0 +1,162 @@
+import datetime
+
+from sqlalchemy import (
+    ARRAY,
+    Date,
+    DateTime,
+    Integer,
+    String,
+    any_,
+    bindparam,
+    cast,
+    func,
+    insert,
+    literal,
+    select,
+    type_coerce,
+    update,
+)
+from sqlalchemy.dialects.postgresql import aggregate_order_by, array_agg
+
+from src.models.analytics import TrainingRollupsModel
+from src.models.exercises import ExercisesModel
+from src.models.workouts import WorkoutsModel, WorkoutExerciseModel
+
+# Построители SQL, общие для репозиториев (asyncpg) и фоновых задач Celery (psycopg2).
+# Модуль не импортирует драйверы и репозитории: воркер не загружает asyncpg
+
+
+def category_value():
+    # Enum хранится в БД по имени (CHEST), значения Category — те же имена в нижнем регистре
+    return func.lower(cast(ExercisesModel.category, String))
+
+
+WORKOUT_MAIN_CATEGORIES_LIMIT = 3
+
+
+def ids_param(ids: list[int]):
+    return any_(bindparam("ids", ids, type_=ARRAY(Integer)))
+
+
+def workouts_with_exercise(exercise_id: int):
+    # correlate(None): подзапрос встраивается в запросы по тем же таблицам и должен
+    # оставаться самостоятельным
+    return (
+        select(WorkoutExerciseModel.workout_id)
+        .where(WorkoutExerciseModel.exercise_id == exercise_id)
+        .distinct()
+        .correlate(None)
+    )
+
+
+def build_summaries_update(workout_ids):
+    # Один UPDATE ... FROM пересчитывает сводку перечисленных тренировок по их упражнениям.
+    # Общий для записи из сервиса и фоновой задачи backfill_workout_summaries. workout_ids —
+    # список ID или подзапрос (например, workouts_with_exercise)
+    if isinstance(workout_ids, list):
+        def in_workouts(column):
+            return column == ids_param(workout_ids)
+    else:
+        def in_workouts(column):
+            return column.in_(workout_ids)
+
+    volume = WorkoutExerciseModel.sets * WorkoutExerciseModel.reps * WorkoutExerciseModel.weight
+    category = category_value()
+    per_category = (
+        select(
+            WorkoutExerciseModel.workout_id,
+            category.label("category"),
+            func.sum(volume).label("volume"),
+            func.count().label("exercises_count"),
+        )
+        .join(ExercisesModel, ExercisesModel.id == WorkoutExerciseModel.exercise_id)
+        .where(in_workouts(WorkoutExerciseModel.workout_id))
+        .group_by(WorkoutExerciseModel.workout_id, ExercisesModel.category)
+        .subquery()
+    )
+    categories = type_coerce(
+        array_agg(
+            aggregate_order_by(
+                per_category.c.category, per_category.c.volume.desc(), per_category.c.category
+            )
+        ).filter(per_category.c.category.isnot(None)),
+        ARRAY(String),
+    )
+    summary = (
+        select(
+            WorkoutsModel.id.label("workout_id"),
+            func.coalesce(func.sum(per_category.c.volume), 0).label("total_volume"),
+            func.coalesce(func.sum(per_category.c.exercises_count), 0).label("exercises_count"),
+            func.coalesce(
+                categories[1:WORKOUT_MAIN_CATEGORIES_LIMIT], cast([], ARRAY(String))
+            ).label("main_categories"),
+        )
+        .outerjoin(per_category, per_category.c.workout_id == WorkoutsModel.id)
+        .where(in_workouts(WorkoutsModel.id))
+        .group_by(WorkoutsModel.id)
+        .subquery()
+    )
+    return (
+        update(WorkoutsModel)
+        .where(WorkoutsModel.id == summary.c.workout_id)
+        .values(
+            total_volume=summary.c.total_volume,
+            exercises_count=summary.c.exercises_count,
+            main_categories=summary.c.main_categories,
+        )
+    )
+
+
+ROLLUP_PERIODS = ("day", "week")
+ROLLUP_PERIOD_DAYS = {"day": 1, "week": 7}
+
+
+def period_start(period: str, day):
+    if period == "day":
+        return day
+    # date_trunc('week') в PostgreSQL — понедельник, как и date.weekday() == 0
+    return cast(func.date_trunc("week", cast(day, DateTime)), Date)
+
+
+def period_starts(period: str, dates) -> list[datetime.date]:
+    if period == "day":
+        return sorted(set(dates))
+    return sorted({day - datetime.timedelta(days=day.weekday()) for day in dates})
+
+
+def build_rollups_insert(period: str, *where):
+    # INSERT ... SELECT агрегатов по тренировкам, отобранным условиями where.
+    # Общий для пересчёта периодов из сервиса и фоновой задачи rebuild_training_rollups
+    start = period_start(period, WorkoutsModel.date)
+    category = category_value()
+    aggregates = (
+        select(
+            WorkoutsModel.user_id,
+            literal(period),
+            start,
+            category,
+            func.sum(
+                WorkoutExerciseModel.sets * WorkoutExerciseModel.reps * WorkoutExerciseModel.weight
+            ),
+            func.sum(WorkoutExerciseModel.sets),
+            func.sum(WorkoutExerciseModel.sets * WorkoutExerciseModel.reps),
+            func.count(WorkoutsModel.id.distinct()),
+        )
+        .join(WorkoutExerciseModel, WorkoutExerciseModel.workout_id == WorkoutsModel.id)
+        .join(ExercisesModel, ExercisesModel.id == WorkoutExerciseModel.exercise_id)
+        .where(*where)
+        .group_by(WorkoutsModel.user_id, start, ExercisesModel.category)
+    )
+    return insert(TrainingRollupsModel).from_select(
+        [
+            TrainingRollupsModel.user_id,
+            TrainingRollupsModel.period,
+            TrainingRollupsModel.period_start,
+            TrainingRollupsModel.category,
+            TrainingRollupsModel.volume,
+            TrainingRollupsModel.sets,
+            TrainingRollupsModel.reps,
+            TrainingRollupsModel.workouts_count,
+        ],
+        aggregates,
+    )
@@ -1,13 +1,184 @@
-from src.models.workouts import WorkoutsModel, WorkoutExerciseModel
+import datetime
+
+from sqlalchemy import Integer, cast, false, func, select
+from sqlalchemy.dialects.postgresql import aggregate_order_by, array_agg
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from src.models.workouts import (
+    WorkoutsModel,
+    WorkoutExerciseModel,
+    WorkoutChangesModel,
+    WorkoutChangeCountersModel,
+)
 from src.repositories.base import BaseRepository
-from src.repositories.mappers.mappers import WorkoutDataMapper, WorkoutExerciseDataMapper
+from src.repositories.mappers.mappers import (
+    WorkoutDataMapper,
+    WorkoutExerciseDataMapper,
+    WorkoutChangeDataMapper,
+)
+from src.repositories.queries import build_summaries_update, ids_param, workouts_with_exercise
+
+
+EPOCH = datetime.date(1970, 1, 1)
 
 
 class WorkoutsRepository(BaseRepository):
     model = WorkoutsModel
     mapper = WorkoutDataMapper
 
+    async def get_by_ids(self, ids: list[int]):
+        query = select(self.model).where(self.model.id == ids_param(ids))
+        result = await self.session.execute(query)
+        return [self.mapper.map_to_domain_entity(model) for model in result.scalars().all()]
+
+    async def refresh_summaries(self, workout_ids: list[int]):
+        # Вызывается после изменения упражнений тренировок, до коммита. Возвращает тренировки
+        # с новой сводкой; populate_existing — обновить уже загруженные в сессию объекты
+        stmt = build_summaries_update(workout_ids).returning(self.model)
+        result = await self.session.execute(
+            stmt, execution_options={"synchronize_session": False, "populate_existing": True}
+        )
+        return [self.mapper.map_to_domain_entity(model) for model in result.scalars().all()]
+
+    async def refresh_summaries_with_exercise(self, exercise_id: int):
+        # После смены категории упражнения: main_categories всех тренировок с ним, до коммита
+        await self.session.execute(
+            build_summaries_update(workouts_with_exercise(exercise_id)),
+            execution_options={"synchronize_session": False},
+        )
+
 
 class WorkoutExerciseRepository(BaseRepository):
     model = WorkoutExerciseModel
     mapper = WorkoutExerciseDataMapper
+
+    async def get_by_workout_ids(self, workout_ids: list[int]):
+        query = (
+            select(self.model)
+            .where(self.model.workout_id == ids_param(workout_ids))
+            .order_by(self.model.id)
+        )
+        result = await self.session.execute(query)
+        return [self.mapper.map_to_domain_entity(model) for model in result.scalars().all()]
+
+    async def get_exercise_history(self, user_id: int, exercise_id: int):
+        # История упражнения пользователя столбцами: одна строка с массивами (дни от 1970-01-01,
+        # подходы, повторения, вес) по возрастанию даты. asyncpg декодирует массивы целиком,
+        # без строки результата и ORM-объекта на каждую запись
+        order = (WorkoutsModel.date, self.model.id)
+        days = cast(WorkoutsModel.date - EPOCH, Integer)
+        query = (
+            select(
+                *(
+                    array_agg(aggregate_order_by(column, *order))
+                    for column in (days, self.model.sets, self.model.reps, self.model.weight)
+                )
+            )
+            .join(WorkoutsModel, WorkoutsModel.id == self.model.workout_id)
+            .where(WorkoutsModel.user_id == user_id, self.model.exercise_id == exercise_id)
+        )
+        row = (await self.session.execute(query)).one()
+        # Без записей array_agg возвращает NULL
+        return tuple(column or [] for column in row)
+
+
+class WorkoutChangesRepository(BaseRepository):
+    model = WorkoutChangesModel
+    mapper = WorkoutChangeDataMapper
+
+    async def record(self, user_id: int, workout_ids: list[int], deleted: bool = False) -> int:
+        # Вызывается в транзакции изменения до коммита. Счётчик пользователя увеличивается
+        # сразу на число тренировок, и его строка остаётся заблокированной до коммита:
+        # параллельная транзакция того же пользователя получит следующие номера только
+        # после неё, поэтому клиент не пропустит изменение с меньшим номером
+        workout_ids = list(dict.fromkeys(workout_ids))
+        counter_stmt = (
+            pg_insert(WorkoutChangeCountersModel)
+            .values(user_id=user_id, seq=len(workout_ids))
+            .on_conflict_do_update(
+                index_elements=[WorkoutChangeCountersModel.user_id],
+                set_={"seq": WorkoutChangeCountersModel.seq + len(workout_ids)},
+            )
+            .returning(WorkoutChangeCountersModel.seq)
+        )
+        last_seq = (await self.session.execute(counter_stmt)).scalar_one()
+
+        first_seq = last_seq - len(workout_ids) + 1
+        values = [
+            {"user_id": user_id, "workout_id": workout_id, "seq": first_seq + i, "deleted": deleted}
+            for i, workout_id in enumerate(workout_ids)
+        ]
+        insert_stmt = pg_insert(self.model).values(values)
+        upsert_stmt = insert_stmt.on_conflict_do_update(
+            index_elements=[self.model.user_id, self.model.workout_id],
+            set_={
+                "seq": insert_stmt.excluded.seq,
+                "deleted": insert_stmt.excluded.deleted,
+                "changed_at": insert_stmt.excluded.changed_at,
+            },
+        )
+        await self.session.execute(upsert_stmt)
+        return last_seq
+
+    async def record_with_exercise(self, exercise_id: int):
+        # Как record, но для всех тренировок с упражнением сразу (смена его категории меняет
+        # main_categories). Счётчики пользователей увеличиваются по порядку user_id и
+        # остаются заблокированными до коммита; номера изменений идут после нового значения
+        # счётчика минус число тренировок пользователя
+        affected = WorkoutsModel.id.in_(workouts_with_exercise(exercise_id))
+        per_user = (
+            select(WorkoutsModel.user_id, func.count())
+            .where(affected)
+            .group_by(WorkoutsModel.user_id)
+            .order_by(WorkoutsModel.user_id)
+        )
+        counter_stmt = pg_insert(WorkoutChangeCountersModel).from_select(
+            [WorkoutChangeCountersModel.user_id, WorkoutChangeCountersModel.seq], per_user
+        )
+        await self.session.execute(
+            counter_stmt.on_conflict_do_update(
+                index_elements=[WorkoutChangeCountersModel.user_id],
+                set_={"seq": WorkoutChangeCountersModel.seq + counter_stmt.excluded.seq},
+            )
+        )
+
+        by_user = {"partition_by": WorkoutsModel.user_id}
+        changes = (
+            select(
+                WorkoutsModel.user_id,
+                WorkoutsModel.id,
+                WorkoutChangeCountersModel.seq
+                - func.count().over(**by_user)
+                + func.row_number().over(**by_user, order_by=WorkoutsModel.id),
+                false(),
+            )
+            .join(
+                WorkoutChangeCountersModel,
+                WorkoutChangeCountersModel.user_id == WorkoutsModel.user_id,
+            )
+            .where(affected)
+        )
+        insert_stmt = pg_insert(self.model).from_select(
+            [self.model.user_id, self.model.workout_id, self.model.seq, self.model.deleted], changes
+        )
+        await self.session.execute(
+            insert_stmt.on_conflict_do_update(
+                index_elements=[self.model.user_id, self.model.workout_id],
+                set_={
+                    "seq": insert_stmt.excluded.seq,
+                    "deleted": insert_stmt.excluded.deleted,
+                    "changed_at": insert_stmt.excluded.changed_at,
+                },
+            )
+        )
+
+    async def get_page(self, user_id: int, since: int, limit: int):
+        # Индекс (user_id, seq): стоимость страницы не зависит от длины истории
+        query = (
+            select(self.model)
+            .where(self.model.user_id == user_id, self.model.seq > since)
+            .order_by(self.model.seq)
+            .limit(limit)
+        )
+        result = await self.session.execute(query)
+        return [self.mapper.map_to_domain_entity(model) for model in result.scalars().all()]
@@ -0,0 +1,54 @@
+import datetime as dt
+from typing import Literal, Optional
+
+from pydantic import BaseModel
+
+from src.schemas.exercises import Category
+
+
+RollupPeriod = Literal["day", "week"]
+
+# Диапазон по умолчанию и максимальный диапазон запроса к /analytics, в днях
+ANALYTICS_DEFAULT_RANGE_DAYS: dict[str, int] = {"day": 30, "week": 7 * 12}
+ANALYTICS_MAX_RANGE_DAYS = 2 * 366
+
+
+class TrainingTotals(BaseModel):
+    period_start: dt.date
+    volume: float
+    sets: int
+    reps: int
+
+
+class TrainingRollup(TrainingTotals):
+    category: Category
+    # Тренировки периода с упражнениями этой категории
+    workouts_count: int
+
+
+# Прогресс по упражнению (GET /analytics/progress/{exercise_id})
+E1RMFormula = Literal["epley", "brzycki"]
+PROGRESS_MAX_WINDOW = 50
+PROGRESS_MAX_VOLUME_DAYS = 365
+
+
+class ExerciseProgressTrend(BaseModel):
+    # Изменение оценки 1ПМ за неделю по прямой наименьших квадратов
+    slope_per_week: float
+    r2: Optional[float] = None
+
+
+class ExerciseProgress(BaseModel):
+    # Столбцы по дням тренировок: i-е значения всех списков относятся к dates[i].
+    # null в best_e1rm — день только с подходами больше 12 повторений
+    exercise_id: int
+    formula: E1RMFormula
+    window: int
+    volume_days: int
+    records_count: int
+    dates: list[dt.date]
+    best_e1rm: list[Optional[float]]
+    e1rm_moving_average: list[Optional[float]]
+    volume: list[float]
+    rolling_volume: list[float]
+    trend: Optional[ExerciseProgressTrend] = None
@@ -1,3 +1,4 @@
+import datetime as dt
 from enum import Enum
 from typing import Optional
 
@@ -15,6 +16,10 @@ class Category(Enum):
     STRETCHING = "stretching"
 
 
+# Сколько упражнений можно запросить одним GET /exercises?ids=...
+EXERCISES_IDS_MAX_COUNT = 100
+
+
 class ExerciseAddRequest(BaseModel):
     name: str
     description: Optional[str] = None
@@ -62,3 +67,18 @@ class ExerciseUpdate(BaseModel):
     name: Optional[str]
     description: Optional[str] = None
     category: Optional[Category] = None
+
+
+class ExerciseTombstoneAdd(BaseModel):
+    exercise_id: int
+
+
+class ExerciseTombstone(ExerciseTombstoneAdd):
+    deleted_at: dt.datetime
+
+
+class ExerciseChanges(BaseModel):
+    changed: list[Exercise]
+    deleted: list[int]
+    # Передаётся в следующий запрос как since; None — каталог пуст
+    cursor: Optional[dt.datetime] = None
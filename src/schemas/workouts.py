@@ -1,8 +1,10 @@
 import datetime as dt
-from typing import List, Optional
+from typing import List, Literal, Optional
 
 from pydantic import BaseModel, field_validator, Field
 
+from src.schemas.exercises import Category
+
 
 # -------------------------------------
 class ExerciseToAdd(BaseModel):
@@ -18,6 +20,14 @@ class WorkoutRequest(BaseModel):
     exercises: list[ExerciseToAdd]
 
 
+# Сколько тренировок клиент может синхронизировать одним запросом
+WORKOUTS_BATCH_MAX_SIZE = 100
+
+
+class WorkoutBatchRequest(BaseModel):
+    workouts: list[WorkoutRequest] = Field(min_length=1, max_length=WORKOUTS_BATCH_MAX_SIZE)
+
+
 # -------------------------------------
 
 
@@ -29,6 +39,10 @@ class WorkoutAdd(BaseModel):
 
 class Workout(WorkoutAdd):
     id: int
+    # Объём (подходы × повторения × вес), число упражнений и основные категории по объёму
+    total_volume: float = 0
+    exercises_count: int = 0
+    main_categories: list[Category] = []
 
 
 class WorkoutBaseUpdate(BaseModel):
@@ -70,3 +84,32 @@ class WorkoutExercise(WorkoutExerciseAdd):
 
 class WorkoutToResponse(Workout):
     exercises: list[WorkoutExercise]
+
+
+class WorkoutBatchItemResult(BaseModel):
+    index: int
+    status: Literal["created", "error"]
+    workout: Optional[Workout] = None
+    detail: Optional[str] = None
+
+
+# Лента изменений тренировок (GET /workouts/changes)
+WORKOUT_CHANGES_PAGE_MAX_SIZE = 500
+
+
+class WorkoutChangeRecord(BaseModel):
+    workout_id: int
+    seq: int
+    deleted: bool
+
+
+class WorkoutChange(WorkoutChangeRecord):
+    # Для удалённой тренировки workout не заполняется
+    workout: Optional[WorkoutToResponse] = None
+
+
+class WorkoutChangesPage(BaseModel):
+    changes: list[WorkoutChange]
+    # Передаётся в следующий запрос как since
+    next_since: int
+    has_more: bool
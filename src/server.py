@@ -0,0 +1,237 @@
+"""Продакшн-запуск API: несколько воркеров uvicorn поверх общего сокета.
+
+Приложение импортируется в родительском процессе до fork, поэтому код и данные модулей
+разделяются воркерами через copy-on-write. Соединения с БД и Redis открываются уже в воркерах
+(в lifespan), так что в родителе нет ничего, что нельзя наследовать через fork.
+
+    python -m src.server --port 8000
+    WEB_CONCURRENCY=4 python -m src.server
+"""
+
+import argparse
+import importlib.util
+import logging
+import math
+import os
+import signal
+import socket
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import uvicorn
+
+logger = logging.getLogger(__name__)
+
+# Воркер, упавший быстрее этого времени после старта, считается сломанным (ошибка lifespan,
+# занятый порт и т.п.) — перезапускать его в цикле бессмысленно
+MIN_WORKER_UPTIME = 5
+
+
+def get_available_cpus() -> int:
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+
+    # Ограничение CPU контейнера (cgroup v2), например docker run --cpus=2
+    try:
+        quota, period = Path("/sys/fs/cgroup/cpu.max").read_text().split()
+        if quota != "max":
+            cpus = min(cpus, max(1, math.ceil(int(quota) / int(period))))
+    except (OSError, ValueError):
+        pass
+
+    return cpus
+
+
+def get_default_workers() -> int:
+    if "WEB_CONCURRENCY" in os.environ:
+        return max(1, int(os.environ["WEB_CONCURRENCY"]))
+    # Воркер однопоточный и асинхронный, поэтому одного процесса на ядро достаточно
+    return get_available_cpus()
+
+
+def is_installed(module: str) -> bool:
+    return importlib.util.find_spec(module) is not None
+
+
+def resolve_loop(loop: str) -> str:
+    if loop == "auto":
+        return "uvloop" if is_installed("uvloop") else "asyncio"
+    return loop
+
+
+def resolve_http(http: str) -> str:
+    if http == "auto":
+        return "httptools" if is_installed("httptools") else "h11"
+    return http
+
+
+def build_config(app, args: argparse.Namespace) -> uvicorn.Config:
+    return uvicorn.Config(
+        app,
+        host=args.host,
+        port=args.port,
+        loop=resolve_loop(args.loop),
+        http=resolve_http(args.http),
+        backlog=args.backlog,
+        timeout_keep_alive=args.keep_alive,
+        timeout_graceful_shutdown=args.graceful_timeout,
+        limit_concurrency=args.limit_concurrency,
+        proxy_headers=True,
+        access_log=args.access_log,
+        # Логгеры uvicorn без своих хендлеров: записи уходят в корневой логгер и дальше
+        # в очередь логов воркера (см. src.core.logging_config)
+        log_config=None,
+    )
+
+
+def setup_multiprocess_metrics() -> None:
+    # Каждый воркер пишет метрики в свои файлы, /metrics в любом из них агрегирует все.
+    # Переменная должна быть задана до первого импорта prometheus_client
+    if "PROMETHEUS_MULTIPROC_DIR" not in os.environ:
+        os.environ["PROMETHEUS_MULTIPROC_DIR"] = tempfile.mkdtemp(prefix="prometheus-")
+
+
+def mark_worker_dead(pid: int) -> None:
+    # Убирает из live-гейджей (запросы в обработке, соединения пула) значения умершего воркера
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        from prometheus_client import multiprocess
+
+        from src.core.metrics import process_identifier
+
+        multiprocess.mark_process_dead(process_identifier(pid))
+
+
+class Supervisor:
+    def __init__(self, config: uvicorn.Config, sock: socket.socket, workers: int):
+        self.config = config
+        self.sock = sock
+        self.workers = workers
+        self.children: dict[int, float] = {}
+        self.should_exit = False
+        self.exit_code = 0
+
+    def spawn(self) -> None:
+        pid = os.fork()
+        if pid == 0:
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            exit_code = 0
+            try:
+                uvicorn.Server(self.config).run(sockets=[self.sock])
+            except BaseException:
+                logger.exception("Воркер завершился с ошибкой")
+                exit_code = 1
+            finally:
+                os._exit(exit_code)
+        self.children[pid] = time.monotonic()
+        logger.info("Запущен воркер pid=%s", pid)
+
+    def handle_exit(self, signum, frame) -> None:
+        self.should_exit = True
+
+    def reap(self) -> None:
+        while self.children:
+            pid, status = os.waitpid(-1, os.WNOHANG)
+            if pid == 0:
+                return
+            started_at = self.children.pop(pid, None)
+            mark_worker_dead(pid)
+            if started_at is None or self.should_exit:
+                continue
+
+            logger.warning("Воркер pid=%s завершился, статус=%s", pid, status)
+            if time.monotonic() - started_at < MIN_WORKER_UPTIME:
+                logger.error("Воркер упал сразу после старта, останавливаем сервер")
+                self.should_exit = True
+                self.exit_code = 1
+                return
+            self.spawn()
+
+    def shutdown(self) -> None:
+        for pid in self.children:
+            os.kill(pid, signal.SIGTERM)
+
+        # Даём воркерам дослужить текущие запросы, затем добиваем оставшихся
+        deadline = time.monotonic() + (self.config.timeout_graceful_shutdown or 30) + 5
+        while self.children and time.monotonic() < deadline:
+            pid, _ = os.waitpid(-1, os.WNOHANG)
+            if pid == 0:
+                time.sleep(0.1)
+            else:
+                self.children.pop(pid, None)
+                mark_worker_dead(pid)
+
+        for pid in self.children:
+            logger.warning("Воркер pid=%s не завершился вовремя, SIGKILL", pid)
+            os.kill(pid, signal.SIGKILL)
+
+    def run(self) -> int:
+        signal.signal(signal.SIGTERM, self.handle_exit)
+        signal.signal(signal.SIGINT, self.handle_exit)
+
+        for _ in range(self.workers):
+            self.spawn()
+
+        while not self.should_exit:
+            self.reap()
+            time.sleep(0.5)
+
+        self.shutdown()
+        return self.exit_code
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Продакшн-запуск Train Tracker API")
+    parser.add_argument("--host", default=os.environ.get("HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=int(os.environ.get("PORT", 8000)))
+    parser.add_argument("--workers", type=int, default=None,
+                        help="По умолчанию WEB_CONCURRENCY или число доступных ядер")
+    parser.add_argument("--loop", choices=["auto", "asyncio", "uvloop"], default="auto")
+    parser.add_argument("--http", choices=["auto", "h11", "httptools"], default="auto")
+    parser.add_argument("--backlog", type=int, default=2048)
+    parser.add_argument("--keep-alive", type=int, default=5, help="Тайм-аут keep-alive, секунды")
+    parser.add_argument("--graceful-timeout", type=int, default=30)
+    parser.add_argument("--limit-concurrency", type=int, default=None,
+                        help="Максимум одновременных соединений на воркер (сверх — 503)")
+    parser.add_argument("--access-log", action="store_true")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+
+    workers = args.workers or get_default_workers()
+    if not hasattr(os, "fork"):
+        workers = 1
+    if workers > 1:
+        setup_multiprocess_metrics()
+
+    # Импорт до fork: воркеры разделяют загруженные модули
+    from src.main import app
+
+    config = build_config(app, args)
+    logger.info(
+        "Запуск: workers=%s, loop=%s, http=%s, backlog=%s, keep_alive=%ss",
+        workers,
+        config.loop,
+        config.http,
+        config.backlog,
+        config.timeout_keep_alive,
+    )
+
+    if workers == 1:
+        uvicorn.Server(config).run()
+        return 0
+
+    sock = config.bind_socket()
+    sock.set_inheritable(True)
+    return Supervisor(config, sock, workers).run()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
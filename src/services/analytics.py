@@ -0,0 +1,101 @@
+import datetime
+
+import numpy as np
+
+from src.exceptions import ObjectNotFoundException, ValidationServiceError
+from src.schemas.analytics import (
+    ANALYTICS_DEFAULT_RANGE_DAYS,
+    ANALYTICS_MAX_RANGE_DAYS,
+    E1RMFormula,
+    RollupPeriod,
+    TrainingRollup,
+    TrainingTotals,
+)
+from src.schemas.exercises import Category
+from src.services.base import BaseService
+from src.services.progress import (
+    PROGRESS_DEFAULT_VOLUME_DAYS,
+    PROGRESS_DEFAULT_WINDOW,
+    ExerciseHistory,
+    compute_progress,
+)
+
+
+class AnalyticsService(BaseService):
+    # Читает только таблицу training_rollups: время ответа зависит от длины диапазона,
+    # а не от числа тренировок пользователя
+
+    @staticmethod
+    def resolve_range(
+        period: RollupPeriod,
+        date_from: datetime.date | None,
+        date_to: datetime.date | None,
+    ) -> tuple[datetime.date, datetime.date]:
+        date_to = date_to or datetime.date.today()
+        date_from = date_from or date_to - datetime.timedelta(days=ANALYTICS_DEFAULT_RANGE_DAYS[period])
+        if date_from > date_to:
+            raise ValidationServiceError("Начало периода позже его конца")
+        if (date_to - date_from).days > ANALYTICS_MAX_RANGE_DAYS:
+            raise ValidationServiceError(
+                f"Диапазон не может быть больше {ANALYTICS_MAX_RANGE_DAYS} дней"
+            )
+        return date_from, date_to
+
+    async def get_volume(
+        self,
+        user_id: int,
+        period: RollupPeriod,
+        date_from: datetime.date | None = None,
+        date_to: datetime.date | None = None,
+        category: Category | None = None,
+    ) -> list[TrainingRollup]:
+        date_from, date_to = self.resolve_range(period, date_from, date_to)
+        return await self.db.training_rollups.get_range(
+            user_id, period, date_from, date_to, category
+        )
+
+    async def get_totals(
+        self,
+        user_id: int,
+        period: RollupPeriod,
+        date_from: datetime.date | None = None,
+        date_to: datetime.date | None = None,
+    ) -> list[TrainingTotals]:
+        date_from, date_to = self.resolve_range(period, date_from, date_to)
+        rows = await self.db.training_rollups.get_totals(user_id, period, date_from, date_to)
+        return [TrainingTotals(**row) for row in rows]
+
+    async def get_exercise_progress(
+        self,
+        user_id: int,
+        exercise_id: int,
+        formula: E1RMFormula = "epley",
+        window: int = PROGRESS_DEFAULT_WINDOW,
+        volume_days: int = PROGRESS_DEFAULT_VOLUME_DAYS,
+    ) -> dict:
+        # Единственный расчёт /analytics не по агрегатам: история упражнения читается одним
+        # запросом столбцами и считается векторно (src.services.progress). Возвращает столбцы
+        # NumPy для serialize_columns, по форме схемы ExerciseProgress
+        exercise = await self.db.exercises.get_one_or_none(id=exercise_id)
+        if exercise is None:
+            raise ObjectNotFoundException
+        columns = await self.db.workout_exercises.get_exercise_history(user_id, exercise_id)
+        history = ExerciseHistory.from_columns(*columns)
+        progress = compute_progress(history, formula, window, volume_days)
+        trend = progress.trend
+        return {
+            "exercise_id": exercise_id,
+            "formula": formula,
+            "window": window,
+            "volume_days": volume_days,
+            "records_count": len(history.days),
+            "dates": np.datetime_as_string(progress.days.astype("datetime64[D]")).tolist(),
+            "best_e1rm": progress.best_e1rm.round(2),
+            "e1rm_moving_average": progress.e1rm_moving_average.round(2),
+            "volume": progress.volume.round(2),
+            "rolling_volume": progress.rolling_volume.round(2),
+            "trend": None if trend is None else {
+                "slope_per_week": round(trend.slope_per_week, 3),
+                "r2": None if trend.r2 is None else round(trend.r2, 3),
+            },
+        }
@@ -8,10 +8,11 @@ from itsdangerous import URLSafeTimedSerializer, BadSignature
 from passlib.context import CryptContext
 from pydantic import EmailStr
 from sqlalchemy.exc import NoResultFound
+from starlette.concurrency import run_in_threadpool
 
-from src.core.config import settings
+from src.core.config import get_settings
 from src.core.db_manager import DBManager
-from src.core.tasks import send_confirmation_email
+from src.core.tasks import enqueue_confirmation_email
 from src.exceptions import (
     ObjectAlreadyExistsException,
     ObjectNotFoundException,
@@ -21,6 +22,8 @@ from src.exceptions import (
 from src.schemas.users import UserRequest, UserAdd, Roles, User
 from src.services.base import BaseService
 
+logger = logging.getLogger(__name__)
+
 
 class AuthService(BaseService):
     def __init__(self, db: DBManager | None = None, serializer=None):
@@ -30,11 +33,12 @@ class AuthService(BaseService):
             self.serializer = serializer
         else:
             self.serializer = URLSafeTimedSerializer(
-                settings.secret_key.get_secret_value()
+                get_settings().secret_key.get_secret_value()
             )
 
     def create_access_token(self, data: dict) -> str:
-        logging.debug("Create access token")
+        logger.debug("Create access token")
+        settings = get_settings()
         to_encode = data.copy()
         expire = datetime.now(timezone.utc) + timedelta(
             minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
@@ -48,7 +52,7 @@ class AuthService(BaseService):
             )
             return encoded_jwt
         except Exception as e:
-            logging.error(f"Token creation failed: {e}")
+            logger.error("Token creation failed: %s", e)
             raise
 
     def verify_password(self, plain_password, hashed_password):
@@ -58,49 +62,50 @@ class AuthService(BaseService):
         return self.pwd_context.hash(password)
 
     def decode_token(self, token: str) -> dict:
-        logging.debug("Decode token")
+        logger.debug("Decode token")
+        settings = get_settings()
         try:
             result = jwt.decode(
                 token,
                 settings.JWT_SECRET_KEY.get_secret_value(),
                 algorithms=[settings.JWT_ALGORITHM],
             )
-            logging.info("Token decoded")
+            logger.debug("Token decoded")
             return result
         except jwt.exceptions.InvalidSignatureError:
-            logging.error("Invalid token")
+            logger.warning("Invalid token")
             raise HTTPException(status_code=401, detail="Ошибка: Неверная подпись(токен)")
 
     async def register_user(self, data: UserRequest):
-        logging.info(f"Начинаем регистрацию пользователя с почтой: {data.email}")
+        logger.info("Начинаем регистрацию пользователя с почтой: %s", data.email)
 
-        new_user = UserAdd(
-            email=data.email, hashed_password=self.hash_password(data.password), role=Roles.USER
-        )
+        # Argon2 намеренно медленный — считаем хэш в пуле потоков, чтобы не блокировать event loop
+        hashed_password = await run_in_threadpool(self.hash_password, data.password)
+        new_user = UserAdd(email=data.email, hashed_password=hashed_password, role=Roles.USER)
 
         try:
             await self.db.users.add(new_user)
             await self.db.commit()
-            logging.info(f"Пользователь успешно зарегистрировался с почтой={new_user.email}")
+            logger.info("Пользователь успешно зарегистрировался с почтой=%s", new_user.email)
             confirmation_token = self.serializer.dumps(data.email)
-            send_confirmation_email.delay(to_email=data.email, token=confirmation_token)
+            enqueue_confirmation_email(to_email=data.email, token=confirmation_token)
             return {
                 "message": "Вы успешно зарегистрировались! Проверьте почту, чтобы подтвердить свою учетную запись"
             }
         except ObjectAlreadyExistsException:
-            logging.warning(f"Пользователь ввел уже существующую почту, {new_user.email}")
+            logger.warning("Пользователь ввел уже существующую почту, %s", new_user.email)
             raise EmailIsAlreadyRegisteredException
 
     async def login_and_get_access_token(self, data: UserRequest):
-        logging.info(f"Login and get access token for email: {data.email}")
+        logger.info("Login and get access token for email: %s", data.email)
         try:
             user = await self.db.users.get_one(email=data.email)
         except NoResultFound:
-            logging.warning(f"Неверная почта или пароль для пользователя {data.email}")
+            logger.warning("Неверная почта или пароль для пользователя %s", data.email)
             raise LoginErrorException
 
-        if not self.verify_password(data.password, user.hashed_password):
-            logging.warning(f"Неверная почта или пароль для пользователя {data.email}")
+        if not await run_in_threadpool(self.verify_password, data.password, user.hashed_password):
+            logger.warning("Неверная почта или пароль для пользователя %s", data.email)
             raise LoginErrorException
 
         await self.db.users.login_is_active(user.id)
@@ -115,7 +120,7 @@ class AuthService(BaseService):
             }
         )
 
-        logging.info(f"Login successful: {data.email}, user_id={user.id}")
+        logger.info("Login successful: %s", data.email, extra={"user_id": user.id})
         return token
 
     async def get_one_or_none_user(self, user_id: int) -> Optional[User]:
@@ -127,7 +132,7 @@ class AuthService(BaseService):
 
     async def confirm_user(self, token: str) -> None:
         try:
-            email = self.serializer.loads(token, max_age=3600)
+            email = self.serializer.loads(token, max_age=get_settings().CONFIRMATION_TOKEN_MAX_AGE)
         except BadSignature:
             raise
 
@@ -144,7 +149,7 @@ class AuthService(BaseService):
 
         confirmation_token = self.serializer.dumps(new_email)
 
-        send_confirmation_email.delay(to_email=new_email, token=confirmation_token)
+        enqueue_confirmation_email(to_email=new_email, token=confirmation_token)
 
         await self.db.users.change_email(new_email, old_email)
         await self.db.commit()
@@ -152,9 +157,9 @@ class AuthService(BaseService):
     async def change_password(
         self, old_password: str, new_password: str, users_hashed_password: str, user_id: int
     ):
-        if not self.verify_password(old_password, users_hashed_password):
+        if not await run_in_threadpool(self.verify_password, old_password, users_hashed_password):
             raise ValueError("Неверный текущий пароль")
 
-        password = self.hash_password(new_password)
+        password = await run_in_threadpool(self.hash_password, new_password)
         await self.db.users.change_password(password, user_id)
         await self.db.commit()
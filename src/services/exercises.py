@@ -1,3 +1,5 @@
+import datetime
+
 from sqlalchemy.exc import NoResultFound, IntegrityError
 
 from src.exceptions import (
@@ -5,15 +7,47 @@ from src.exceptions import (
     ObjectAlreadyExistsException,
     DataIsEmptyException,
 )
-from src.schemas.exercises import ExerciseAdd, ExerciseUpdate, Category
+from src.schemas.exercises import (
+    ExerciseAdd,
+    ExerciseUpdate,
+    Category,
+    ExerciseChanges,
+    ExerciseTombstoneAdd,
+)
 from src.services.base import BaseService
 
+# updated_at — время начала транзакции (now()), а видны изменения только после коммита:
+# транзакция, начатая до курсора клиента, может закоммититься уже после его запроса. Поэтому
+# окно выборки перекрывает предыдущее на это время, повторно пришедшие записи клиент
+# просто перезаписывает
+EXERCISES_CHANGES_OVERLAP = datetime.timedelta(seconds=5)
+
 
 class ExercisesService(BaseService):
-    async def get_exercises(self):
+    async def get_exercises(self, fields: list[str] | None = None):
+        if fields:
+            return await self.db.exercises.get_filtered_fields(fields)
         exercises = await self.db.exercises.get_all()
         return exercises
 
+    async def get_exercises_by_ids(self, ids: list[int]):
+        # Порядок запроса, без повторов; несуществующие ID пропускаются
+        exercises = {exercise.id: exercise for exercise in await self.db.exercises.get_by_ids(ids)}
+        return [exercises[exercise_id] for exercise_id in dict.fromkeys(ids) if exercise_id in exercises]
+
+    async def get_exercise_changes(self, since: datetime.datetime | None) -> ExerciseChanges:
+        query_since = since - EXERCISES_CHANGES_OVERLAP if since is not None else None
+        changed, last_updated_at = await self.db.exercises.get_updated_since(query_since)
+        tombstones = await self.db.exercise_tombstones.get_deleted_since(query_since)
+
+        candidates = [since, last_updated_at] + [tombstone.deleted_at for tombstone in tombstones]
+        cursor = max((moment for moment in candidates if moment is not None), default=None)
+        return ExerciseChanges(
+            changed=changed,
+            deleted=[tombstone.exercise_id for tombstone in tombstones],
+            cursor=cursor,
+        )
+
     async def get_exercise(self, exercise_id):
         try:
             exercise = await self.db.exercises.get_one(id=exercise_id)
@@ -38,6 +72,7 @@ class ExercisesService(BaseService):
     async def delete_exercise(self, exercise_id: int):
         try:
             await self.db.exercises.delete(id=exercise_id)
+            await self.db.exercise_tombstones.add(ExerciseTombstoneAdd(exercise_id=exercise_id))
             await self.db.commit()
         except NoResultFound:
             raise ObjectNotFoundException
@@ -47,7 +82,7 @@ class ExercisesService(BaseService):
             raise DataIsEmptyException("Поле name или description пусто")
 
         try:
-            await self.get_exercise(exercise_id)
+            existed = await self.get_exercise(exercise_id)
         except ObjectNotFoundException:
             raise
 
@@ -56,6 +91,7 @@ class ExercisesService(BaseService):
 
         try:
             result = await self.db.exercises.update(data, id=exercise_id)
+            await self._refresh_workouts_on_category_change(existed, result)
             await self.db.commit()
             return result
         except IntegrityError:
@@ -68,7 +104,7 @@ class ExercisesService(BaseService):
             raise DataIsEmptyException("Отсутствуют данные для обновления")
 
         try:
-            await self.get_exercise(exercise_id)
+            existed = await self.get_exercise(exercise_id)
         except ObjectNotFoundException:
             raise
 
@@ -78,5 +114,15 @@ class ExercisesService(BaseService):
         data = ExerciseUpdate(**data_dict)
 
         result = await self.db.exercises.update(data, id=exercise_id)
+        await self._refresh_workouts_on_category_change(existed, result)
         await self.db.commit()
         return result
+
+    async def _refresh_workouts_on_category_change(self, existed, updated):
+        # Категория входит в main_categories тренировок с упражнением и в training_rollups:
+        # пересчёт в той же транзакции, в порядке записи тренировки (сводка, лента, агрегаты)
+        if updated.category == existed.category:
+            return
+        await self.db.workouts.refresh_summaries_with_exercise(existed.id)
+        await self.db.workout_changes.record_with_exercise(existed.id)
+        await self.db.training_rollups.refresh_with_exercise(existed.id)
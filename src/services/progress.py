@@ -0,0 +1,136 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+from src.schemas.analytics import E1RMFormula
+
+# Расчёт прогресса по упражнению на массивах NumPy, без циклов по подходам.
+# На вход — столбцы истории (по строке workout_exercises), на выход — столбцы по дням тренировок
+
+# Оценка 1ПМ по подходам с большим числом повторений ненадёжна: такие подходы входят
+# только в объём
+E1RM_MAX_REPS = 12
+PROGRESS_DEFAULT_WINDOW = 5
+PROGRESS_DEFAULT_VOLUME_DAYS = 28
+
+
+@dataclass
+class ExerciseHistory:
+    # Дни от 1970-01-01 по возрастанию, подходы, повторения и вес каждой записи
+    days: np.ndarray
+    sets: np.ndarray
+    reps: np.ndarray
+    weight: np.ndarray
+
+    @classmethod
+    def from_columns(cls, days, sets, reps, weight) -> "ExerciseHistory":
+        # Списки из asyncpg: fromiter с известной длиной быстрее asarray
+        def column(values, dtype):
+            return np.fromiter(values, dtype=dtype, count=len(values))
+
+        return cls(
+            days=column(days, np.int64),
+            sets=column(sets, np.int64),
+            reps=column(reps, np.int64),
+            weight=column(weight, np.float64),
+        )
+
+
+@dataclass
+class ProgressTrend:
+    slope_per_week: float
+    r2: float | None
+
+
+@dataclass
+class ExerciseProgressColumns:
+    days: np.ndarray
+    best_e1rm: np.ndarray
+    e1rm_moving_average: np.ndarray
+    volume: np.ndarray
+    rolling_volume: np.ndarray
+    trend: ProgressTrend | None
+
+
+def estimate_e1rm(weight: np.ndarray, reps: np.ndarray, formula: E1RMFormula) -> np.ndarray:
+    # Для одного повторения 1ПМ — сам вес; подходы больше E1RM_MAX_REPS получают NaN
+    if formula == "epley":
+        e1rm = weight * (1 + reps / 30)
+    else:
+        e1rm = weight * 36 / (37 - np.minimum(reps, 36))
+    e1rm = np.where(reps == 1, weight, e1rm)
+    return np.where(reps <= E1RM_MAX_REPS, e1rm, np.nan)
+
+
+def moving_average(values: np.ndarray, window: int) -> np.ndarray:
+    # Среднее по последним window дням тренировок без NaN; в начале ряда — по имеющимся
+    valid = ~np.isnan(values)
+    sums = np.concatenate(([0.0], np.cumsum(np.where(valid, values, 0.0))))
+    counts = np.concatenate(([0], np.cumsum(valid)))
+    end = np.arange(1, len(values) + 1)
+    start = np.maximum(end - window, 0)
+    window_counts = counts[end] - counts[start]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(window_counts > 0, (sums[end] - sums[start]) / window_counts, np.nan)
+
+
+def rolling_sum(days: np.ndarray, values: np.ndarray, window_days: int) -> np.ndarray:
+    # Сумма за window_days календарных дней, заканчивающихся каждым днём ряда (days отсортированы)
+    sums = np.concatenate(([0.0], np.cumsum(values)))
+    start = np.searchsorted(days, days - window_days + 1, side="left")
+    return sums[np.arange(1, len(days) + 1)] - sums[start]
+
+
+def linear_trend(days: np.ndarray, values: np.ndarray) -> ProgressTrend | None:
+    # Наклон прямой наименьших квадратов по дням с оценкой 1ПМ
+    valid = ~np.isnan(values)
+    x = days[valid].astype(np.float64)
+    y = values[valid]
+    if len(x) < 2:
+        return None
+    dx = x - x.mean()
+    dy = y - y.mean()
+    slope = float(dx @ dy / (dx @ dx))
+    ss_tot = float(dy @ dy)
+    r2 = None
+    if ss_tot > 0:
+        r2 = 1 - float(np.sum((dy - slope * dx) ** 2)) / ss_tot
+    return ProgressTrend(slope_per_week=slope * 7, r2=r2)
+
+
+def compute_progress(
+    history: ExerciseHistory,
+    formula: E1RMFormula = "epley",
+    window: int = PROGRESS_DEFAULT_WINDOW,
+    volume_days: int = PROGRESS_DEFAULT_VOLUME_DAYS,
+) -> ExerciseProgressColumns:
+    if len(history.days) == 0:
+        empty = np.empty(0)
+        return ExerciseProgressColumns(
+            days=np.empty(0, dtype=np.int64),
+            best_e1rm=empty,
+            e1rm_moving_average=empty,
+            volume=empty,
+            rolling_volume=empty,
+            trend=None,
+        )
+
+    e1rm = estimate_e1rm(history.weight, history.reps, formula)
+    volume = history.sets * history.reps * history.weight
+
+    # История отсортирована по дням: записи одного дня идут подряд, границы групп — индексы
+    # первых записей дней, без сортировки как в np.unique
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(history.days)) + 1))
+    days = history.days[starts]
+    # fmax пропускает NaN; день только с многоповторными подходами остаётся NaN
+    best_e1rm = np.fmax.reduceat(e1rm, starts)
+    day_volume = np.add.reduceat(volume, starts)
+
+    return ExerciseProgressColumns(
+        days=days,
+        best_e1rm=best_e1rm,
+        e1rm_moving_average=moving_average(best_e1rm, window),
+        volume=day_volume,
+        rolling_volume=rolling_sum(days, day_volume, volume_days),
+        trend=linear_trend(days, best_e1rm),
+    )
@@ -8,12 +8,17 @@ from src.schemas.workouts import (
     WorkoutRequest,
     WorkoutExerciseAdd,
     WorkoutToResponse,
+    WorkoutBatchItemResult,
+    WorkoutChange,
+    WorkoutChangesPage,
 )
 from src.services.base import BaseService
 
 
 class WorkoutsService(BaseService):
-    async def get_workouts(self, user_id: int):
+    async def get_workouts(self, user_id: int, fields: list[str] | None = None):
+        if fields:
+            return await self.db.workouts.get_filtered_fields(fields, user_id=user_id)
         workouts = await self.db.workouts.get_filtered(user_id=user_id)
         return workouts
 
@@ -24,13 +29,7 @@ class WorkoutsService(BaseService):
             if workout_data.user_id != user_id:
                 raise AccessDeniedException(f"Данная тренировка с ID {workout_id} не принадлежит вам")
             exercises_data = await self.db.workout_exercises.get_filtered(workout_id=workout_id)
-            workout = WorkoutToResponse(
-                id=workout_id,
-                user_id=workout_data.user_id,
-                date=workout_data.date,
-                description=workout_data.description,
-                exercises=exercises_data,
-            )
+            workout = WorkoutToResponse(**workout_data.model_dump(), exercises=exercises_data)
             return workout
         except NoResultFound:
             raise ObjectNotFoundException
@@ -59,9 +58,69 @@ class WorkoutsService(BaseService):
             )
             await self.db.workout_exercises.add(workout_exercise_data)
 
+        [created_workout] = await self.db.workouts.refresh_summaries([created_workout.id])
+        await self.db.workout_changes.record(user_id, [created_workout.id])
+        await self.db.training_rollups.refresh(user_id, [created_workout.date])
         await self.db.commit()
         return created_workout
 
+    async def add_workouts_batch(
+        self, user_id: int, workouts: list[WorkoutRequest]
+    ) -> list[WorkoutBatchItemResult]:
+        # Все упражнения проверяются одним запросом, тренировки и их упражнения вставляются
+        # двумя многострочными INSERT, коммит один. Тренировка с несуществующим упражнением
+        # не добавляется, остальные сохраняются — клиент получает результат по каждой
+        exercise_ids = {exercise.id for workout in workouts for exercise in workout.exercises}
+        existing_ids = await self.db.exercises.get_existing_ids(exercise_ids) if exercise_ids else set()
+
+        results: list[WorkoutBatchItemResult | None] = [None] * len(workouts)
+        valid = []
+        for index, workout in enumerate(workouts):
+            missing = sorted({exercise.id for exercise in workout.exercises} - existing_ids)
+            if missing:
+                results[index] = WorkoutBatchItemResult(
+                    index=index,
+                    status="error",
+                    detail=f"Упражнения с ID {', '.join(map(str, missing))} не найдены",
+                )
+            else:
+                valid.append((index, workout))
+
+        if valid:
+            created_workouts = await self.db.workouts.add_bulk_returning(
+                [
+                    WorkoutAdd(user_id=user_id, date=workout.date, description=workout.description)
+                    for _, workout in valid
+                ]
+            )
+            workout_exercises = [
+                WorkoutExerciseAdd(
+                    workout_id=created.id,
+                    exercise_id=exercise_data.id,
+                    sets=exercise_data.sets,
+                    reps=exercise_data.reps,
+                    weight=exercise_data.weight,
+                )
+                for (_, workout), created in zip(valid, created_workouts)
+                for exercise_data in workout.exercises
+            ]
+            if workout_exercises:
+                await self.db.workout_exercises.add_bulk(workout_exercises)
+            created_ids = [created.id for created in created_workouts]
+            summaries = {
+                workout.id: workout for workout in await self.db.workouts.refresh_summaries(created_ids)
+            }
+            await self.db.workout_changes.record(user_id, created_ids)
+            await self.db.training_rollups.refresh(user_id, [workout.date for _, workout in valid])
+            await self.db.commit()
+
+            for (index, _), created in zip(valid, created_workouts):
+                results[index] = WorkoutBatchItemResult(
+                    index=index, status="created", workout=summaries[created.id]
+                )
+
+        return results
+
     async def add_exercises_to_workout(self, user_id, workout_id, exercise_to_workout):
         workout = await self.db.workouts.get_one_or_none(id=workout_id)
         if workout is None:
@@ -80,6 +139,9 @@ class WorkoutsService(BaseService):
             )
             await self.db.workout_exercises.add(workout_exercise_data)
 
+        await self.db.workouts.refresh_summaries([workout_id])
+        await self.db.workout_changes.record(user_id, [workout_id])
+        await self.db.training_rollups.refresh(user_id, [workout.date])
         await self.db.commit()
 
     async def delete_workout(self, user_id: int, workout_id: int):
@@ -88,6 +150,8 @@ class WorkoutsService(BaseService):
             raise ObjectNotFoundException
         try:
             await self.db.workouts.delete(id=workout_id)
+            await self.db.workout_changes.record(user_id, [workout_id], deleted=True)
+            await self.db.training_rollups.refresh(user_id, [result.date])
             await self.db.commit()
         except NoResultFound:
             raise ObjectNotFoundException
@@ -98,17 +162,21 @@ class WorkoutsService(BaseService):
         data_dict = workout.model_dump(exclude_unset=True) if workout else {}
         if not data_dict:
             raise DataIsEmptyException("Отсутствуют данные для обновления")
-        if workout.description is None and workout.exercises is None or workout.exercises == []:
+        # Меняются только переданные клиентом поля: у date в схеме есть значение по умолчанию,
+        # и без проверки model_fields_set правка описания переносила бы тренировку на сегодня
+        sent = workout.model_fields_set
+        if "date" not in sent and (
+            workout.description is None and workout.exercises is None or workout.exercises == []
+        ):
             raise DataIsEmptyException("Отсутствуют данные для обновления")
         try:
-            existed = await self.get_workout(workout_id)
+            existed = await self.get_workout(user_id, workout_id)
         except ObjectNotFoundException:
             raise
 
         data = WorkoutUpdate(
             user_id=user_id,
-            date=workout.date,
-            description=workout.description,
+            **{field: getattr(workout, field) for field in ("date", "description") if field in sent},
         )
 
         result = await self.db.workouts.update(data, id=workout_id)
@@ -122,5 +190,45 @@ class WorkoutsService(BaseService):
                     weight=exercise_data.weight,
                 )
                 await self.db.workout_exercises.add(workout_exercise_data)
+            [result] = await self.db.workouts.refresh_summaries([workout_id])
+        await self.db.workout_changes.record(user_id, [workout_id])
+        if workout.exercises or result.date != existed.date:
+            # При переносе пересчитываются и старый, и новый периоды
+            await self.db.training_rollups.refresh(user_id, [existed.date, result.date])
         await self.db.commit()
         return result
+
+    async def get_workout_changes(self, user_id: int, since: int, limit: int) -> WorkoutChangesPage:
+        # Страница ленты и данные изменённых тренировок — три запроса независимо от размера истории
+        records = await self.db.workout_changes.get_page(user_id, since, limit + 1)
+        has_more = len(records) > limit
+        records = records[:limit]
+
+        changed_ids = [record.workout_id for record in records if not record.deleted]
+        workouts = {}
+        exercises = {}
+        if changed_ids:
+            workouts = {workout.id: workout for workout in await self.db.workouts.get_by_ids(changed_ids)}
+            for exercise in await self.db.workout_exercises.get_by_workout_ids(changed_ids):
+                exercises.setdefault(exercise.workout_id, []).append(exercise)
+
+        changes = []
+        for record in records:
+            workout = workouts.get(record.workout_id)
+            if record.deleted or workout is None:
+                # Тренировку удалили после записи в ленту: удаление придёт следующим изменением
+                changes.append(WorkoutChange(workout_id=record.workout_id, seq=record.seq, deleted=True))
+                continue
+            changes.append(
+                WorkoutChange(
+                    workout_id=record.workout_id,
+                    seq=record.seq,
+                    deleted=False,
+                    workout=WorkoutToResponse(
+                        **workout.model_dump(), exercises=exercises.get(workout.id, [])
+                    ),
+                )
+            )
+
+        next_since = records[-1].seq if records else since
+        return WorkoutChangesPage(changes=changes, next_since=next_since, has_more=has_more)
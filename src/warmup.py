@@ -0,0 +1,91 @@
+import asyncio
+import logging
+import time
+
+from fastapi import FastAPI
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import NullPool, text
+
+from src.api.exercises import warm_up_exercises_cache
+from src.core.config import settings
+from src.core.db import get_engine, get_async_session_maker
+from src.core.db_manager import DBManager
+
+logger = logging.getLogger(__name__)
+
+
+async def open_pool_connections(count: int) -> int:
+    engine = get_engine()
+    pool = engine.sync_engine.pool
+    if isinstance(pool, NullPool):
+        return 0
+
+    # Больше pool_size открывать бессмысленно: overflow-соединения закрываются при возврате
+    count = min(count, pool.size())
+    connections = await asyncio.gather(*(engine.connect().start() for _ in range(count)))
+    try:
+        await asyncio.gather(*(conn.execute(text("SELECT 1")) for conn in connections))
+    finally:
+        await asyncio.gather(*(conn.close() for conn in connections))
+    return count
+
+
+async def run_hot_queries(db: DBManager) -> None:
+    # Первое выполнение каждого запроса заполняет кэш скомпилированных выражений SQLAlchemy
+    exercises = await db.exercises.get_all()
+    await db.exercises.get_one_or_none(id=0)
+    await db.workouts.get_filtered(user_id=0)
+    await db.workouts.get_one_or_none(id=0, user_id=0)
+    await db.workout_exercises.get_filtered(workout_id=0)
+    await db.users.get_one_or_none(id=0)
+    await db.users.get_one_or_none(email="")
+
+    # Первый вызов jsonable_encoder для схем ответа тоже дороже последующих
+    jsonable_encoder(exercises)
+
+
+async def warm_up() -> None:
+    started_at = time.perf_counter()
+
+    opened = await open_pool_connections(settings.WARMUP_POOL_CONNECTIONS)
+
+    async with DBManager(session_factory=get_async_session_maker()) as db:
+        await run_hot_queries(db)
+        # Загружаем каталог упражнений в кэш тем же путём, что и GET /exercises
+        await warm_up_exercises_cache(db)
+
+    logger.info(
+        "Прогрев завершён за %.3f с, открыто соединений пула: %s",
+        time.perf_counter() - started_at,
+        opened,
+    )
+
+
+async def try_warm_up(app: FastAPI) -> bool:
+    try:
+        await asyncio.wait_for(warm_up(), timeout=settings.WARMUP_TIMEOUT)
+    except Exception as e:
+        # Приложение стартует и без прогрева, но /health/ready отвечает 503 с причиной,
+        # пока прогрев не удастся: инстанс с недоступной БД не получает трафик
+        logger.exception("Ошибка прогрева приложения")
+        app.state.warmup_error = type(e).__name__
+        return False
+    app.state.warmup_error = None
+    app.state.ready = True
+    return True
+
+
+async def run_warm_up(app: FastAPI) -> None:
+    app.state.ready = False
+    app.state.warmup_error = None
+    if not settings.WARMUP_ENABLED:
+        app.state.ready = True
+        return
+    await try_warm_up(app)
+
+
+async def retry_warm_up(app: FastAPI) -> None:
+    # Запускается в фоне после неудачного прогрева при старте и повторяет его до успеха
+    while not app.state.ready:
+        await asyncio.sleep(settings.WARMUP_RETRY_INTERVAL)
+        await try_warm_up(app)
@@ -1,5 +1,6 @@
 #type: noqa: F401
 
+import inspect
 from unittest.mock import patch
 import pytest
 from httpx import ASGITransport, AsyncClient
@@ -11,6 +12,7 @@ from fastapi_cache.backends.inmemory import InMemoryBackend
 from src.main import app
 from src.core.config import settings
 from src.core.db import Base, engine, async_session_maker
+from src.core.loop_monitor import LoopMonitor
 from src.models import (
     ExercisesModel,
     WorkoutsModel,
@@ -20,13 +22,48 @@ from src.models import (
 from src.schemas.users import Roles
 
 
+def pytest_addoption(parser):
+    parser.addoption(
+        "--fail-on-loop-block",
+        action="store_true",
+        help="Падать, если обработчик запроса блокирует event loop дольше порога",
+    )
+    parser.addoption(
+        "--loop-block-threshold",
+        type=float,
+        default=settings.LOOP_BLOCK_THRESHOLD,
+        help="Порог блокировки event loop, секунды",
+    )
+
+
+@pytest.fixture(autouse=True)
+async def loop_block_detector(request):
+    if (
+        not request.config.getoption("--fail-on-loop-block")
+        or not inspect.iscoroutinefunction(request.function)
+        or request.node.get_closest_marker("allow_loop_block")
+    ):
+        yield
+        return
+
+    monitor = LoopMonitor(threshold=request.config.getoption("--loop-block-threshold"))
+    monitor.start()
+    yield
+    await monitor.stop()
+
+    # Блокировки вне запроса (например, синхронный код самого теста) только логируются
+    handler_blocks = [blocked for blocked in monitor.blocks if blocked.route is not None]
+    if handler_blocks:
+        pytest.fail("\n\n".join(blocked.format() for blocked in handler_blocks), pytrace=False)
+
+
 @pytest.fixture(scope="session", autouse=True)
 async def check_test_mode():
     assert settings.MODE == "TEST"
 
 @pytest.fixture
 async def patch_celery_delay():
-    with patch("src.services.auth.send_confirmation_email.delay") as mock_delay:
+    with patch("src.services.auth.enqueue_confirmation_email") as mock_delay:
         mock_delay.return_value = None
         yield mock_delay
 
@@ -54,7 +91,7 @@ async def authenticated_ac():
     client = AsyncClient(transport=ASGITransport(app=app), base_url="http://test")
     email = "testuser@example.com"
     password = "testpassword123"
-    with patch("src.services.auth.send_confirmation_email.delay") as mock_delay:
+    with patch("src.services.auth.enqueue_confirmation_email") as mock_delay:
         mock_delay.return_value = None
         await client.post("/auth/register", json={"email": email, "password": password})
     
@@ -70,7 +107,7 @@ async def admin_ac():
     client = AsyncClient(transport=ASGITransport(app=app), base_url="http://test")
     email = "admin@example.com"
     password = "adminpass123"
-    with patch("src.services.auth.send_confirmation_email.delay") as mock_delay:
+    with patch("src.services.auth.enqueue_confirmation_email") as mock_delay:
         mock_delay.return_value = None
         await client.post("/auth/register", json={"email": email, "password": password})
     
@@ -0,0 +1,151 @@
+import itertools
+
+import pytest
+from sqlalchemy import insert
+
+from src.core.cache import invalidate_exercises_cache
+from src.models import ExercisesModel
+from src.schemas.exercises import Category
+
+# ID вне диапазона последовательности exercises: вставка с явным ID её не сдвигает, и
+# test_exercises.py и test_workouts.py по-прежнему получают свои упражнения с ID 1, 2, 3
+EXERCISE_IDS = itertools.count(10_001)
+
+
+@pytest.fixture
+async def make_exercise(db):
+    async def make(category: Category = Category.CHEST) -> int:
+        exercise_id = next(EXERCISE_IDS)
+        await db.session.execute(
+            insert(ExercisesModel).values(
+                id=exercise_id, name=f"Упражнение аналитики {exercise_id}", category=category
+            )
+        )
+        await db.commit()
+        await invalidate_exercises_cache()
+        return exercise_id
+
+    return make
+
+
+async def test_weekly_volume_follows_workout_changes(authenticated_ac, make_exercise):
+    exercise_id = await make_exercise()
+    # 2025-09-03 и 2025-09-05 — одна неделя с понедельника 2025-09-01
+    params = {"period": "week", "date_from": "2025-09-01", "date_to": "2025-09-07"}
+    before = (await authenticated_ac.get("/analytics/totals", params=params)).json()
+    volume_before = before[0]["volume"] if before else 0
+
+    created = []
+    for date in ("2025-09-03", "2025-09-05"):
+        response = await authenticated_ac.post(
+            "/workouts",
+            json={
+                "date": date,
+                "exercises": [{"id": exercise_id, "sets": 3, "reps": 10, "weight": 50.0}],
+            },
+        )
+        created.append(response.json())
+
+    totals = (await authenticated_ac.get("/analytics/totals", params=params)).json()
+    assert totals[0]["period_start"] == "2025-09-01"
+    assert totals[0]["volume"] == volume_before + 2 * 3 * 10 * 50.0
+
+    volume = (await authenticated_ac.get("/analytics/volume", params=params)).json()
+    assert sum(row["volume"] for row in volume) == totals[0]["volume"]
+    assert all(row["workouts_count"] >= 1 for row in volume)
+
+    for workout in created:
+        await authenticated_ac.delete(f"/workouts/delete/{workout['id']}")
+    totals = (await authenticated_ac.get("/analytics/totals", params=params)).json()
+    assert (totals[0]["volume"] if totals else 0) == volume_before
+
+
+async def test_invalid_range(authenticated_ac):
+    response = await authenticated_ac.get(
+        "/analytics/volume", params={"date_from": "2025-09-07", "date_to": "2025-09-01"}
+    )
+    assert response.status_code == 422
+
+
+async def test_exercise_progress(authenticated_ac, make_exercise):
+    exercise_id = await make_exercise()
+    for date, weight in (("2024-03-04", 60.0), ("2024-03-11", 65.0)):
+        await authenticated_ac.post(
+            "/workouts",
+            json={
+                "date": date,
+                "exercises": [{"id": exercise_id, "sets": 3, "reps": 5, "weight": weight}],
+            },
+        )
+
+    response = await authenticated_ac.get(f"/analytics/progress/{exercise_id}", params={"window": 2})
+
+    assert response.status_code == 200
+    progress = response.json()
+    assert progress["records_count"] == 2
+    assert progress["dates"] == ["2024-03-04", "2024-03-11"]
+    columns = ("best_e1rm", "e1rm_moving_average", "volume", "rolling_volume")
+    assert all(len(progress[column]) == len(progress["dates"]) for column in columns)
+    assert progress["trend"] is not None
+
+
+async def test_exercise_progress_unknown_exercise(authenticated_ac):
+    response = await authenticated_ac.get("/analytics/progress/999999")
+    assert response.status_code == 404
+
+
+async def test_edit_workout_moves_volume_between_weeks(authenticated_ac, make_exercise):
+    async def week_volume(week_start: str) -> float:
+        params = {"period": "week", "date_from": week_start, "date_to": week_start}
+        rows = (await authenticated_ac.get("/analytics/volume", params=params)).json()
+        return sum(row["volume"] for row in rows)
+
+    exercise_id = await make_exercise()
+    old_week, new_week = "2025-10-06", "2025-10-20"
+    created = await authenticated_ac.post(
+        "/workouts",
+        json={
+            "date": "2025-10-08",
+            "exercises": [{"id": exercise_id, "sets": 2, "reps": 10, "weight": 40.0}],
+        },
+    )
+    workout_id = created.json()["id"]
+    old_before, new_before = await week_volume(old_week), await week_volume(new_week)
+
+    # Правка только описания дату не меняет
+    edited = await authenticated_ac.patch(
+        f"/workouts/edit/{workout_id}", json={"description": "Только описание"}
+    )
+    assert edited.json()["message"]["date"] == "2025-10-08"
+    assert await week_volume(old_week) == old_before
+
+    await authenticated_ac.patch(f"/workouts/edit/{workout_id}", json={"date": "2025-10-22"})
+
+    assert await week_volume(old_week) == old_before - 2 * 10 * 40.0
+    assert await week_volume(new_week) == new_before + 2 * 10 * 40.0
+
+
+async def test_exercise_category_change_moves_volume(authenticated_ac, admin_ac, make_exercise):
+    exercise_id = await make_exercise(Category.CHEST)
+    created = await authenticated_ac.post(
+        "/workouts",
+        json={
+            "date": "2023-05-10",
+            "exercises": [{"id": exercise_id, "sets": 3, "reps": 8, "weight": 30.0}],
+        },
+    )
+    workout_id = created.json()["id"]
+    params = {"period": "day", "date_from": "2023-05-10", "date_to": "2023-05-10"}
+
+    response = await admin_ac.patch(
+        f"/exercises/{exercise_id}?category=shoulders",
+        json={"name": "Жим гантелей под углом", "description": "Упражнение на плечи"},
+    )
+    assert response.status_code == 200
+
+    volume = (await authenticated_ac.get("/analytics/volume", params=params)).json()
+    by_category = {row["category"]: row["volume"] for row in volume}
+    assert by_category.get("shoulders") == 3 * 8 * 30.0
+    assert "chest" not in by_category
+    workout = (await authenticated_ac.get(f"/workouts/get/{workout_id}")).json()
+    assert workout["main_categories"] == ["shoulders"]
@@ -1,5 +1,9 @@
+import datetime
+
 import pytest
 
+from src.core.cache import invalidate_exercises_cache
+
 @pytest.mark.parametrize(
         "name, description, category, status_code", [
             ("Приседания", "Базовое упражнение приседания", "legs", 200),
@@ -165,4 +169,114 @@ async def test_partially_update_exercise_no_admin(authenticated_ac):
         },
     )
     assert response.status_code == 403
-    assert response.json()["detail"] == "Вы не админ"
\ No newline at end of file
+    assert response.json()["detail"] == "Вы не админ"
+
+async def test_profile_request(admin_ac):
+    response = await admin_ac.get("/exercises", headers={"X-Profile": "speedscope"})
+
+    assert response.status_code == 200
+    payload = response.json()
+    assert payload["request"]["status_code"] == 200
+    assert payload["profile"]["profiles"][0]["type"] == "sampled"
+    assert isinstance(payload["sql"], list)
+
+
+async def test_profile_request_requires_admin(authenticated_ac):
+    response = await authenticated_ac.get("/exercises", headers={"X-Profile": "collapsed"})
+
+    assert response.status_code == 403
+
+
+async def test_get_exercises_serialized_cache(admin_ac):
+    first = await admin_ac.get("/exercises", headers={"Accept-Encoding": "gzip"})
+    second = await admin_ac.get("/exercises", headers={"Accept-Encoding": "gzip"})
+
+    assert second.status_code == 200
+    assert second.headers["x-fastapi-cache"] == "HIT"
+    assert second.headers["content-encoding"] == "gzip"
+    assert second.json() == first.json()
+
+    not_modified = await admin_ac.get(
+        "/exercises",
+        headers={"Accept-Encoding": "gzip", "If-None-Match": second.headers["etag"]},
+    )
+    assert not_modified.status_code == 304
+
+    weak_not_modified = await admin_ac.get(
+        "/exercises",
+        headers={"Accept-Encoding": "gzip", "If-None-Match": f'"0", W/{second.headers["etag"]}'},
+    )
+    assert weak_not_modified.status_code == 304
+
+    await admin_ac.post(
+        "/exercises?category=abs",
+        json={"name": "Скручивания", "description": "Упражнение для пресса"},
+    )
+    changed = await admin_ac.get("/exercises", headers={"Accept-Encoding": "identity"})
+    assert changed.headers["x-fastapi-cache"] == "MISS"
+    assert changed.headers["etag"].split("-")[0] != second.headers["etag"].split("-")[0]
+    assert "Скручивания" in [exercise["name"] for exercise in changed.json()]
+
+
+async def test_get_exercises_by_ids(admin_ac):
+    # Первый запрос — из БД, второй — из прогретого каталога
+    await invalidate_exercises_cache()
+    cold = await admin_ac.get("/exercises?ids=2&ids=1&ids=100500")
+    await admin_ac.get("/exercises")
+    warm = await admin_ac.get("/exercises?ids=2&ids=1&ids=100500")
+
+    assert cold.status_code == warm.status_code == 200
+    assert [exercise["id"] for exercise in cold.json()] == [2, 1]
+    assert warm.json() == cold.json()
+
+
+async def test_get_exercises_by_ids_limit(admin_ac):
+    query = "&".join(f"ids={i}" for i in range(1, 102))
+    response = await admin_ac.get(f"/exercises?{query}")
+    assert response.status_code == 422
+
+
+async def test_get_exercises_fields(admin_ac):
+    full = await admin_ac.get("/exercises")
+    expected = [{"name": e["name"], "id": e["id"]} for e in full.json()]
+
+    await invalidate_exercises_cache()
+    cold = await admin_ac.get("/exercises?fields=id,name")
+    await admin_ac.get("/exercises")
+    warm = await admin_ac.get("/exercises?fields=id,name")
+
+    assert cold.status_code == warm.status_code == 200
+    assert sorted(cold.json(), key=lambda e: e["id"]) == sorted(expected, key=lambda e: e["id"])
+    assert sorted(warm.json(), key=lambda e: e["id"]) == sorted(expected, key=lambda e: e["id"])
+
+    by_ids = await admin_ac.get("/exercises?ids=2&ids=1&fields=category")
+    assert [set(e) for e in by_ids.json()] == [{"category"}, {"category"}]
+
+
+@pytest.mark.parametrize("fields", ["id,password", "", ","])
+async def test_get_exercises_invalid_fields(admin_ac, fields):
+    response = await admin_ac.get(f"/exercises?fields={fields}")
+    assert response.status_code == 422
+
+
+async def test_get_exercise_changes(admin_ac):
+    full = await admin_ac.get("/exercises/changes")
+    assert full.status_code == 200
+    catalog = await admin_ac.get("/exercises")
+    assert sorted(e["id"] for e in full.json()["changed"]) == sorted(e["id"] for e in catalog.json())
+
+    cursor = full.json()["cursor"]
+    await admin_ac.patch("/exercises/1", json={"name": "Выпады вперед", "description": "Новое описание"})
+    created = await admin_ac.post(
+        "/exercises?category=cardio", json={"name": "Берпи", "description": "Кардио упражнение"}
+    )
+    await admin_ac.delete(f"/exercises/{created.json()['id']}")
+
+    changes = await admin_ac.get("/exercises/changes", params={"since": cursor})
+
+    assert changes.status_code == 200
+    data = changes.json()
+    assert 1 in [e["id"] for e in data["changed"]]
+    assert created.json()["id"] not in [e["id"] for e in data["changed"]]
+    assert created.json()["id"] in data["deleted"]
+    assert datetime.datetime.fromisoformat(data["cursor"]) > datetime.datetime.fromisoformat(cursor)
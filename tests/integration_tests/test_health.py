@@ -0,0 +1,22 @@
+from src.main import app
+
+
+async def test_live(ac):
+    response = await ac.get("/health/live")
+    assert response.status_code == 200
+
+
+async def test_ready(ac):
+    app.state.ready = False
+    response = await ac.get("/health/ready")
+    assert response.status_code == 503
+
+    app.state.warmup_error = "ConnectionError"
+    response = await ac.get("/health/ready")
+    assert response.status_code == 503
+    assert response.json() == {"status": "warmup_failed", "error": "ConnectionError"}
+
+    app.state.ready = True
+    app.state.warmup_error = None
+    response = await ac.get("/health/ready")
+    assert response.status_code == 200
@@ -0,0 +1,13 @@
+from unittest.mock import patch
+
+
+async def test_metrics(ac):
+    await ac.get("/health/live")
+
+    with patch("src.api.metrics.refresh_queue_lengths") as mock_refresh:
+        response = await ac.get("/metrics")
+
+    mock_refresh.assert_called_once()
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert 'http_requests_total{method="GET",route="/health/live",status="200"}' in response.text
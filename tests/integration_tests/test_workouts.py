@@ -23,3 +23,152 @@ async def test_add_workout(authenticated_ac, date, description, exercise, status
         data = response.json()
         assert data["date"] == date
         assert data["description"] == description
+
+
+async def test_add_workouts_batch(authenticated_ac):
+    response = await authenticated_ac.post(
+        "/workouts/batch",
+        json={
+            "workouts": [
+                {
+                    "date": "2025-06-01",
+                    "description": "Пакетная тренировка",
+                    "exercises": [
+                        {"id": 1, "sets": 3, "reps": 12, "weight": 50.0},
+                        {"id": 2, "sets": 4, "reps": 10, "weight": 30.0},
+                    ],
+                },
+                {
+                    "date": "2025-06-02",
+                    "exercises": [{"id": 100500, "sets": 3, "reps": 12, "weight": 50.0}],
+                },
+                {
+                    "date": "2025-06-03",
+                    "exercises": [{"id": 3, "sets": 5, "reps": 8, "weight": 20.0}],
+                },
+            ]
+        },
+    )
+
+    assert response.status_code == 200
+    results = response.json()
+    assert [r["status"] for r in results] == ["created", "error", "created"]
+    assert results[0]["workout"]["date"] == "2025-06-01"
+    assert results[2]["workout"]["id"] > results[0]["workout"]["id"]
+
+    workout = await authenticated_ac.get(f"/workouts/get/{results[0]['workout']['id']}")
+    assert workout.status_code == 200
+    assert len(workout.json()["exercises"]) == 2
+
+
+async def test_add_workouts_batch_empty(authenticated_ac):
+    response = await authenticated_ac.post("/workouts/batch", json={"workouts": []})
+    assert response.status_code == 422
+
+
+async def test_get_workouts_fields(authenticated_ac):
+    full = await authenticated_ac.get("/workouts")
+    response = await authenticated_ac.get("/workouts?fields=date,id")
+
+    assert response.status_code == 200
+    expected = [{"date": w["date"], "id": w["id"]} for w in full.json()]
+    assert sorted(response.json(), key=lambda w: w["id"]) == sorted(expected, key=lambda w: w["id"])
+
+
+async def test_get_workouts_invalid_fields(authenticated_ac):
+    response = await authenticated_ac.get("/workouts?fields=id,exercises")
+    assert response.status_code == 422
+
+
+async def test_get_workout_changes(authenticated_ac):
+    workout = {"date": "2025-07-01", "exercises": [{"id": 1, "sets": 3, "reps": 12, "weight": 50.0}]}
+    first = await authenticated_ac.post("/workouts", json=workout)
+    second = await authenticated_ac.post("/workouts", json=workout)
+
+    # Постраничный обход всей ленты
+    since, changes = 0, []
+    while True:
+        page = (await authenticated_ac.get("/workouts/changes", params={"since": since, "limit": 2})).json()
+        changes += page["changes"]
+        since = page["next_since"]
+        if not page["has_more"]:
+            break
+    seqs = [change["seq"] for change in changes]
+    assert seqs == sorted(seqs)
+    assert {first.json()["id"], second.json()["id"]} <= {change["workout_id"] for change in changes}
+
+    await authenticated_ac.delete(f"/workouts/delete/{first.json()['id']}")
+    page = (await authenticated_ac.get("/workouts/changes", params={"since": since})).json()
+
+    assert page["changes"] == [
+        {"workout_id": first.json()["id"], "seq": page["next_since"], "deleted": True, "workout": None}
+    ]
+    assert page["has_more"] is False
+
+
+async def test_workout_summary(authenticated_ac):
+    created = await authenticated_ac.post(
+        "/workouts",
+        json={
+            "date": "2025-08-01",
+            "exercises": [
+                {"id": 1, "sets": 3, "reps": 10, "weight": 50.0},
+                {"id": 2, "sets": 2, "reps": 5, "weight": 20.0},
+            ],
+        },
+    )
+    workout = created.json()
+    assert workout["total_volume"] == 3 * 10 * 50.0 + 2 * 5 * 20.0
+    assert workout["exercises_count"] == 2
+    assert 1 <= len(workout["main_categories"]) <= 2
+
+    await authenticated_ac.patch(
+        f"/workouts/{workout['id']}", json=[{"id": 3, "sets": 1, "reps": 1, "weight": 100.0}]
+    )
+    workouts = (await authenticated_ac.get("/workouts")).json()
+    updated = next(w for w in workouts if w["id"] == workout["id"])
+    assert updated["total_volume"] == workout["total_volume"] + 100.0
+    assert updated["exercises_count"] == 3
+
+
+async def test_edit_workout_refreshes_summary(authenticated_ac):
+    created = await authenticated_ac.post(
+        "/workouts",
+        json={"date": "2025-08-10", "exercises": [{"id": 1, "sets": 3, "reps": 10, "weight": 50.0}]},
+    )
+    workout = created.json()
+
+    response = await authenticated_ac.patch(
+        f"/workouts/edit/{workout['id']}",
+        json={"exercises": [{"id": 2, "sets": 2, "reps": 5, "weight": 20.0}]},
+    )
+
+    assert response.status_code == 200
+    edited = response.json()["message"]
+    assert edited["total_volume"] == 3 * 10 * 50.0 + 2 * 5 * 20.0
+    assert edited["exercises_count"] == 2
+
+
+async def test_edit_workout_appears_in_changes(authenticated_ac):
+    created = await authenticated_ac.post(
+        "/workouts",
+        json={"date": "2025-08-12", "exercises": [{"id": 1, "sets": 3, "reps": 10, "weight": 50.0}]},
+    )
+    workout_id = created.json()["id"]
+    since = (await authenticated_ac.get("/workouts/changes", params={"since": 0, "limit": 500})).json()
+    while since["has_more"]:
+        since = (
+            await authenticated_ac.get(
+                "/workouts/changes", params={"since": since["next_since"], "limit": 500}
+            )
+        ).json()
+
+    await authenticated_ac.patch(
+        f"/workouts/edit/{workout_id}", json={"description": "Изменённое описание"}
+    )
+    page = (
+        await authenticated_ac.get("/workouts/changes", params={"since": since["next_since"]})
+    ).json()
+
+    assert [change["workout_id"] for change in page["changes"]] == [workout_id]
+    assert page["changes"][0]["workout"]["description"] == "Изменённое описание"
@@ -0,0 +1,112 @@
+import datetime
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from src.exceptions import ObjectNotFoundException, ValidationServiceError
+from src.repositories.analytics import TrainingRollupsRepository
+from src.repositories.queries import period_starts
+from src.schemas.analytics import ANALYTICS_MAX_RANGE_DAYS, TrainingTotals
+from src.schemas.exercises import Category
+from src.services.analytics import AnalyticsService
+from tests.unit_tests.base_test import BaseTestService
+
+
+def test_week_starts_on_monday():
+    dates = [datetime.date(2026, 10, 19), datetime.date(2026, 10, 25), datetime.date(2026, 10, 26)]
+
+    assert period_starts("week", dates) == [datetime.date(2026, 10, 19), datetime.date(2026, 10, 26)]
+    assert period_starts("day", dates + dates[:1]) == dates
+
+
+async def test_refresh_recomputes_only_touched_periods():
+    session = MagicMock()
+    session.execute = AsyncMock()
+    repository = TrainingRollupsRepository(session)
+
+    await repository.refresh(7, [datetime.date(2026, 10, 21), datetime.date(2026, 10, 1)])
+
+    # Для дня и недели — DELETE затронутых периодов и INSERT ... SELECT их агрегатов
+    statements = [call.args[0] for call in session.execute.call_args_list]
+    assert len(statements) == 4
+    day_delete, day_insert, week_delete, week_insert = [
+        statement.compile(dialect=postgresql.dialect()) for statement in statements
+    ]
+    assert day_delete.params["starts"] == [datetime.date(2026, 10, 1), datetime.date(2026, 10, 21)]
+    assert week_delete.params["starts"] == [datetime.date(2026, 9, 28), datetime.date(2026, 10, 19)]
+    assert week_insert.params["starts"] == week_delete.params["starts"]
+    assert "INSERT INTO training_rollups" in str(week_insert)
+    assert "date_trunc" in str(week_insert)
+    # Выборка ограничена датами затронутых недель
+    assert datetime.date(2026, 9, 28) in week_insert.params.values()
+    assert datetime.date(2026, 10, 26) in week_insert.params.values()
+    assert "date_trunc" not in str(day_insert)
+
+
+class TestAnalyticsService(BaseTestService):
+    def setup_method(self):
+        super().setup_method()
+        self.service = AnalyticsService(db=self.mock_db)
+
+    async def test_get_volume_default_range(self):
+        self.mock_db.training_rollups.get_range = AsyncMock(return_value=[])
+        today = datetime.date.today()
+
+        await self.service.get_volume(1, "week", category=Category.LEGS)
+
+        self.mock_db.training_rollups.get_range.assert_called_once_with(
+            1, "week", today - datetime.timedelta(days=7 * 12), today, Category.LEGS
+        )
+
+    async def test_get_totals(self):
+        row = {"period_start": datetime.date(2026, 10, 19), "volume": 1500.0, "sets": 5, "reps": 50}
+        self.mock_db.training_rollups.get_totals = AsyncMock(return_value=[row])
+
+        result = await self.service.get_totals(
+            1, "day", datetime.date(2026, 10, 1), datetime.date(2026, 10, 19)
+        )
+
+        assert result == [TrainingTotals(**row)]
+
+    @pytest.mark.parametrize(
+        "date_from,date_to",
+        [
+            (datetime.date(2026, 10, 20), datetime.date(2026, 10, 19)),
+            (
+                datetime.date(2026, 10, 19) - datetime.timedelta(days=ANALYTICS_MAX_RANGE_DAYS + 1),
+                datetime.date(2026, 10, 19),
+            ),
+        ],
+    )
+    async def test_invalid_range(self, date_from, date_to):
+        self.mock_db.training_rollups.get_range = AsyncMock()
+
+        with pytest.raises(ValidationServiceError):
+            await self.service.get_volume(1, "day", date_from, date_to)
+
+        self.mock_db.training_rollups.get_range.assert_not_called()
+
+    async def test_get_exercise_progress(self):
+        self.mock_db.exercises.get_one_or_none = AsyncMock(return_value=object())
+        self.mock_db.workout_exercises.get_exercise_history = AsyncMock(
+            return_value=([20000, 20000, 20007], [3, 1, 3], [5, 1, 5], [100.0, 120.0, 105.0])
+        )
+
+        result = await self.service.get_exercise_progress(1, 2, "epley", window=2, volume_days=7)
+
+        self.mock_db.workout_exercises.get_exercise_history.assert_called_once_with(1, 2)
+        assert result["records_count"] == 3
+        assert result["dates"] == ["2024-10-04", "2024-10-11"]
+        assert result["best_e1rm"].tolist() == [120.0, 122.5]
+        assert result["e1rm_moving_average"].tolist() == [120.0, 121.25]
+        assert result["trend"] == {"slope_per_week": 2.5, "r2": 1.0}
+
+    async def test_get_exercise_progress_not_found(self):
+        self.mock_db.exercises.get_one_or_none = AsyncMock(return_value=None)
+        self.mock_db.workout_exercises.get_exercise_history = AsyncMock()
+
+        with pytest.raises(ObjectNotFoundException):
+            await self.service.get_exercise_progress(1, 999)
+
+        self.mock_db.workout_exercises.get_exercise_history.assert_not_called()
@@ -95,7 +95,7 @@ class TestAuthService(BaseTestService):
     async def test_register_user_success(self):
         data = UserRequest(email="test@example.com", password="123456")
 
-        with patch("src.core.tasks.send_confirmation_email.delay") as mock_email_delay:
+        with patch("src.services.auth.enqueue_confirmation_email") as mock_email_delay:
             result = await self.service.register_user(data)
 
         self.mock_db.users.add.assert_called_once()
@@ -236,7 +236,7 @@ class TestAuthService(BaseTestService):
 
         self.mock_db.users.get_one_or_none = AsyncMock(return_value=None)
 
-        with patch("src.core.tasks.send_confirmation_email.delay") as mock_email_delay:
+        with patch("src.services.auth.enqueue_confirmation_email") as mock_email_delay:
             await self.service.change_email(new_email, old_email)
 
         self.mock_db.users.get_one_or_none.assert_called_once_with(email=new_email)
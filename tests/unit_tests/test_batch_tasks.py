@@ -0,0 +1,91 @@
+import subprocess
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from sqlalchemy.dialects import postgresql
+
+from src.core.batch_tasks import (
+    backfill_workout_summaries,
+    cleanup_unverified_users,
+    rebuild_training_rollups,
+)
+
+ROOT = Path(__file__).resolve().parents[2]
+
+
+def make_session(batches: list[list[int]]) -> MagicMock:
+    session = MagicMock()
+    session.__enter__.return_value = session
+    session.scalars.return_value.all.side_effect = batches
+    session.execute.side_effect = [MagicMock(rowcount=len(batch)) for batch in batches if batch]
+    return session
+
+
+def test_cleanup_unverified_users_deletes_in_batches():
+    session = make_session([[1, 2], [5, 8], [9]])
+
+    with patch("src.core.batch_tasks.get_sync_session_maker", return_value=lambda: session):
+        deleted = cleanup_unverified_users(batch_size=2)
+
+    assert deleted == 5
+    # Каждая пачка удаляется в своей транзакции
+    assert session.begin.call_count == 3
+    assert session.execute.call_count == 3
+
+
+def test_cleanup_unverified_users_keyset_iteration():
+    session = make_session([[1, 2], [5, 8], []])
+
+    with patch("src.core.batch_tasks.get_sync_session_maker", return_value=lambda: session):
+        deleted = cleanup_unverified_users(batch_size=2)
+
+    assert deleted == 4
+    last_select = session.scalars.call_args_list[-1][0][0]
+    assert last_select.compile().params["id_1"] == 8
+    assert session.execute.call_count == 2
+
+
+def test_backfill_workout_summaries_in_batches():
+    session = make_session([[1, 2], [3, 7], [9]])
+
+    with patch("src.core.batch_tasks.get_sync_session_maker", return_value=lambda: session):
+        updated = backfill_workout_summaries(batch_size=2)
+
+    assert updated == 5
+    assert session.begin.call_count == 3
+    last_update = session.execute.call_args_list[-1][0][0]
+    assert last_update.compile(dialect=postgresql.dialect()).params["ids"] == [9]
+
+
+def test_rebuild_training_rollups_in_batches():
+    session = MagicMock()
+    session.__enter__.return_value = session
+    session.scalars.return_value.all.side_effect = [[1, 4], [6]]
+
+    with patch("src.core.batch_tasks.get_sync_session_maker", return_value=lambda: session):
+        rebuilt = rebuild_training_rollups(batch_size=2)
+
+    assert rebuilt == 3
+    assert session.begin.call_count == 2
+    # На пачку: блокировка счётчиков, DELETE агрегатов, INSERT для дня и недели
+    statements = [
+        call[0][0].compile(dialect=postgresql.dialect()) for call in session.execute.call_args_list
+    ]
+    assert len(statements) == 8
+    first_delete, last_delete = statements[1], statements[5]
+    assert sorted(first_delete.params.values()) == [0, 4]
+    # Последняя пачка очищает агрегаты до конца таблицы
+    assert list(last_delete.params.values()) == [4]
+    assert statements[7].params["ids"] == [6]
+    assert "FOR UPDATE" in str(statements[4])
+
+
+def test_batch_tasks_do_not_import_asyncpg():
+    # Воркер batch работает через psycopg2; построители SQL берутся из src.repositories.queries,
+    # а не из асинхронных репозиториев
+    code = "import sys, src.core.batch_tasks\nprint('asyncpg' in sys.modules)"
+    result = subprocess.run(
+        [sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == "False"
@@ -0,0 +1,121 @@
+import gzip
+from unittest.mock import patch
+
+from fastapi_cache import FastAPICache
+
+from src.core.cache import (
+    get_catalog_index,
+    get_or_build_catalog,
+    invalidate_exercises_cache,
+    request_key_builder,
+)
+
+
+async def get_items(db, category=None):
+    return []
+
+
+def test_request_key_builder_ignores_db():
+    first = request_key_builder(get_items, "ns", args=(), kwargs={"db": object()})
+    second = request_key_builder(get_items, "ns", args=(), kwargs={"db": object()})
+    assert first == second
+    assert first.startswith("ns:")
+
+
+def test_request_key_builder_depends_on_params():
+    first = request_key_builder(get_items, "ns", args=(), kwargs={"db": object(), "category": "legs"})
+    second = request_key_builder(get_items, "ns", args=(), kwargs={"db": object(), "category": "abs"})
+    assert first != second
+
+
+CATALOG = b'[{"name":"\xd0\x91\xd0\xb5\xd0\xb3","description":null,"category":"cardio","id":1}]'
+
+
+class CatalogBuilder:
+    def __init__(self, body: bytes = CATALOG):
+        self.body = body
+        self.calls = 0
+
+    async def __call__(self) -> bytes:
+        self.calls += 1
+        return self.body
+
+
+async def test_catalog_hit_after_miss():
+    await invalidate_exercises_cache()
+    build = CatalogBuilder()
+
+    first = await get_or_build_catalog("identity", build, with_gzip=True)
+    second = await get_or_build_catalog("identity", build, with_gzip=True)
+    compressed = await get_or_build_catalog("gzip", build, with_gzip=True)
+
+    assert build.calls == 1
+    assert (first.hit, second.hit, compressed.hit) == (False, True, True)
+    assert first.body == second.body == CATALOG
+    assert gzip.decompress(compressed.body) == CATALOG
+    assert first.version == second.version == compressed.version
+
+
+async def test_catalog_invalidation_changes_version():
+    await invalidate_exercises_cache()
+    first = await get_or_build_catalog("identity", CatalogBuilder(), with_gzip=True)
+
+    await invalidate_exercises_cache()
+    build = CatalogBuilder(b"[]")
+    second = await get_or_build_catalog("identity", build, with_gzip=True)
+
+    assert build.calls == 1
+    assert second.hit is False
+    assert second.body == b"[]"
+    assert second.version != first.version
+
+
+async def test_catalog_without_gzip_serves_identity():
+    await invalidate_exercises_cache()
+    catalog = await get_or_build_catalog("gzip", CatalogBuilder(), with_gzip=False)
+    assert catalog.encoding == "identity"
+    assert catalog.body == CATALOG
+
+
+async def test_catalog_backend_error_falls_back_to_build():
+    build = CatalogBuilder()
+    with patch.object(FastAPICache.get_backend(), "get", side_effect=ConnectionError):
+        catalog = await get_or_build_catalog("identity", build, with_gzip=True)
+    assert build.calls == 1
+    assert catalog.hit is False
+    assert catalog.version == ""
+    assert catalog.body == CATALOG
+
+
+class CatalogParser:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, body: bytes) -> bytes:
+        self.calls += 1
+        return body
+
+
+async def test_catalog_index_cold_cache():
+    await invalidate_exercises_cache()
+    assert await get_catalog_index(CatalogParser()) is None
+
+
+async def test_catalog_index_parsed_once_per_version():
+    await invalidate_exercises_cache()
+    await get_or_build_catalog("identity", CatalogBuilder(), with_gzip=False)
+    parse = CatalogParser()
+
+    assert await get_catalog_index(parse) == CATALOG
+    assert await get_catalog_index(parse) == CATALOG
+    assert parse.calls == 1
+
+    await invalidate_exercises_cache()
+    await get_or_build_catalog("identity", CatalogBuilder(b"[]"), with_gzip=False)
+    assert await get_catalog_index(parse) == b"[]"
+    assert parse.calls == 2
+
+
+async def test_catalog_index_backend_error():
+    with patch.object(FastAPICache.get_backend(), "get", side_effect=ConnectionError):
+        assert await get_catalog_index(CatalogParser()) is None
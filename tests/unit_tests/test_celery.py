@@ -0,0 +1,102 @@
+import subprocess
+import sys
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from prometheus_client import REGISTRY
+
+from src.core.celery_config import celery_app, EMAIL_QUEUE, BATCH_QUEUE, DEFAULT_QUEUE
+from src.core.celery_metrics import ENQUEUED_AT_HEADER
+from src.core.tasks import enqueue_confirmation_email, send_confirmation_email
+
+ROOT = Path(__file__).resolve().parents[2]
+
+
+@pytest.mark.parametrize(
+    "task_name, queue",
+    [
+        ("src.core.tasks.send_confirmation_email", EMAIL_QUEUE),
+        ("src.core.batch_tasks.some_heavy_task", BATCH_QUEUE),
+        ("src.core.tasks.unknown_task", DEFAULT_QUEUE),
+    ],
+)
+def test_task_routing(task_name, queue):
+    route = celery_app.amqp.router.route({}, task_name)
+    assert route["queue"].name == queue
+
+
+def test_results_are_ignored_by_default():
+    assert celery_app.conf.task_ignore_result is True
+    assert send_confirmation_email.ignore_result is True
+
+
+def test_task_modules_import_without_settings_and_app():
+    # Веб-процесс импортирует задачи через src.services.auth: ни настройки, ни приложение
+    # Celery при этом не создаются. Отдельный процесс — в этом кэши уже заполнены
+    code = (
+        "import src.services.auth, src.core.batch_tasks\n"
+        "from src.core.celery_config import get_celery_app\n"
+        "from src.core.config import get_settings\n"
+        "print(get_celery_app.cache_info().currsize, get_settings.cache_info().currsize)"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    assert result.stdout.split() == ["0", "0"]
+
+
+def test_enqueue_confirmation_email_resolves_app():
+    with patch("src.core.tasks.get_celery_app") as mock_get_app, \
+            patch("src.core.tasks.send_confirmation_email") as mock_task:
+        enqueue_confirmation_email(to_email="test@example.com", token="TOK123")
+
+    mock_get_app.assert_called_once()
+    mock_task.delay.assert_called_once_with(to_email="test@example.com", token="TOK123")
+
+
+@pytest.fixture
+def eager_celery():
+    celery_app.conf.task_always_eager = True
+    yield celery_app
+    celery_app.conf.task_always_eager = False
+
+
+def get_sample(name: str, labels: dict) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+def test_task_metrics_success(eager_celery):
+    task_name = send_confirmation_email.name
+    runs_before = get_sample(
+        "celery_task_duration_seconds_count", {"task": task_name, "state": "SUCCESS"}
+    )
+    waits_before = get_sample("celery_task_queue_wait_seconds_count", {"task": task_name})
+
+    with patch("src.core.tasks.smtplib.SMTP"):
+        send_confirmation_email.apply(
+            kwargs={"to_email": "test@example.com", "token": "TOK123"},
+            headers={ENQUEUED_AT_HEADER: time.time() - 2},
+        )
+
+    assert get_sample(
+        "celery_task_duration_seconds_count", {"task": task_name, "state": "SUCCESS"}
+    ) == runs_before + 1
+    assert get_sample("celery_task_queue_wait_seconds_count", {"task": task_name}) == waits_before + 1
+    assert get_sample("celery_task_queue_wait_seconds_sum", {"task": task_name}) >= 2
+
+
+def test_task_metrics_failure(eager_celery):
+    task_name = send_confirmation_email.name
+    labels = {"task": task_name, "exception": "ConnectionRefusedError"}
+    failures_before = get_sample("celery_task_failures_total", labels)
+
+    with patch("src.core.tasks.smtplib.SMTP", side_effect=ConnectionRefusedError):
+        result = send_confirmation_email.delay(to_email="test@example.com", token="TOK123")
+
+    assert result.failed()
+    assert get_sample("celery_task_failures_total", labels) == failures_before + 1
+    assert get_sample(
+        "celery_task_duration_seconds_count", {"task": task_name, "state": "FAILURE"}
+    ) >= 1
@@ -0,0 +1,194 @@
+import asyncio
+import gzip
+import os
+
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, PlainTextResponse, Response, StreamingResponse
+from starlette.routing import Mount, Route
+
+from src.core.compression import (
+    CompressionMiddleware,
+    PrecompressedStaticFiles,
+    accepted_encodings,
+    negotiate_encoding,
+    precompress_directory,
+)
+
+LARGE_JSON = [{"name": f"Упражнение {i}", "description": "Описание " * 5} for i in range(100)]
+
+
+async def call(app, path: str, headers: dict[str, str] | None = None):
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()],
+    }
+    messages = []
+    requested = False
+
+    async def receive():
+        nonlocal requested
+        if requested:
+            # Потоковые ответы слушают отключение клиента до конца отправки
+            await asyncio.Event().wait()
+        requested = True
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    await app(scope, receive, send)
+    start = messages[0]
+    body = b"".join(m.get("body", b"") for m in messages[1:])
+    return start["status"], {k.decode(): v.decode() for k, v in start["headers"]}, body
+
+
+async def stream():
+    for i in range(50):
+        yield f"строка {i} ".encode() * 10
+
+
+def make_app(tmp_path=None) -> CompressionMiddleware:
+    routes = [
+        Route("/large", lambda request: JSONResponse(LARGE_JSON)),
+        Route("/small", lambda request: JSONResponse({"status": "ok"})),
+        Route("/video", lambda request: Response(b"\0" * 4096, media_type="video/mp4")),
+        Route("/stream", lambda request: StreamingResponse(stream(), media_type="text/plain")),
+        Route(
+            "/encoded",
+            lambda request: Response(
+                b"x" * 4096, media_type="application/json", headers={"Content-Encoding": "gzip"}
+            ),
+        ),
+        Route(
+            "/etag",
+            lambda request: PlainTextResponse("текст " * 500, headers={"ETag": '"abc"'}),
+        ),
+    ]
+    if tmp_path is not None:
+        routes.append(Mount("/static", PrecompressedStaticFiles(directory=tmp_path)))
+    return CompressionMiddleware(
+        Starlette(routes=routes), minimum_size=1024, exclude_prefixes=("/static",)
+    )
+
+
+@pytest.mark.parametrize(
+    "accept_encoding, available, expected",
+    [
+        ("gzip, br, zstd", ("zstd", "br", "gzip"), "zstd"),
+        ("gzip, br", ("zstd", "br", "gzip"), "br"),
+        ("gzip;q=1, br;q=0.5", ("zstd", "br", "gzip"), "gzip"),
+        ("*", ("gzip",), "gzip"),
+        ("*;q=0", ("gzip",), None),
+        ("identity", ("zstd", "br", "gzip"), None),
+        ("", ("gzip",), None),
+    ],
+)
+def test_negotiate_encoding(accept_encoding, available, expected):
+    assert negotiate_encoding(accept_encoding, available) == expected
+
+
+def test_accepted_encodings_excludes_refused():
+    assert accepted_encodings("br;q=0, gzip", ("zstd", "br", "gzip")) == ["gzip"]
+
+
+async def test_compresses_large_json():
+    status, headers, body = await call(make_app(), "/large", {"Accept-Encoding": "gzip"})
+
+    assert status == 200
+    assert headers["content-encoding"] == "gzip"
+    assert headers["vary"] == "Accept-Encoding"
+    assert int(headers["content-length"]) == len(body)
+    assert gzip.decompress(body) == JSONResponse(LARGE_JSON).body
+
+
+async def test_small_response_not_compressed():
+    _, headers, body = await call(make_app(), "/small", {"Accept-Encoding": "gzip"})
+
+    assert "content-encoding" not in headers
+    assert headers["vary"] == "Accept-Encoding"
+    assert body == b'{"status":"ok"}'
+
+
+async def test_incompressible_type_passes_through():
+    _, headers, body = await call(make_app(), "/video", {"Accept-Encoding": "gzip"})
+
+    assert "content-encoding" not in headers
+    assert "vary" not in headers
+    assert len(body) == 4096
+
+
+async def test_already_encoded_passes_through():
+    _, headers, body = await call(make_app(), "/encoded", {"Accept-Encoding": "gzip"})
+    assert headers["content-encoding"] == "gzip"
+    assert body == b"x" * 4096
+
+
+async def test_no_accept_encoding():
+    _, headers, body = await call(make_app(), "/large")
+    assert "content-encoding" not in headers
+    assert body == JSONResponse(LARGE_JSON).body
+
+
+async def test_streaming_response_compressed():
+    _, headers, body = await call(make_app(), "/stream", {"Accept-Encoding": "gzip"})
+
+    assert headers["content-encoding"] == "gzip"
+    assert "content-length" not in headers
+    expected = b"".join(f"строка {i} ".encode() * 10 for i in range(50))
+    assert gzip.decompress(body) == expected
+
+
+async def test_strong_etag_weakened():
+    _, headers, _ = await call(make_app(), "/etag", {"Accept-Encoding": "gzip"})
+    assert headers["etag"] == 'W/"abc"'
+
+
+async def test_brotli_and_zstd():
+    brotli = pytest.importorskip("brotli")
+    zstandard = pytest.importorskip("zstandard")
+
+    _, headers, body = await call(make_app(), "/large", {"Accept-Encoding": "br"})
+    assert headers["content-encoding"] == "br"
+    assert brotli.decompress(body) == JSONResponse(LARGE_JSON).body
+
+    _, headers, body = await call(make_app(), "/stream", {"Accept-Encoding": "zstd"})
+    assert headers["content-encoding"] == "zstd"
+    expected = b"".join(f"строка {i} ".encode() * 10 for i in range(50))
+    assert zstandard.ZstdDecompressor().decompressobj().decompress(body) == expected
+
+
+def test_precompress_directory(tmp_path):
+    (tmp_path / "app.js").write_text("console.log('тест');\n" * 200)
+    (tmp_path / "video.mp4").write_bytes(os.urandom(4096))
+    (tmp_path / "tiny.css").write_text("a{}")
+
+    created = precompress_directory(tmp_path, ("gzip",))
+
+    assert created == [tmp_path / "app.js.gz"]
+    original = (tmp_path / "app.js").read_bytes()
+    assert gzip.decompress((tmp_path / "app.js.gz").read_bytes()) == original
+    # Повторный запуск не пересжимает неизменённые файлы
+    assert precompress_directory(tmp_path, ("gzip",)) == []
+
+
+async def test_static_served_from_precompressed_variant(tmp_path):
+    (tmp_path / "app.js").write_text("console.log('тест');\n" * 200)
+    precompress_directory(tmp_path, ("gzip",))
+    app = make_app(tmp_path)
+
+    status, headers, body = await call(app, "/static/app.js", {"Accept-Encoding": "gzip"})
+    assert status == 200
+    assert headers["content-encoding"] == "gzip"
+    assert headers["content-type"].startswith("text/javascript")
+    assert headers["vary"] == "Accept-Encoding"
+    assert body == (tmp_path / "app.js.gz").read_bytes()
+
+    status, headers, body = await call(app, "/static/app.js")
+    assert "content-encoding" not in headers
+    assert body == (tmp_path / "app.js").read_bytes()
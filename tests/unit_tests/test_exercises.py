@@ -1,11 +1,12 @@
+import datetime
 from unittest.mock import Mock, AsyncMock
 
 import pytest
 from sqlalchemy.exc import NoResultFound
 
 from src.exceptions import ObjectNotFoundException, ObjectAlreadyExistsException, DataIsEmptyException
-from src.schemas.exercises import Category, Exercise, ExerciseUpdate
-from src.services.exercises import ExercisesService
+from src.schemas.exercises import Category, Exercise, ExerciseTombstone, ExerciseTombstoneAdd, ExerciseUpdate
+from src.services.exercises import EXERCISES_CHANGES_OVERLAP, ExercisesService
 from tests.unit_tests.base_test import BaseTestService
 
 
@@ -15,6 +16,9 @@ class TestExercisesService(BaseTestService):
     def setup_method(self):
         super().setup_method()
         self.service = ExercisesService(db=self.mock_db)
+        self.mock_db.workouts.refresh_summaries_with_exercise = AsyncMock()
+        self.mock_db.workout_changes.record_with_exercise = AsyncMock()
+        self.mock_db.training_rollups.refresh_with_exercise = AsyncMock()
 
     async def test_get_exercises_success(self):
         self.mock_db.exercises.get_all = AsyncMock(return_value=[])
@@ -22,6 +26,29 @@ class TestExercisesService(BaseTestService):
         assert exercises == []
         self.mock_db.exercises.get_all.assert_called_once()
 
+    async def test_get_exercises_fields(self):
+        rows = [{"name": "Жим лежа", "id": 1}]
+        self.mock_db.exercises.get_filtered_fields = AsyncMock(return_value=rows)
+        self.mock_db.exercises.get_all = AsyncMock()
+
+        exercises = await self.service.get_exercises(fields=["name", "id"])
+
+        assert exercises == rows
+        self.mock_db.exercises.get_filtered_fields.assert_called_once_with(["name", "id"])
+        self.mock_db.exercises.get_all.assert_not_called()
+
+    async def test_get_exercises_by_ids(self):
+        exercises = [
+            Exercise(id=1, name="Жим лежа", category=Category.CHEST),
+            Exercise(id=3, name="Присед", category=Category.LEGS),
+        ]
+        self.mock_db.exercises.get_by_ids = AsyncMock(return_value=exercises)
+
+        result = await self.service.get_exercises_by_ids([3, 2, 1, 3])
+
+        self.mock_db.exercises.get_by_ids.assert_called_once_with([3, 2, 1, 3])
+        assert [exercise.id for exercise in result] == [3, 1]
+
     async def test_get_exercise_success(self):
         exercise_example = Mock(
             id=1,
@@ -98,17 +125,50 @@ class TestExercisesService(BaseTestService):
 
     async def test_delete_exercise_success(self):
         self.mock_db.exercises.delete = AsyncMock(return_value=True)
+        self.mock_db.exercise_tombstones.add = AsyncMock()
         await self.service.delete_exercise(1)
         self.mock_db.exercises.delete.assert_called_once()
+        self.mock_db.exercise_tombstones.add.assert_called_once_with(ExerciseTombstoneAdd(exercise_id=1))
         self.mock_db.commit.assert_called_once()
 
     async def test_delete_exercise_failure(self):
         self.mock_db.exercises.delete.side_effect = ObjectNotFoundException
+        self.mock_db.exercise_tombstones.add = AsyncMock()
         with pytest.raises(ObjectNotFoundException):
             await self.service.delete_exercise(1)
         self.mock_db.exercises.delete.assert_called_once_with(id=1)
+        self.mock_db.exercise_tombstones.add.assert_not_called()
         self.mock_db.commit.assert_not_called()
 
+    async def test_get_exercise_changes(self):
+        since = datetime.datetime(2025, 2, 2, 12, 0, tzinfo=datetime.timezone.utc)
+        exercise = Exercise(id=1, name="Жим лежа", category=Category.CHEST)
+        tombstone = ExerciseTombstone(exercise_id=7, deleted_at=since + datetime.timedelta(minutes=5))
+        self.mock_db.exercises.get_updated_since = AsyncMock(
+            return_value=([exercise], since + datetime.timedelta(minutes=1))
+        )
+        self.mock_db.exercise_tombstones.get_deleted_since = AsyncMock(return_value=[tombstone])
+
+        changes = await self.service.get_exercise_changes(since)
+
+        self.mock_db.exercises.get_updated_since.assert_called_once_with(
+            since - EXERCISES_CHANGES_OVERLAP
+        )
+        assert changes.changed == [exercise]
+        assert changes.deleted == [7]
+        assert changes.cursor == tombstone.deleted_at
+
+    async def test_get_exercise_changes_nothing_changed(self):
+        since = datetime.datetime(2025, 2, 2, 12, 0, tzinfo=datetime.timezone.utc)
+        self.mock_db.exercises.get_updated_since = AsyncMock(return_value=([], None))
+        self.mock_db.exercise_tombstones.get_deleted_since = AsyncMock(return_value=[])
+
+        changes = await self.service.get_exercise_changes(since)
+
+        assert changes.changed == []
+        assert changes.deleted == []
+        assert changes.cursor == since
+
     async def test_update_exercise_success(self):
         # Arrange
         exercise_id = 1
@@ -141,6 +201,9 @@ class TestExercisesService(BaseTestService):
         assert called_arg.name == "Подтягивания"
         assert called_arg.description == "Базовое упражнение на спину"
         assert called_arg.category == category
+        self.mock_db.workouts.refresh_summaries_with_exercise.assert_called_once_with(exercise_id)
+        self.mock_db.workout_changes.record_with_exercise.assert_called_once_with(exercise_id)
+        self.mock_db.training_rollups.refresh_with_exercise.assert_called_once_with(exercise_id)
         self.mock_db.commit.assert_called_once()
         assert exercise.name == "Подтягивания"
         assert exercise.description == "Базовое упражнение на спину"
@@ -228,11 +291,45 @@ class TestExercisesService(BaseTestService):
         assert called_arg.name == name
         assert called_arg.description == description
         assert called_arg.category == Category.BACK
+        self.mock_db.workouts.refresh_summaries_with_exercise.assert_called_once_with(exercise_id)
+        self.mock_db.workout_changes.record_with_exercise.assert_called_once_with(exercise_id)
+        self.mock_db.training_rollups.refresh_with_exercise.assert_called_once_with(exercise_id)
         self.mock_db.commit.assert_called_once()
         assert exercise.name == name
         assert exercise.description == description
         assert exercise.category == Category.BACK
 
+    async def test_partially_update_exercise_same_category_skips_workouts(self):
+        # Arrange
+        exercise_id = 1
+        existing_obj = Exercise(
+            id=1,
+            name="Жим лежа",
+            description="Базовое упражнение",
+            category=Category.CHEST,
+        )
+        existing_obj_new = Exercise(
+            id=1,
+            name="Жим лежа",
+            description="Базовое упражнение на грудь",
+            category=Category.CHEST,
+        )
+        exercise_example = {
+            "name": None,
+            "description": "Базовое упражнение на грудь"
+        }
+        self.service.get_exercise = AsyncMock(return_value=existing_obj)
+        self.mock_db.exercises.update = AsyncMock(return_value=existing_obj_new)
+
+        # Act
+        await self.service.partially_update_exercise(exercise_id, exercise_example, None)
+
+        # Assert
+        self.mock_db.workouts.refresh_summaries_with_exercise.assert_not_called()
+        self.mock_db.workout_changes.record_with_exercise.assert_not_called()
+        self.mock_db.training_rollups.refresh_with_exercise.assert_not_called()
+        self.mock_db.commit.assert_called_once()
+
     async def test_partially_update_exercise_data_is_empty_failure(self):
         # Arrange
         exercise_id = 1
@@ -272,4 +369,9 @@ class TestExercisesService(BaseTestService):
         # Assert
         self.service.get_exercise.assert_called_once_with(exercise_id)
         self.mock_db.exercises.update.assert_not_called()
-        self.mock_db.commit.assert_not_called()
\ No newline at end of file
+        self.mock_db.commit.assert_not_called()
+
+
+def test_category_values_are_lowercase_names():
+    # Сводка тренировок (build_summaries_update) переводит имя Enum из БД в значение через lower()
+    assert all(category.value == category.name.lower() for category in Category)
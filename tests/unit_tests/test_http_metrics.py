@@ -0,0 +1,44 @@
+from fastapi import FastAPI, Response
+from httpx import ASGITransport, AsyncClient
+
+from src.core.http_metrics import HTTPMetricsMiddleware, UNMATCHED_ROUTE
+from src.core.metrics import CACHE_REQUESTS, HTTP_REQUESTS, HTTP_REQUESTS_IN_PROGRESS
+
+app = FastAPI()
+app.add_middleware(HTTPMetricsMiddleware)
+
+
+@app.get("/items/{item_id}")
+async def get_item(item_id: int, response: Response):
+    response.headers["X-FastAPI-Cache"] = "HIT"
+    return {"id": item_id}
+
+
+def value(metric, **labels) -> float:
+    return metric.labels(**labels)._value.get()
+
+
+async def request(path: str) -> int:
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.get(path)
+    return response.status_code
+
+
+async def test_request_recorded_by_route_template():
+    before = value(HTTP_REQUESTS, method="GET", route="/items/{item_id}", status="200")
+    hits_before = value(CACHE_REQUESTS, route="/items/{item_id}", result="hit")
+
+    assert await request("/items/1") == 200
+    assert await request("/items/2") == 200
+
+    assert value(HTTP_REQUESTS, method="GET", route="/items/{item_id}", status="200") == before + 2
+    assert value(CACHE_REQUESTS, route="/items/{item_id}", result="hit") == hits_before + 2
+    assert value(HTTP_REQUESTS_IN_PROGRESS, method="GET", route="/items/{item_id}") == 0
+
+
+async def test_unknown_path_is_not_a_separate_label():
+    before = value(HTTP_REQUESTS, method="GET", route=UNMATCHED_ROUTE, status="404")
+
+    assert await request("/random/path/123") == 404
+
+    assert value(HTTP_REQUESTS, method="GET", route=UNMATCHED_ROUTE, status="404") == before + 1
@@ -0,0 +1,75 @@
+import json
+import logging
+import queue
+
+import pytest
+
+from src.core.logging_config import (
+    JsonFormatter,
+    LazyQueueHandler,
+    SamplingFilter,
+    setup_logging,
+    stop_logging,
+)
+
+
+def make_record(name="src.services.auth", level=logging.INFO, msg="Пользователь %s", args=("a@b.c",), **extra):
+    record = logging.LogRecord(name, level, __file__, 1, msg, args, None)
+    record.__dict__.update(extra)
+    return record
+
+
+@pytest.fixture
+def restore_root_logger():
+    root = logging.getLogger()
+    handlers, level = root.handlers[:], root.level
+    yield
+    stop_logging()
+    root.handlers[:] = handlers
+    root.setLevel(level)
+
+
+def test_json_formatter_includes_extra():
+    payload = json.loads(JsonFormatter().format(make_record(user_id=7)))
+
+    assert payload["message"] == "Пользователь a@b.c"
+    assert payload["level"] == "INFO"
+    assert payload["logger"] == "src.services.auth"
+    assert payload["user_id"] == 7
+
+
+def test_sampling_filter_uses_longest_prefix():
+    sampling = SamplingFilter({"src": 1.0, "src.repositories": 0.0})
+
+    assert sampling.filter(make_record(name="src.services.auth")) is True
+    assert sampling.filter(make_record(name="src.repositories.users")) is False
+    assert sampling.filter(make_record(name="sqlalchemy.engine")) is True
+
+
+def test_sampling_filter_keeps_warnings():
+    sampling = SamplingFilter({"src.repositories": 0.0})
+
+    assert sampling.filter(make_record(name="src.repositories.users", level=logging.WARNING)) is True
+
+
+def test_queue_handler_defers_formatting():
+    log_queue = queue.SimpleQueue()
+    LazyQueueHandler(log_queue).handle(make_record())
+
+    record = log_queue.get_nowait()
+    assert record.msg == "Пользователь %s"
+    assert record.args == ("a@b.c",)
+
+
+def test_setup_logging_writes_json(capsys, restore_root_logger):
+    setup_logging(level="INFO", sampling={"noisy": 0.0})
+
+    logging.getLogger("noisy").info("не попадёт в лог")
+    logging.getLogger("src.api").info("Запрос %s", "/health", extra={"status": 200})
+    stop_logging()
+
+    lines = capsys.readouterr().out.splitlines()
+    assert len(lines) == 1
+    payload = json.loads(lines[0])
+    assert payload["message"] == "Запрос /health"
+    assert payload["status"] == 200
@@ -0,0 +1,66 @@
+import asyncio
+import sys
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from src.core.http_metrics import UNMATCHED_ROUTE
+from src.core.loop_monitor import LoopMonitor, find_route
+from src.core.metrics import EVENT_LOOP_BLOCKS
+
+
+async def blocking_handler(scope):
+    await asyncio.sleep(0.05)
+    time.sleep(0.3)
+    await asyncio.sleep(0.05)
+
+
+@pytest.mark.allow_loop_block
+async def test_blocking_call_attributed_to_route():
+    scope = {"type": "http", "path": "/workouts/1", "route": SimpleNamespace(path="/workouts/{id}")}
+    before = EVENT_LOOP_BLOCKS.labels(route="/workouts/{id}")._value.get()
+    monitor = LoopMonitor(threshold=0.1, interval=0.02)
+
+    monitor.start()
+    await blocking_handler(scope)
+    await asyncio.sleep(0.05)
+    await monitor.stop()
+
+    assert len(monitor.blocks) == 1
+    blocked = monitor.blocks[0]
+    assert blocked.route == "/workouts/{id}"
+    assert blocked.path == "/workouts/1"
+    assert "маршрут: /workouts/{id} (/workouts/1)" in blocked.format()
+    assert blocked.duration >= 0.25
+    assert any("blocking_handler" in line for line in blocked.stack)
+    assert EVENT_LOOP_BLOCKS.labels(route="/workouts/{id}")._value.get() == before + 1
+
+
+async def test_no_blocks_for_cooperative_code():
+    monitor = LoopMonitor(threshold=0.1, interval=0.02)
+
+    monitor.start()
+    for _ in range(10):
+        await asyncio.sleep(0.02)
+    await monitor.stop()
+
+    assert len(monitor.blocks) == 0
+
+
+def find_route_in_request(scope):
+    # find_route ищет scope в локальных переменных кадров стека — здесь это аргумент
+    return find_route(sys._getframe())
+
+
+def test_find_route_template():
+    scope = {"type": "http", "path": "/workouts/42", "route": SimpleNamespace(path="/workouts/{id}")}
+    assert find_route_in_request(scope) == "/workouts/{id}"
+
+
+def test_find_route_unmatched_is_not_raw_path():
+    assert find_route_in_request({"type": "http", "path": "/workouts/42"}) == UNMATCHED_ROUTE
+
+
+def test_find_route_outside_request():
+    assert find_route(sys._getframe()) is None
@@ -0,0 +1,100 @@
+import os
+
+import pytest
+from starlette.applications import Starlette
+from starlette.routing import Mount
+
+from src.core.media import (
+    IMMUTABLE_CACHE_CONTROL,
+    REVALIDATE_CACHE_CONTROL,
+    MediaFiles,
+    hash_file,
+)
+from tests.unit_tests.test_compression import call
+
+VIDEO = os.urandom(300_000)
+
+
+@pytest.fixture
+def media(tmp_path):
+    (tmp_path / "video").mkdir()
+    (tmp_path / "video" / "clip.mp4").write_bytes(VIDEO)
+    files = MediaFiles(directory=tmp_path, url_prefix="/static/")
+    files.build_manifest()
+    return files
+
+
+@pytest.fixture
+def app(media):
+    return Starlette(routes=[Mount("/static", media)])
+
+
+def test_url_contains_fingerprint(media, tmp_path):
+    digest = hash_file(tmp_path / "video" / "clip.mp4")
+    assert media.url("video/clip.mp4") == f"/static/video/clip.{digest[:12]}.mp4"
+    assert media.url("missing.css") == "/static/missing.css"
+
+
+async def test_fingerprinted_url_is_immutable(app, media):
+    status, headers, body = await call(app, media.url("video/clip.mp4"))
+
+    assert status == 200
+    assert body == VIDEO
+    assert headers["content-type"] == "video/mp4"
+    assert headers["cache-control"] == IMMUTABLE_CACHE_CONTROL
+    assert headers["etag"] == media.manifest["video/clip.mp4"].etag
+    assert headers["accept-ranges"] == "bytes"
+
+
+async def test_plain_url_revalidates(app, media):
+    status, headers, body = await call(app, "/static/video/clip.mp4")
+
+    assert status == 200
+    assert body == VIDEO
+    assert headers["cache-control"] == REVALIDATE_CACHE_CONTROL
+    assert headers["etag"] == media.manifest["video/clip.mp4"].etag
+
+
+async def test_stale_fingerprint_not_found(app):
+    status, _, _ = await call(app, "/static/video/clip.000000000000.mp4")
+    assert status == 404
+
+
+async def test_not_modified(app, media):
+    etag = media.manifest["video/clip.mp4"].etag
+    status, headers, body = await call(app, "/static/video/clip.mp4", {"If-None-Match": etag})
+
+    assert status == 304
+    assert body == b""
+    assert headers["etag"] == etag
+
+
+async def test_range_request(app, media):
+    status, headers, body = await call(
+        app, media.url("video/clip.mp4"), {"Range": "bytes=1000-1999"}
+    )
+
+    assert status == 206
+    assert body == VIDEO[1000:2000]
+    assert headers["content-range"] == f"bytes 1000-1999/{len(VIDEO)}"
+    assert headers["cache-control"] == IMMUTABLE_CACHE_CONTROL
+
+
+async def test_if_range_with_stale_etag_returns_full_file(app, media):
+    status, _, body = await call(
+        app, media.url("video/clip.mp4"), {"Range": "bytes=0-9", "If-Range": '"outdated"'}
+    )
+    assert status == 200
+    assert body == VIDEO
+
+
+async def test_file_changed_after_start_is_not_immutable(app, media, tmp_path):
+    url = media.url("video/clip.mp4")
+    (tmp_path / "video" / "clip.mp4").write_bytes(b"new content")
+
+    status, headers, body = await call(app, url)
+
+    assert status == 200
+    assert body == b"new content"
+    assert headers["cache-control"] == REVALIDATE_CACHE_CONTROL
+    assert headers["etag"] != media.manifest["video/clip.mp4"].etag
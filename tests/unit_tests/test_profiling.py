@@ -0,0 +1,50 @@
+import asyncio
+import time
+from unittest.mock import patch
+
+from src.core.profiling import AWAIT_FRAME, RequestProfile, profile_call
+
+
+async def busy_handler(scope):
+    await asyncio.sleep(0.05)
+    deadline = time.perf_counter() + 0.05
+    while time.perf_counter() < deadline:
+        pass
+
+
+async def run_profiled() -> RequestProfile:
+    scope = {"type": "http", "method": "GET", "path": "/items"}
+    profile = RequestProfile(name="GET /items", interval=0.001)
+    with patch("src.core.profiling._attach_sql_listeners"), patch(
+        "src.core.profiling._detach_sql_listeners"
+    ):
+        await profile_call(profile, scope, lambda: busy_handler(scope))
+    return profile
+
+
+async def test_profile_has_cpu_and_await_samples():
+    profile = await run_profiled()
+
+    assert profile.duration >= 0.1
+    assert profile.samples
+    # Все сэмплы начинаются с самого внешнего кадра, получившего scope запроса
+    assert all(stack[0][0] == "run_profiled" for stack in profile.samples)
+    assert any("busy_handler" in [frame[0] for frame in stack] for stack in profile.samples)
+    assert any(stack[-1] == AWAIT_FRAME for stack in profile.samples)
+    assert any(stack[-1] != AWAIT_FRAME for stack in profile.samples)
+
+
+async def test_speedscope_and_collapsed_formats():
+    profile = await run_profiled()
+
+    speedscope = profile.to_speedscope()
+    sampled = speedscope["profiles"][0]
+    assert sampled["type"] == "sampled"
+    assert len(sampled["samples"]) == len(sampled["weights"]) == len(profile.samples)
+    frame_names = {frame["name"] for frame in speedscope["shared"]["frames"]}
+    assert "busy_handler" in frame_names
+
+    lines = profile.to_collapsed().splitlines()
+    assert lines
+    assert all(line.startswith("run_profiled") for line in lines)
+    assert sum(int(line.rsplit(" ", 1)[1]) for line in lines) == len(profile.samples)
@@ -0,0 +1,77 @@
+import math
+
+import numpy as np
+import pytest
+
+from src.services.progress import (
+    ExerciseHistory,
+    compute_progress,
+    estimate_e1rm,
+    moving_average,
+    rolling_sum,
+)
+
+
+def make_history(rows: list[tuple[int, int, int, float]]) -> ExerciseHistory:
+    return ExerciseHistory.from_columns(*(list(column) for column in zip(*rows)))
+
+
+@pytest.mark.parametrize(
+    "formula,reps,expected",
+    [
+        ("epley", 5, 100 * (1 + 5 / 30)),
+        ("brzycki", 5, 100 * 36 / 32),
+        ("epley", 1, 100),
+        ("brzycki", 1, 100),
+        ("epley", 15, math.nan),
+    ],
+)
+def test_estimate_e1rm(formula, reps, expected):
+    result = estimate_e1rm(np.array([100.0]), np.array([reps]), formula)
+    np.testing.assert_allclose(result, [expected])
+
+
+def test_moving_average_skips_missing_days():
+    values = np.array([100.0, np.nan, 110.0, 120.0])
+    np.testing.assert_allclose(moving_average(values, 2), [100.0, 100.0, 110.0, 115.0])
+
+
+def test_rolling_sum_uses_calendar_days():
+    days = np.array([0, 3, 7, 8])
+    values = np.array([1.0, 2.0, 4.0, 8.0])
+    # Окно 7 дней, заканчивающееся днём 7: дни 1..7
+    np.testing.assert_allclose(rolling_sum(days, values, 7), [1.0, 3.0, 6.0, 14.0])
+
+
+def test_compute_progress_groups_by_day():
+    history = make_history(
+        [
+            (0, 3, 5, 100.0),
+            (0, 1, 1, 120.0),
+            (7, 3, 5, 105.0),
+            (14, 3, 5, 110.0),
+            (14, 1, 20, 60.0),
+        ]
+    )
+
+    progress = compute_progress(history, "epley", window=2, volume_days=7)
+
+    np.testing.assert_array_equal(progress.days, [0, 7, 14])
+    np.testing.assert_allclose(progress.best_e1rm, [120.0, 122.5, 110 * (1 + 5 / 30)])
+    np.testing.assert_allclose(progress.volume, [1620.0, 1575.0, 1650.0 + 1200.0])
+    # Неделя — 7 календарных дней, соседние тренировки в окно не попадают
+    np.testing.assert_allclose(progress.rolling_volume, progress.volume)
+    assert progress.trend.slope_per_week == pytest.approx(
+        np.polyfit([0, 7, 14], progress.best_e1rm, 1)[0] * 7
+    )
+    assert 0 < progress.trend.r2 <= 1
+
+
+def test_compute_progress_empty_and_single_day():
+    empty = compute_progress(ExerciseHistory.from_columns([], [], [], []))
+    assert len(empty.days) == 0
+    assert empty.trend is None
+
+    single = compute_progress(make_history([(3, 1, 5, 50.0)]))
+    assert single.trend is None
+    np.testing.assert_allclose(single.e1rm_moving_average, single.best_e1rm)
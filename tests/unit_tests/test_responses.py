@@ -0,0 +1,136 @@
+import datetime as dt
+
+import pytest
+from fastapi.encoders import jsonable_encoder
+from fastapi_cache.coder import JsonCoder
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+
+from src.core.cache import CatalogBody
+from src.core.responses import (
+    DefaultResponse,
+    EXERCISE_LIST_ADAPTER,
+    WORKOUT_LIST_ADAPTER,
+    accepts_encoding,
+    catalog_response,
+    etag_matches,
+    serialize_list,
+)
+from src.schemas.exercises import Category, Exercise
+from src.schemas.workouts import Workout, WorkoutExercise, WorkoutToResponse
+
+EXERCISES = [
+    Exercise(id=1, name="Приседания", description="Базовое «упражнение»\n", category=Category.LEGS),
+    Exercise(id=2, name='Жим "лёжа"', description=None, category=Category.CHEST),
+    Exercise(id=3, name="Plank 🧘", description="\\ / \t", category=Category.ABS),
+]
+WORKOUTS = [
+    Workout(id=1, user_id=7, date=dt.date(2025, 1, 31), description="Ноги"),
+    Workout(id=2, user_id=7, date=dt.date(2025, 2, 1), description=None),
+]
+
+
+def default_body(content) -> bytes:
+    # Путь FastAPI по умолчанию до перехода на orjson
+    return JSONResponse(jsonable_encoder(content)).body
+
+
+def test_exercise_list_matches_default_serialization():
+    assert serialize_list(EXERCISE_LIST_ADAPTER, EXERCISES).body == default_body(EXERCISES)
+
+
+def test_workout_list_matches_default_serialization():
+    assert serialize_list(WORKOUT_LIST_ADAPTER, WORKOUTS).body == default_body(WORKOUTS)
+
+
+def test_default_response_matches_default_serialization():
+    workout = WorkoutToResponse(
+        id=1,
+        user_id=7,
+        date=dt.date(2025, 1, 31),
+        description="Ноги",
+        exercises=[
+            WorkoutExercise(workout_id=1, exercise_id=1, sets=3, reps=10, weight=62.5),
+            WorkoutExercise(workout_id=1, exercise_id=2, sets=4, reps=8, weight=100.0),
+        ],
+    )
+    content = jsonable_encoder(workout)
+    assert DefaultResponse(content).body == JSONResponse(content).body
+
+
+def test_serialized_response_is_cached_as_is():
+    response = serialize_list(EXERCISE_LIST_ADAPTER, EXERCISES)
+    assert response.media_type == "application/json"
+    assert JsonCoder.encode(response) == response.body
+
+
+def test_empty_list():
+    assert serialize_list(WORKOUT_LIST_ADAPTER, []).body == b"[]"
+
+
+@pytest.mark.parametrize(
+    "accept_encoding, expected",
+    [
+        ("gzip, deflate, br", True),
+        ("br;q=1.0, gzip;q=0.8", True),
+        ("*", True),
+        ("gzip;q=0", False),
+        ("*, gzip;q=0", False),
+        ("identity", False),
+        ("", False),
+    ],
+)
+def test_accepts_encoding(accept_encoding, expected):
+    assert accepts_encoding(accept_encoding, "gzip") is expected
+
+
+def make_request(headers: dict[str, str]) -> Request:
+    return Request(
+        {
+            "type": "http",
+            "method": "GET",
+            "path": "/exercises",
+            "headers": [(k.lower().encode(), v.encode()) for k, v in headers.items()],
+        }
+    )
+
+
+def test_catalog_response_headers():
+    catalog = CatalogBody(b"gz", encoding="gzip", version="v1", ttl=100, hit=True)
+    response = catalog_response(make_request({}), catalog)
+
+    assert response.status_code == 200
+    assert response.body == b"gz"
+    assert response.headers["content-type"] == "application/json"
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["etag"] == '"v1-gzip"'
+    assert response.headers["cache-control"] == "max-age=100"
+    assert response.headers["vary"] == "Accept-Encoding"
+
+
+def test_catalog_response_not_modified():
+    catalog = CatalogBody(b"[]", encoding="identity", version="v1", ttl=100, hit=False)
+    response = catalog_response(make_request({"If-None-Match": '"v1-identity"'}), catalog)
+
+    assert response.status_code == 304
+    assert response.body == b""
+    assert "content-encoding" not in response.headers
+
+
+@pytest.mark.parametrize(
+    "if_none_match",
+    ['W/"v1-identity"', '"v0-identity", W/"v1-identity"', "*"],
+)
+def test_catalog_response_not_modified_weak(if_none_match):
+    catalog = CatalogBody(b"[]", encoding="identity", version="v1", ttl=100, hit=False)
+    response = catalog_response(make_request({"If-None-Match": if_none_match}), catalog)
+
+    assert response.status_code == 304
+
+
+@pytest.mark.parametrize(
+    "if_none_match",
+    [None, "", '"v0-identity"', 'W/"v1-gzip"', '"v0-identity", "v1-gzip"'],
+)
+def test_etag_matches_mismatch(if_none_match):
+    assert not etag_matches(if_none_match, '"v1-identity"')
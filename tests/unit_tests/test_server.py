@@ -0,0 +1,89 @@
+import os
+from unittest.mock import patch
+
+import pytest
+
+from src.server import (
+    get_default_workers,
+    parse_args,
+    build_config,
+    resolve_loop,
+    resolve_http,
+    setup_multiprocess_metrics,
+    mark_worker_dead,
+)
+from src.core.metrics import process_identifier
+
+
+def test_default_workers_from_env(monkeypatch):
+    monkeypatch.setenv("WEB_CONCURRENCY", "3")
+    assert get_default_workers() == 3
+
+
+def test_default_workers_from_cpus(monkeypatch):
+    monkeypatch.delenv("WEB_CONCURRENCY", raising=False)
+    with patch("src.server.get_available_cpus", return_value=6):
+        assert get_default_workers() == 6
+
+
+@pytest.mark.parametrize(
+    "installed, loop, http",
+    [
+        (True, "uvloop", "httptools"),
+        (False, "asyncio", "h11"),
+    ],
+)
+def test_resolve_auto(installed, loop, http):
+    with patch("src.server.is_installed", return_value=installed):
+        assert resolve_loop("auto") == loop
+        assert resolve_http("auto") == http
+
+
+def test_explicit_loop_and_http_are_kept():
+    assert resolve_loop("asyncio") == "asyncio"
+    assert resolve_http("h11") == "h11"
+
+
+def test_build_config():
+    args = parse_args(["--port", "9000", "--keep-alive", "7", "--backlog", "512", "--loop", "asyncio"])
+    config = build_config(object(), args)
+    assert config.port == 9000
+    assert config.timeout_keep_alive == 7
+    assert config.backlog == 512
+    assert config.loop == "asyncio"
+
+
+def test_setup_multiprocess_metrics(monkeypatch, tmp_path):
+    initial = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    # setenv запоминает исходное значение (или его отсутствие): переменная, которую выставит
+    # setup_multiprocess_metrics, удалится после теста и не переключит остальные тесты
+    # в многопроцессный режим метрик
+    monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", "")
+    monkeypatch.delenv("PROMETHEUS_MULTIPROC_DIR")
+    with patch("src.server.tempfile.mkdtemp", return_value=str(tmp_path)):
+        setup_multiprocess_metrics()
+    assert os.environ["PROMETHEUS_MULTIPROC_DIR"] == str(tmp_path)
+
+    monkeypatch.undo()
+    assert os.environ.get("PROMETHEUS_MULTIPROC_DIR") == initial
+
+
+def test_setup_multiprocess_metrics_keeps_existing(monkeypatch):
+    monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", "/var/run/metrics")
+    setup_multiprocess_metrics()
+    assert os.environ["PROMETHEUS_MULTIPROC_DIR"] == "/var/run/metrics"
+
+
+def test_mark_worker_dead_removes_only_its_live_gauges(monkeypatch, tmp_path):
+    monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", str(tmp_path))
+    dead = process_identifier(123)
+    assert dead.endswith("-123") and "_" not in dead
+    for name in (f"gauge_livesum_{dead}.db", f"counter_{dead}.db", "gauge_livesum_other-host-123.db"):
+        (tmp_path / name).touch()
+
+    mark_worker_dead(123)
+
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        f"counter_{dead}.db",
+        "gauge_livesum_other-host-123.db",
+    ]
@@ -0,0 +1,73 @@
+import json
+
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from src.core.traffic_capture import (
+    REDACTED,
+    TrafficCaptureMiddleware,
+    hash_subject,
+    start_traffic_capture,
+    stop_traffic_capture,
+)
+from src.services.auth import AuthService
+
+app = FastAPI()
+app.add_middleware(TrafficCaptureMiddleware)
+
+
+@app.get("/workouts/get/{workout_id}")
+async def get_workout(workout_id: int):
+    return {"id": workout_id}
+
+
+@app.post("/auth/login")
+async def login(data: dict):
+    return {}
+
+
+@pytest.fixture
+def capture_path(tmp_path):
+    path = start_traffic_capture(str(tmp_path / "capture.ndjson"), max_bytes=1024 * 1024, backup_count=1)
+    yield path
+    stop_traffic_capture()
+
+
+def read_traces(path) -> list[dict]:
+    stop_traffic_capture()
+    return [json.loads(line) for line in path.read_text(encoding="utf8").splitlines()]
+
+
+async def test_capture_route_template_and_subject(capture_path):
+    token = AuthService().create_access_token(
+        {"user_id": 7, "user_email": "a@b.c", "user_hashed_password": "h", "user_role": "user"}
+    )
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        await client.get("/workouts/get/5?full=1", headers={"Cookie": f"access_token={token}"})
+
+    [trace] = read_traces(capture_path)
+    assert trace["method"] == "GET"
+    assert trace["route"] == "/workouts/get/{workout_id}"
+    assert trace["path_params"] == {"workout_id": "5"}
+    assert trace["query"] == {"full": "1"}
+    assert trace["status"] == 200
+    assert trace["subject"] == hash_subject(7)
+
+
+async def test_capture_redacts_sensitive_fields(capture_path):
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        await client.post("/auth/login", json={"email": "a@b.c", "password": "secret", "remember": True})
+
+    [trace] = read_traces(capture_path)
+    assert trace["body"] == {"email": REDACTED, "password": REDACTED, "remember": True}
+    assert trace["subject"] is None
+    assert "secret" not in capture_path.read_text(encoding="utf8")
+
+
+async def test_nothing_captured_when_not_started(tmp_path):
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.get("/workouts/get/1")
+
+    assert response.status_code == 200
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,70 @@
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+from src.warmup import retry_warm_up, run_hot_queries, run_warm_up
+from tests.unit_tests.base_test import BaseTestService
+
+
+class TestWarmUp(BaseTestService):
+
+    def setup_method(self):
+        super().setup_method()
+        self.app = SimpleNamespace(state=SimpleNamespace())
+
+    async def test_run_hot_queries(self):
+        self.mock_db.exercises = AsyncMock()
+        self.mock_db.workouts = AsyncMock()
+        self.mock_db.workout_exercises = AsyncMock()
+        self.mock_db.exercises.get_all.return_value = []
+
+        await run_hot_queries(self.mock_db)
+
+        self.mock_db.exercises.get_all.assert_called_once()
+        self.mock_db.workouts.get_filtered.assert_called_once_with(user_id=0)
+        self.mock_db.workout_exercises.get_filtered.assert_called_once_with(workout_id=0)
+        assert self.mock_db.users.get_one_or_none.call_count == 2
+
+    async def test_run_warm_up_marks_ready(self):
+        with patch("src.warmup.warm_up", new=AsyncMock()) as mock_warm_up:
+            await run_warm_up(self.app)
+
+        mock_warm_up.assert_called_once()
+        assert self.app.state.ready is True
+
+    async def test_run_warm_up_failure_not_ready(self):
+        with patch("src.warmup.warm_up", new=AsyncMock(side_effect=ConnectionError)):
+            await run_warm_up(self.app)
+
+        assert self.app.state.ready is False
+        assert self.app.state.warmup_error == "ConnectionError"
+
+    async def test_run_warm_up_timeout_not_ready(self):
+        async def slow_warm_up():
+            await asyncio.sleep(1)
+
+        with patch("src.warmup.warm_up", new=slow_warm_up), \
+                patch("src.core.config.settings.WARMUP_TIMEOUT", 0.01):
+            await run_warm_up(self.app)
+
+        assert self.app.state.ready is False
+        assert self.app.state.warmup_error == "TimeoutError"
+
+    async def test_retry_warm_up_until_success(self):
+        self.app.state.ready = False
+        warm_up = AsyncMock(side_effect=[ConnectionError, None])
+        with patch("src.warmup.warm_up", new=warm_up), \
+                patch("src.core.config.settings.WARMUP_RETRY_INTERVAL", 0):
+            await retry_warm_up(self.app)
+
+        assert warm_up.call_count == 2
+        assert self.app.state.ready is True
+        assert self.app.state.warmup_error is None
+
+    async def test_run_warm_up_disabled(self):
+        with patch("src.warmup.warm_up", new=AsyncMock()) as mock_warm_up, \
+                patch("src.core.config.settings.WARMUP_ENABLED", False):
+            await run_warm_up(self.app)
+
+        mock_warm_up.assert_not_called()
+        assert self.app.state.ready is True
@@ -6,7 +6,7 @@ import pytest
 
 from src.exceptions import AccessDeniedException, DataIsEmptyException, ObjectNotFoundException
 from src.schemas.exercises import Exercise, Category
-from src.schemas.workouts import WorkoutAdd, WorkoutExercise, Workout, ExerciseToAdd, WorkoutRequest, WorkoutUpdatePatch
+from src.schemas.workouts import WorkoutAdd, WorkoutExercise, Workout, ExerciseToAdd, WorkoutRequest, WorkoutUpdatePatch, WorkoutChangeRecord
 from src.services.workouts import WorkoutsService
 from tests.unit_tests.base_test import BaseTestService
 
@@ -16,6 +16,8 @@ class TestWorkoutsService(BaseTestService):
 
     def setup_method(self):
         super().setup_method()
+        self.mock_db.workout_changes.record = AsyncMock()
+        self.mock_db.training_rollups.refresh = AsyncMock()
         self.service = WorkoutsService(db=self.mock_db)
 
     async def test_get_workouts(self):
@@ -30,6 +32,20 @@ class TestWorkoutsService(BaseTestService):
         assert workouts == []
         self.mock_db.workouts.get_filtered.assert_called_once_with(user_id=user_id)
 
+    async def test_get_workouts_fields(self):
+        # Arrange
+        rows = [{"id": 1, "date": datetime.date(2025, 2, 2)}]
+        self.mock_db.workouts.get_filtered_fields = AsyncMock(return_value=rows)
+        self.mock_db.workouts.get_filtered = AsyncMock()
+
+        # Act
+        workouts = await self.service.get_workouts(user_id=12, fields=["date", "id"])
+
+        # Assert
+        assert workouts == rows
+        self.mock_db.workouts.get_filtered_fields.assert_called_once_with(["date", "id"], user_id=12)
+        self.mock_db.workouts.get_filtered.assert_not_called()
+
     async def test_get_workout_success(self):
         # Arrange
         workout_id = 12
@@ -120,7 +136,11 @@ class TestWorkoutsService(BaseTestService):
             description="Первая тренировка на грудь",
         )
         self.mock_db.exercises.get_one = AsyncMock(return_value=exercise_example)
+        summary_example = workout_example.model_copy(
+            update={"total_volume": 4800, "exercises_count": 1, "main_categories": [Category.CHEST]}
+        )
         self.mock_db.workouts.add = AsyncMock(return_value=workout_example)
+        self.mock_db.workouts.refresh_summaries = AsyncMock(return_value=[summary_example])
         self.mock_db.workout_exercises.add = AsyncMock()
         self.mock_db.commit = AsyncMock()
 
@@ -150,6 +170,9 @@ class TestWorkoutsService(BaseTestService):
         assert called_workout_ex.reps == exercise_for_workouts_example.reps
         assert called_workout_ex.weight == exercise_for_workouts_example.weight
 
+        self.mock_db.workouts.refresh_summaries.assert_called_once_with([123])
+        assert workout == summary_example
+        self.mock_db.workout_changes.record.assert_called_once_with(5555, [123])
         self.mock_db.commit.assert_called_once()
 
     async def test_add_workout_obj_not_found_failure(self):
@@ -174,6 +197,102 @@ class TestWorkoutsService(BaseTestService):
         # Assert
         self.mock_db.exercises.get_one.assert_called_once_with(id=1)
 
+    async def test_add_workouts_batch_success(self):
+        # Arrange
+        user_id = 5555
+        workouts = [
+            WorkoutRequest(
+                date=datetime.date(2025, 2, 2),
+                description="Грудь",
+                exercises=[
+                    ExerciseToAdd(id=1, sets=4, reps=15, weight=80),
+                    ExerciseToAdd(id=2, sets=3, reps=10, weight=40),
+                ],
+            ),
+            WorkoutRequest(
+                date=datetime.date(2025, 2, 3),
+                exercises=[ExerciseToAdd(id=1, sets=5, reps=5, weight=100)],
+            ),
+        ]
+        created_workouts = [
+            Workout(id=10, user_id=user_id, date=datetime.date(2025, 2, 2), description="Грудь"),
+            Workout(id=11, user_id=user_id, date=datetime.date(2025, 2, 3), description=None),
+        ]
+        self.mock_db.exercises.get_existing_ids = AsyncMock(return_value={1, 2})
+        self.mock_db.workouts.add_bulk_returning = AsyncMock(return_value=created_workouts)
+        self.mock_db.workouts.refresh_summaries = AsyncMock(return_value=created_workouts[::-1])
+        self.mock_db.workout_exercises.add_bulk = AsyncMock()
+
+        # Act
+        results = await self.service.add_workouts_batch(user_id, workouts)
+
+        # Assert
+        self.mock_db.exercises.get_existing_ids.assert_called_once_with({1, 2})
+        added_workouts = self.mock_db.workouts.add_bulk_returning.call_args[0][0]
+        assert [w.date for w in added_workouts] == [datetime.date(2025, 2, 2), datetime.date(2025, 2, 3)]
+        assert all(w.user_id == user_id for w in added_workouts)
+
+        self.mock_db.workout_exercises.add_bulk.assert_called_once()
+        added_exercises = self.mock_db.workout_exercises.add_bulk.call_args[0][0]
+        assert [(e.workout_id, e.exercise_id) for e in added_exercises] == [(10, 1), (10, 2), (11, 1)]
+        self.mock_db.workout_changes.record.assert_called_once_with(user_id, [10, 11])
+        self.mock_db.commit.assert_called_once()
+
+        assert [r.status for r in results] == ["created", "created"]
+        assert [r.workout.id for r in results] == [10, 11]
+
+    async def test_add_workouts_batch_partial_failure(self):
+        # Arrange
+        user_id = 5555
+        workouts = [
+            WorkoutRequest(
+                date=datetime.date(2025, 2, 2),
+                exercises=[ExerciseToAdd(id=999, sets=4, reps=15, weight=80)],
+            ),
+            WorkoutRequest(
+                date=datetime.date(2025, 2, 3),
+                exercises=[ExerciseToAdd(id=1, sets=5, reps=5, weight=100)],
+            ),
+        ]
+        created = Workout(id=11, user_id=user_id, date=datetime.date(2025, 2, 3))
+        self.mock_db.exercises.get_existing_ids = AsyncMock(return_value={1})
+        self.mock_db.workouts.add_bulk_returning = AsyncMock(return_value=[created])
+        self.mock_db.workouts.refresh_summaries = AsyncMock(return_value=[created])
+        self.mock_db.workout_exercises.add_bulk = AsyncMock()
+
+        # Act
+        results = await self.service.add_workouts_batch(user_id, workouts)
+
+        # Assert
+        assert len(self.mock_db.workouts.add_bulk_returning.call_args[0][0]) == 1
+        self.mock_db.commit.assert_called_once()
+        assert results[0].status == "error"
+        assert results[0].workout is None
+        assert "999" in results[0].detail
+        assert results[1].status == "created"
+        assert results[1].workout == created
+
+    async def test_add_workouts_batch_all_invalid(self):
+        # Arrange
+        workouts = [
+            WorkoutRequest(
+                date=datetime.date(2025, 2, 2),
+                exercises=[ExerciseToAdd(id=999, sets=4, reps=15, weight=80)],
+            ),
+        ]
+        self.mock_db.exercises.get_existing_ids = AsyncMock(return_value=set())
+        self.mock_db.workouts.add_bulk_returning = AsyncMock()
+        self.mock_db.workout_exercises.add_bulk = AsyncMock()
+
+        # Act
+        results = await self.service.add_workouts_batch(5555, workouts)
+
+        # Assert
+        assert [r.status for r in results] == ["error"]
+        self.mock_db.workouts.add_bulk_returning.assert_not_called()
+        self.mock_db.workout_exercises.add_bulk.assert_not_called()
+        self.mock_db.commit.assert_not_called()
+
     async def test_add_exercises_to_workout_success(self):
         # Arrange
         user_id = 5555
@@ -190,6 +309,7 @@ class TestWorkoutsService(BaseTestService):
             description="Первая тренировка на грудь",
         )
         self.mock_db.workouts.get_one_or_none = AsyncMock(return_value=workout_example)
+        self.mock_db.workouts.refresh_summaries = AsyncMock(return_value=[workout_example])
         self.mock_db.workout_exercises.add = AsyncMock()
         self.mock_db.commit = AsyncMock()
 
@@ -203,6 +323,7 @@ class TestWorkoutsService(BaseTestService):
         # Assert
         self.mock_db.workouts.get_one_or_none.assert_called_once_with(id=123)
         self.mock_db.workout_exercises.add.assert_called_once()
+        self.mock_db.workouts.refresh_summaries.assert_called_once_with([123])
         self.mock_db.commit.assert_called_once()
 
     async def test_add_exercises_to_workout_obj_not_found_failure(self):
@@ -284,6 +405,8 @@ class TestWorkoutsService(BaseTestService):
         # Assert
         self.mock_db.workouts.get_one_or_none.assert_called_once_with(id=workout_id, user_id=user_id)
         self.mock_db.workouts.delete.assert_called_once_with(id=workout_id)
+        self.mock_db.workout_changes.record.assert_called_once_with(user_id, [workout_id], deleted=True)
+        self.mock_db.training_rollups.refresh.assert_called_once_with(user_id, [workout_example.date])
         self.mock_db.commit.assert_called_once()
 
     async def test_delete_workout_obj_not_found_failure(self):
@@ -301,8 +424,49 @@ class TestWorkoutsService(BaseTestService):
         # Assert
         self.mock_db.workouts.get_one_or_none.assert_called_once_with(id=workout_id, user_id=user_id)
         self.mock_db.workouts.delete.assert_not_called()
+        self.mock_db.workout_changes.record.assert_not_called()
         self.mock_db.commit.assert_not_called()
 
+    async def test_get_workout_changes(self):
+        # Arrange
+        user_id = 5555
+        records = [
+            WorkoutChangeRecord(workout_id=10, seq=4, deleted=False),
+            WorkoutChangeRecord(workout_id=11, seq=5, deleted=True),
+            WorkoutChangeRecord(workout_id=12, seq=6, deleted=False),
+        ]
+        workout = Workout(id=10, user_id=user_id, date=datetime.date(2025, 2, 2))
+        workout_exercise = WorkoutExercise(workout_id=10, exercise_id=1, sets=3, reps=10, weight=50)
+        self.mock_db.workout_changes.get_page = AsyncMock(return_value=records)
+        self.mock_db.workouts.get_by_ids = AsyncMock(return_value=[workout])
+        self.mock_db.workout_exercises.get_by_workout_ids = AsyncMock(return_value=[workout_exercise])
+
+        # Act
+        page = await self.service.get_workout_changes(user_id, since=3, limit=2)
+
+        # Assert
+        self.mock_db.workout_changes.get_page.assert_called_once_with(user_id, 3, 3)
+        self.mock_db.workouts.get_by_ids.assert_called_once_with([10])
+        assert page.has_more is True
+        assert page.next_since == 5
+        assert [(c.workout_id, c.deleted) for c in page.changes] == [(10, False), (11, True)]
+        assert page.changes[0].workout.exercises == [workout_exercise]
+        assert page.changes[1].workout is None
+
+    async def test_get_workout_changes_empty(self):
+        # Arrange
+        self.mock_db.workout_changes.get_page = AsyncMock(return_value=[])
+        self.mock_db.workouts.get_by_ids = AsyncMock()
+
+        # Act
+        page = await self.service.get_workout_changes(5555, since=7, limit=100)
+
+        # Assert
+        assert page.changes == []
+        assert page.next_since == 7
+        assert page.has_more is False
+        self.mock_db.workouts.get_by_ids.assert_not_called()
+
     @pytest.mark.parametrize(
         "date,description,exercises,expected_exercises_count",
         [
@@ -393,6 +557,7 @@ class TestWorkoutsService(BaseTestService):
         
         self.service.get_workout = AsyncMock(return_value=existed_workout)
         self.mock_db.workouts.update = AsyncMock(return_value=updated_workout)
+        self.mock_db.workouts.refresh_summaries = AsyncMock(return_value=[updated_workout])
         self.mock_db.workout_exercises.add = AsyncMock()
         self.mock_db.commit = AsyncMock()
 
@@ -404,7 +569,7 @@ class TestWorkoutsService(BaseTestService):
         )
 
         # Assert
-        self.service.get_workout.assert_called_once_with(workout_id)
+        self.service.get_workout.assert_called_once_with(user_id, workout_id)
         
         args, kwargs = self.mock_db.workouts.update.call_args
         data_arg = args[0]
@@ -414,6 +579,7 @@ class TestWorkoutsService(BaseTestService):
         assert data_arg.description == description
         
         assert self.mock_db.workout_exercises.add.call_count == expected_exercises_count
+        assert self.mock_db.workouts.refresh_summaries.call_count == (1 if expected_exercises_count else 0)
         if expected_exercises_count > 0:
             for i, exercise_data in enumerate(exercises):
                 called_arg = self.mock_db.workout_exercises.add.call_args_list[i][0][0]
@@ -426,6 +592,40 @@ class TestWorkoutsService(BaseTestService):
         assert result.id == existed_workout.id
         assert result.user_id == existed_workout.user_id
         assert result.date == date
+        self.mock_db.workout_changes.record.assert_called_once_with(user_id, [workout_id])
+        if exercises or date != existed_workout.date:
+            self.mock_db.training_rollups.refresh.assert_called_once_with(
+                user_id, [existed_workout.date, date]
+            )
+        else:
+            self.mock_db.training_rollups.refresh.assert_not_called()
+        self.mock_db.commit.assert_called_once()
+
+    async def test_partially_update_workout_keeps_unsent_date(self):
+        # Arrange
+        workout_id = 123
+        user_id = 5555
+        existed_workout = Workout(
+            id=workout_id, user_id=user_id, date=datetime.date(2025, 2, 2), description="Старое"
+        )
+        updated_workout = existed_workout.model_copy(update={"description": "Новое"})
+        self.service.get_workout = AsyncMock(return_value=existed_workout)
+        self.mock_db.workouts.update = AsyncMock(return_value=updated_workout)
+        self.mock_db.commit = AsyncMock()
+
+        # Act
+        result = await self.service.partially_update_workout(
+            user_id=user_id,
+            workout_id=workout_id,
+            workout=WorkoutUpdatePatch(description="Новое"),
+        )
+
+        # Assert
+        data_arg = self.mock_db.workouts.update.call_args[0][0]
+        assert data_arg.model_dump(exclude_unset=True) == {"user_id": user_id, "description": "Новое"}
+        assert result.date == existed_workout.date
+        self.mock_db.workout_changes.record.assert_called_once_with(user_id, [workout_id])
+        self.mock_db.training_rollups.refresh.assert_not_called()
         self.mock_db.commit.assert_called_once()
 
     @pytest.mark.parametrize(
@@ -476,7 +676,7 @@ class TestWorkoutsService(BaseTestService):
             )
 
         # Assert
-        self.service.get_workout.assert_called_once_with(workout_id)
+        self.service.get_workout.assert_called_once_with(user_id, workout_id)
         self.mock_db.workouts.update.assert_not_called()
         self.mock_db.workout_exercises.add.assert_not_called()
         self.mock_db.commit.assert_not_called()